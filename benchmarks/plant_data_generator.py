@@ -0,0 +1,380 @@
+"""
+대규모 공장 데이터 생성 모듈
+- NumPy 벡터 연산으로 800대 이상 설비의 수년치 이력 생성
+  (고장 이력, 부품 교체, 설비 정지, 모델 변경, 계획 정지)
+- 로컬 SQLite 백엔드 또는 Parquet 파일로 저장
+
+사용 예:
+    python -m benchmarks.plant_data_generator --machines 800 --days 1095 --sqlite data/bench.db
+    python -m benchmarks.plant_data_generator --error-rate 1.2 --parquet data/bench_parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUILDINGS = ['A동', 'B동', 'C동']
+EQUIPMENT_TYPES = ['프레스', '컨베이어', '로봇', '조립기', '검사기']
+EQUIPMENT_STATUSES = ['정상', '점검중', '고장', '설비 PM', '모델 변경']
+STOP_REASONS = ['PM', '모델 교체', '자재대기', '계획 정지']
+MODELS = [f'MODEL-{chr(65 + i)}' for i in range(12)]
+
+# 시간대별 고장 발생 가중치 (주간 교대 시간에 더 많이 발생)
+HOUR_WEIGHTS = np.array([
+    2, 2, 2, 2, 2, 3, 4, 6, 8, 8, 7, 6,
+    5, 7, 8, 8, 7, 6, 5, 4, 3, 3, 2, 2
+], dtype=float)
+HOUR_WEIGHTS /= HOUR_WEIGHTS.sum()
+
+# 요일별 가중치 (월요일=0, 일요일 가동 감소)
+WEEKDAY_WEIGHTS = np.array([1.1, 1.0, 1.0, 1.0, 1.05, 0.7, 0.4])
+
+
+# UUID 문자열에서 16진 숫자가 들어가는 위치 (나머지 위치는 '-')
+_UUID_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def _uuid_strings(rng, n):
+    """난수 기반 UUID(버전 4) 형식 문자열 n개를 배열 연산으로 생성합니다."""
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    nibbles = np.stack([raw >> 4, raw & 0x0F], axis=-1).reshape(n, 32)
+    text = np.full((n, 36), ord('-'), dtype=np.uint8)
+    text[:, _UUID_HEX_POSITIONS] = _HEX_DIGITS[nibbles]
+    return text.view('S36').ravel().astype(str)
+
+
+def _zipf_probabilities(k, exponent=1.1):
+    """상위 코드에 집중되는 Zipf 분포 확률을 반환합니다."""
+    weights = 1.0 / np.arange(1, k + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _equipment_numbers(machines):
+    return np.array([f'EQ{i:03d}' for i in range(1, machines + 1)])
+
+
+def generate_equipment(rng, machines):
+    """설비 및 시리얼 매핑 데이터를 생성합니다."""
+    numbers = np.arange(1, machines + 1)
+    equipment = pd.DataFrame({
+        'id': _uuid_strings(rng, machines),
+        'equipment_number': _equipment_numbers(machines),
+        'serial_number': [f'800-{i:03d}' for i in numbers],
+        'equipment_type': rng.choice(EQUIPMENT_TYPES, machines),
+        'building': np.array(BUILDINGS)[(numbers - 1) % len(BUILDINGS)],
+        'status': rng.choice(EQUIPMENT_STATUSES, machines, p=[0.85, 0.05, 0.04, 0.03, 0.03]),
+    })
+    serials = pd.DataFrame({
+        'equipment_number': numbers,
+        'serial_number': equipment['serial_number'].values,
+    })
+    return equipment, serials
+
+
+def _daily_event_matrix(rng, machines, days, start, rate, heterogeneity=2.0):
+    """
+    설비 × 일자별 발생 건수 행렬을 포아송 분포로 생성하고 이벤트 단위 인덱스로 펼칩니다.
+
+    Returns:
+        tuple: (설비 인덱스 배열, 일자 인덱스 배열)
+    """
+    machine_rate = rng.gamma(shape=heterogeneity, scale=rate / heterogeneity, size=machines)
+    day_index = np.arange(days)
+    weekdays = (np.datetime64(start, 'D') + day_index).astype('datetime64[D]').view('int64')
+    # 1970-01-01 은 목요일 → 월요일=0 기준으로 보정
+    weekday_weight = WEEKDAY_WEIGHTS[(weekdays + 3) % 7]
+    # 노후화로 인한 완만한 증가 추세
+    trend = 1.0 + 0.3 * day_index / max(days, 1)
+    counts = rng.poisson(machine_rate[:, None] * (weekday_weight * trend)[None, :])
+    machine_idx, event_day = np.nonzero(counts)
+    repeats = counts[machine_idx, event_day]
+    return np.repeat(machine_idx, repeats), np.repeat(event_day, repeats)
+
+
+def _timestamps(rng, start, day_idx):
+    """일자 인덱스에 시간대 가중치를 적용한 발생 시각을 붙입니다."""
+    n = len(day_idx)
+    hours = rng.choice(24, n, p=HOUR_WEIGHTS)
+    seconds = hours * 3600 + rng.integers(0, 3600, n)
+    base = np.datetime64(start, 's')
+    return base + day_idx.astype('timedelta64[D]') + seconds.astype('timedelta64[s]')
+
+
+def generate_error_history(rng, machines, days, start, error_rate, error_code_count=20, worker_count=30):
+    """고장 이력을 생성합니다."""
+    machine_idx, day_idx = _daily_event_matrix(rng, machines, days, start, error_rate)
+    n = len(machine_idx)
+    timestamps = _timestamps(rng, start, day_idx)
+
+    codes = np.array([f'E{i:03d}' for i in range(1, error_code_count + 1)])
+    code_idx = rng.choice(error_code_count, n, p=_zipf_probabilities(error_code_count))
+    # 오류 코드별 평균 수리 시간 차이를 반영한 로그정규 분포
+    code_factor = rng.uniform(0.6, 1.8, error_code_count)[code_idx]
+    repair_time = np.clip(rng.lognormal(np.log(40), 0.6, n) * code_factor, 5, 480).astype(np.int32)
+
+    workers = np.array([f'작업자{i:02d}' for i in range(1, worker_count + 1)])
+    supervisors = np.array([f'관리자{i:02d}' for i in range(1, worker_count // 5 + 2)])
+    equipment_numbers = _equipment_numbers(machines)
+
+    df = pd.DataFrame({
+        'id': _uuid_strings(rng, n),
+        'timestamp': timestamps,
+        'equipment_number': equipment_numbers[machine_idx],
+        'serial_number': np.char.add('800-', np.char.zfill((machine_idx + 1).astype(str), 3)),
+        'error_code': codes[code_idx],
+        'error_detail': np.char.add(codes[code_idx], ' 발생'),
+        'repair_time': repair_time,
+        'repair_method': rng.choice(['부품 교체', '센서 조정', '소프트웨어 재설정', '전원 재시작', '배선 교체'], n),
+        'worker': workers[rng.integers(0, len(workers), n)],
+        'supervisor': supervisors[rng.integers(0, len(supervisors), n)],
+    })
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def generate_parts_replacement(rng, errors, part_count=15, replacement_ratio=0.4):
+    """고장 이력의 일부에서 부품 교체 이력을 파생합니다 (오류 코드별 주요 부품 사용)."""
+    mask = rng.random(len(errors)) < replacement_ratio
+    source = errors.loc[mask]
+    n = len(source)
+    parts = np.array([f'P{i:03d}' for i in range(1, part_count + 1)])
+    code_numbers = source['error_code'].str[1:].astype(int).to_numpy()
+    preferred = (code_numbers - 1) % part_count
+    noise = rng.integers(0, part_count, n)
+    part_idx = np.where(rng.random(n) < 0.75, preferred, noise)
+    df = pd.DataFrame({
+        'id': _uuid_strings(rng, n),
+        'timestamp': source['timestamp'].to_numpy() + source['repair_time'].to_numpy().astype('timedelta64[m]'),
+        'equipment_number': source['equipment_number'].to_numpy(),
+        'serial_number': source['serial_number'].to_numpy(),
+        'part_code': parts[part_idx],
+        'worker': source['worker'].to_numpy(),
+        'supervisor': source['supervisor'].to_numpy(),
+    })
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def generate_equipment_stops(rng, machines, days, start, stop_rate):
+    """설비 정지 이력을 생성합니다. 정지 사유별로 정지 시간 분포가 다릅니다."""
+    machine_idx, day_idx = _daily_event_matrix(rng, machines, days, start, stop_rate, heterogeneity=4.0)
+    n = len(machine_idx)
+    start_time = _timestamps(rng, start, day_idx)
+    reason_idx = rng.choice(len(STOP_REASONS), n, p=[0.25, 0.2, 0.35, 0.2])
+    median_minutes = np.array([180, 90, 45, 120])[reason_idx]
+    duration = np.clip(rng.lognormal(np.log(median_minutes), 0.5), 5, 24 * 60).astype(np.int32)
+    equipment_numbers = _equipment_numbers(machines)
+    df = pd.DataFrame({
+        'id': _uuid_strings(rng, n),
+        'timestamp': start_time,
+        'equipment_number': equipment_numbers[machine_idx],
+        'serial_number': np.char.add('800-', np.char.zfill((machine_idx + 1).astype(str), 3)),
+        'stop_reason': np.array(STOP_REASONS)[reason_idx],
+        'start_time': start_time,
+        'end_time': start_time + duration.astype('timedelta64[m]'),
+        'duration_minutes': duration,
+        'details': '',
+        'worker': np.array([f'작업자{i:02d}' for i in range(1, 31)])[rng.integers(0, 30, n)],
+        'supervisor': '관리자01',
+    })
+    return df.sort_values('start_time', kind='stable').reset_index(drop=True)
+
+
+def generate_model_changes(rng, stops):
+    """'모델 교체' 사유의 설비 정지에서 모델 변경 이력을 파생합니다."""
+    source = stops.loc[stops['stop_reason'] == '모델 교체']
+    n = len(source)
+    from_idx = rng.integers(0, len(MODELS), n)
+    to_idx = (from_idx + rng.integers(1, len(MODELS), n)) % len(MODELS)
+    return pd.DataFrame({
+        'id': _uuid_strings(rng, n),
+        'timestamp': source['start_time'].to_numpy(),
+        'equipment_number': source['equipment_number'].to_numpy(),
+        'serial_number': source['serial_number'].to_numpy(),
+        'model_from': np.array(MODELS)[from_idx],
+        'model_to': np.array(MODELS)[to_idx],
+        'duration_minutes': source['duration_minutes'].to_numpy(),
+        'worker': source['worker'].to_numpy(),
+        'supervisor': source['supervisor'].to_numpy(),
+    }).reset_index(drop=True)
+
+
+def generate_plan_suspensions(rng, equipment, model_changes, start, days, pm_interval_days=90):
+    """주기적 설비 PM 과 모델 변경에 대한 계획 정지 이력을 생성합니다."""
+    machines = len(equipment)
+    cycles = max(days // pm_interval_days, 1)
+    machine_idx = np.repeat(np.arange(machines), cycles)
+    cycle_idx = np.tile(np.arange(cycles), machines)
+    offset = rng.integers(0, pm_interval_days, machines)[machine_idx]
+    start_day = cycle_idx * pm_interval_days + offset + rng.integers(-5, 6, len(machine_idx))
+    valid = (start_day >= 0) & (start_day < days)
+    machine_idx, start_day = machine_idx[valid], start_day[valid]
+    pm_duration = rng.integers(1, 4, len(machine_idx))
+
+    base = np.datetime64(start, 'D')
+    pm = pd.DataFrame({
+        'equipment_number': equipment['equipment_number'].to_numpy()[machine_idx],
+        'type': '설비 PM',
+        'start_date': base + start_day.astype('timedelta64[D]'),
+        'estimated_end_date': base + (start_day + pm_duration).astype('timedelta64[D]'),
+        'end_date': base + (start_day + pm_duration + rng.integers(-1, 2, len(machine_idx))
+                            .clip(min=0)).astype('timedelta64[D]'),
+        'reason': '정기 예방 정비',
+        'building': equipment['building'].to_numpy()[machine_idx],
+        'model_from': None,
+        'model_to': None,
+        'process_name': None,
+    })
+
+    change_start = model_changes['timestamp'].to_numpy().astype('datetime64[D]')
+    change_days = np.maximum(model_changes['duration_minutes'].to_numpy() // (24 * 60), 0)
+    building_lookup = dict(zip(equipment['equipment_number'], equipment['building']))
+    changes = pd.DataFrame({
+        'equipment_number': model_changes['equipment_number'].to_numpy(),
+        'type': '모델 변경',
+        'start_date': change_start,
+        'estimated_end_date': change_start + (change_days + 1).astype('timedelta64[D]'),
+        'end_date': change_start + change_days.astype('timedelta64[D]'),
+        'reason': '모델 변경',
+        'building': model_changes['equipment_number'].map(building_lookup).to_numpy(),
+        'model_from': model_changes['model_from'].to_numpy(),
+        'model_to': model_changes['model_to'].to_numpy(),
+        'process_name': '조립 공정',
+    })
+
+    df = pd.concat([pm, changes], ignore_index=True).sort_values('start_date', kind='stable')
+    df = df.reset_index(drop=True)
+    df['plan_id'] = df['type'] + '-' + df['equipment_number'] + '-' + df['start_date'].astype(str).str[:10]
+    df['responsible_person'] = np.array([f'담당자{i:02d}' for i in range(1, 11)])[rng.integers(0, 10, len(df))]
+    # 종료일이 기간 마지막 날 이후인 건은 진행 중으로 표시
+    end_limit = base + np.timedelta64(days, 'D')
+    active = df['end_date'].to_numpy() >= end_limit
+    df['status'] = np.where(active, 'ACTIVE', 'COMPLETED')
+    df['end_date'] = df['end_date'].where(~active, pd.NaT)
+    return df
+
+
+def generate_plant_data(machines=800, days=365 * 3, start=None, error_rate=0.25, stop_rate=0.08, seed=0):
+    """
+    설비 수와 기간에 맞춰 전체 공장 데이터 세트를 생성합니다.
+
+    Args:
+        machines (int): 설비 대수
+        days (int): 생성 기간 (일)
+        start (str): 시작일 (기본: 오늘로부터 days 일 전)
+        error_rate (float): 설비 1대당 일평균 고장 건수
+        stop_rate (float): 설비 1대당 일평균 정지 건수
+        seed (int): 난수 시드
+
+    Returns:
+        dict: 테이블 이름 → DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    if start is None:
+        start = (np.datetime64(datetime.now().date()) - np.timedelta64(days, 'D')).astype(str)
+
+    equipment, serials = generate_equipment(rng, machines)
+    errors = generate_error_history(rng, machines, days, start, error_rate)
+    parts = generate_parts_replacement(rng, errors)
+    stops = generate_equipment_stops(rng, machines, days, start, stop_rate)
+    model_changes = generate_model_changes(rng, stops)
+    suspensions = generate_plan_suspensions(rng, equipment, model_changes, start, days)
+
+    return {
+        'equipment': equipment,
+        'equipment_serials': serials,
+        'error_history': errors,
+        'parts_replacement': parts,
+        'equipment_stops': stops,
+        'model_changes': model_changes,
+        'plan_suspensions': suspensions,
+    }
+
+
+def _to_storage_frame(df):
+    """날짜/시간 컬럼을 로컬 백엔드와 같은 ISO 문자열로 변환합니다."""
+    out = df.copy()
+    for column in out.columns:
+        if np.issubdtype(out[column].dtype, np.datetime64):
+            values = out[column].to_numpy()
+            unit = 'D' if column.endswith('_date') else 's'
+            strings = np.datetime_as_string(values.astype(f'datetime64[{unit}]'), unit=unit)
+            out[column] = np.where(pd.isna(values), None, strings)
+    return out.astype(object).where(out.notna(), None)
+
+
+def write_to_sqlite(data, path, chunk_size=50000):
+    """생성한 데이터 세트를 로컬 SQLite 백엔드 데이터베이스에 일괄 저장합니다."""
+    from utils.sqlite_backend import SQLiteClient
+
+    client = SQLiteClient(path, seed=False)
+    conn = client.connection()
+    conn.execute("PRAGMA synchronous=OFF")
+    for table, df in data.items():
+        frame = _to_storage_frame(df)
+        columns = ', '.join(frame.columns)
+        placeholders = ', '.join('?' for _ in frame.columns)
+        sql = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+        with conn:
+            for offset in range(0, len(frame), chunk_size):
+                chunk = frame.iloc[offset:offset + chunk_size]
+                conn.executemany(sql, chunk.itertuples(index=False, name=None))
+        print(f"  {table}: {len(frame):,}행 저장")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("ANALYZE")
+
+
+def write_to_parquet(data, directory):
+    """생성한 데이터 세트를 테이블별 Parquet 파일로 저장합니다 (pyarrow 필요)."""
+    os.makedirs(directory, exist_ok=True)
+    for table, df in data.items():
+        path = os.path.join(directory, f'{table}.parquet')
+        df.to_parquet(path, index=False)
+        print(f"  {table}: {len(df):,}행 → {path}")
+
+
+def read_parquet_dataset(directory):
+    """write_to_parquet 으로 저장한 데이터 세트를 읽습니다."""
+    data = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.parquet'):
+            data[filename[:-len('.parquet')]] = pd.read_parquet(os.path.join(directory, filename))
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대규모 공장 이력 데이터 생성기")
+    parser.add_argument('--machines', type=int, default=800, help="설비 대수")
+    parser.add_argument('--days', type=int, default=365 * 3, help="생성 기간 (일)")
+    parser.add_argument('--start', default=None, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument('--error-rate', type=float, default=0.25, help="설비당 일평균 고장 건수")
+    parser.add_argument('--stop-rate', type=float, default=0.08, help="설비당 일평균 정지 건수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    parser.add_argument('--sqlite', help="저장할 SQLite 파일 경로")
+    parser.add_argument('--parquet', help="저장할 Parquet 디렉터리")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    data = generate_plant_data(args.machines, args.days, args.start, args.error_rate, args.stop_rate, args.seed)
+    print(f"데이터 생성 완료 ({time.perf_counter() - started:.1f}초)")
+    for table, df in data.items():
+        print(f"  {table}: {len(df):,}행")
+
+    if args.sqlite:
+        print(f"SQLite 저장: {args.sqlite}")
+        write_to_sqlite(data, args.sqlite)
+    if args.parquet:
+        print(f"Parquet 저장: {args.parquet}")
+        write_to_parquet(data, args.parquet)
+
+
+if __name__ == "__main__":
+    main()
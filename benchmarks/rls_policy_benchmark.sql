@@ -0,0 +1,142 @@
+-- RLS 관리자 정책 비용 벤치마크 (로컬 PostgreSQL)
+-- 100만 행 이력 테이블에서 관리자 정책 조건별 조회/수정 시간을 비교합니다.
+--   history_subquery : auth.uid() IN (SELECT id FROM users WHERE role = 'admin')  (기존 정책)
+--   history_per_row  : is_admin()            (STABLE 함수지만 행마다 호출)
+--   history_initplan : (SELECT is_admin())   (문장당 한 번 계산, migrations/optimize_rls_policies.sql 방식)
+--
+-- 각 테이블에는 관리자 정책만 있으므로 관리자 정책만 적용되는 UPDATE/DELETE, 조회 정책이 없는 테이블과 같은 조건입니다.
+-- (read_all_* 처럼 USING (true) 정책이 함께 있는 일반 조회는 OR 결합 시 상수로 정리되어 영향이 작습니다.)
+--
+-- 실행:
+--   createdb rls_bench
+--   psql -d rls_bench -f benchmarks/rls_policy_benchmark.sql
+-- 결과의 "Execution Time" 을 비교합니다. 스크립트는 rls_bench 스키마만 만들고 마지막에 삭제합니다.
+-- Supabase 가 아닌 PostgreSQL 에서는 auth.uid() 와 authenticated 역할을 같은 방식으로 흉내 냅니다.
+
+\set ON_ERROR_STOP on
+\set rows 1000000
+
+-- ---------------------------------------------------------------------------
+-- Supabase 환경 흉내 (이미 있으면 그대로 사용)
+-- ---------------------------------------------------------------------------
+CREATE SCHEMA IF NOT EXISTS auth;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+        CREATE ROLE authenticated NOLOGIN;
+    END IF;
+    IF to_regprocedure('auth.uid()') IS NULL THEN
+        CREATE FUNCTION auth.uid() RETURNS UUID
+        LANGUAGE sql STABLE AS
+        'SELECT nullif(current_setting(''request.jwt.claim.sub'', true), '''')::uuid';
+    END IF;
+END;
+$$;
+
+GRANT USAGE ON SCHEMA auth TO authenticated;
+GRANT EXECUTE ON FUNCTION auth.uid() TO authenticated;
+
+-- ---------------------------------------------------------------------------
+-- 벤치마크 데이터
+-- ---------------------------------------------------------------------------
+DROP SCHEMA IF EXISTS rls_bench CASCADE;
+CREATE SCHEMA rls_bench;
+GRANT USAGE ON SCHEMA rls_bench TO authenticated;
+
+CREATE TABLE rls_bench.users (
+    id UUID PRIMARY KEY,
+    role VARCHAR(20) DEFAULT 'user'
+);
+
+-- 관리자 1명 + 일반 사용자 200명
+INSERT INTO rls_bench.users (id, role)
+SELECT md5('user-' || i)::uuid, CASE WHEN i = 0 THEN 'admin' ELSE 'user' END
+FROM generate_series(0, 200) AS i;
+
+CREATE TABLE rls_bench.history_subquery AS
+SELECT
+    i AS id,
+    '800-' || lpad((i % 50 + 1)::text, 3, '0') AS equipment_number,
+    'E' || lpad((i % 40)::text, 3, '0') AS error_code,
+    TIMESTAMP '2020-01-01' + (i * INTERVAL '2 minutes') AS timestamp,
+    (i % 120) AS repair_time
+FROM generate_series(1, :rows) AS i;
+
+CREATE TABLE rls_bench.history_per_row AS TABLE rls_bench.history_subquery;
+CREATE TABLE rls_bench.history_initplan AS TABLE rls_bench.history_subquery;
+
+CREATE FUNCTION rls_bench.is_admin()
+RETURNS BOOLEAN
+LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = rls_bench AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM rls_bench.users WHERE id = auth.uid() AND role = 'admin'
+    );
+$$;
+GRANT EXECUTE ON FUNCTION rls_bench.is_admin() TO authenticated;
+
+ALTER TABLE rls_bench.history_subquery ENABLE ROW LEVEL SECURITY;
+ALTER TABLE rls_bench.history_per_row ENABLE ROW LEVEL SECURITY;
+ALTER TABLE rls_bench.history_initplan ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY admin_all ON rls_bench.history_subquery FOR ALL TO authenticated USING (
+    auth.uid() IN (SELECT id FROM rls_bench.users WHERE role = 'admin')
+);
+CREATE POLICY admin_all ON rls_bench.history_per_row FOR ALL TO authenticated USING (
+    rls_bench.is_admin()
+);
+CREATE POLICY admin_all ON rls_bench.history_initplan FOR ALL TO authenticated USING (
+    (SELECT rls_bench.is_admin())
+);
+
+GRANT SELECT ON rls_bench.users TO authenticated;
+GRANT SELECT, UPDATE ON rls_bench.history_subquery, rls_bench.history_per_row, rls_bench.history_initplan TO authenticated;
+
+VACUUM ANALYZE rls_bench.users;
+VACUUM ANALYZE rls_bench.history_subquery;
+VACUUM ANALYZE rls_bench.history_per_row;
+VACUUM ANALYZE rls_bench.history_initplan;
+
+-- ---------------------------------------------------------------------------
+-- 측정 (관리자로 로그인한 상태)
+-- ---------------------------------------------------------------------------
+SELECT set_config('request.jwt.claim.sub', md5('user-0'), false);
+SET ROLE authenticated;
+
+\echo '=== SELECT: 기존 정책 (행마다 auth.uid() + 서브쿼리) ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT equipment_number, count(*), sum(repair_time) FROM rls_bench.history_subquery GROUP BY equipment_number;
+
+\echo '=== SELECT: is_admin() (행마다 함수 호출) ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT equipment_number, count(*), sum(repair_time) FROM rls_bench.history_per_row GROUP BY equipment_number;
+
+\echo '=== SELECT: (SELECT is_admin()) (InitPlan, 문장당 한 번) ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT equipment_number, count(*), sum(repair_time) FROM rls_bench.history_initplan GROUP BY equipment_number;
+
+\echo '=== UPDATE 1개월 구간: 기존 정책 ==='
+BEGIN;
+EXPLAIN (ANALYZE, COSTS OFF)
+UPDATE rls_bench.history_subquery SET repair_time = repair_time + 1
+WHERE timestamp >= '2021-01-01' AND timestamp < '2021-02-01';
+ROLLBACK;
+
+\echo '=== UPDATE 1개월 구간: (SELECT is_admin()) ==='
+BEGIN;
+EXPLAIN (ANALYZE, COSTS OFF)
+UPDATE rls_bench.history_initplan SET repair_time = repair_time + 1
+WHERE timestamp >= '2021-01-01' AND timestamp < '2021-02-01';
+ROLLBACK;
+
+-- 일반 사용자는 두 방식 모두 0행이어야 합니다 (정책 의미가 같은지 확인).
+SELECT set_config('request.jwt.claim.sub', md5('user-1'), false);
+\echo '=== 일반 사용자 결과 행 수 (모두 0) ==='
+SELECT
+    (SELECT count(*) FROM rls_bench.history_subquery) AS subquery_rows,
+    (SELECT count(*) FROM rls_bench.history_per_row) AS per_row_rows,
+    (SELECT count(*) FROM rls_bench.history_initplan) AS initplan_rows;
+
+RESET ROLE;
+DROP SCHEMA rls_bench CASCADE;
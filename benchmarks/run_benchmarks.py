@@ -0,0 +1,496 @@
+"""
+페이지별 데이터 처리 벤치마크 실행 모듈
+- 대규모 합성 데이터로 대시보드/보고서/차트 데이터 준비 시간을 측정
+- 결과를 JSON 기준선으로 저장하고 이후 실행에서 성능 저하를 검출
+
+사용 예:
+    python -m benchmarks.run_benchmarks --save benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json --threshold 1.2
+    python -m benchmarks.run_benchmarks --parquet data/bench_parquet --only reports
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+import types
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.plant_data_generator import generate_plant_data, read_parquet_dataset, write_to_sqlite
+
+# 등록된 벤치마크 목록: (이름, 함수)
+BENCHMARKS = []
+
+# 보고서 페이지에서 사용하는 컬럼 이름
+REPORT_ERROR_COLUMNS = {
+    'timestamp': '발생시간',
+    'equipment_number': '설비번호',
+    'error_code': '오류코드',
+    'repair_time': '수리시간',
+    'worker': '작업자',
+}
+REPORT_PARTS_COLUMNS = {
+    'timestamp': '교체시간',
+    'equipment_number': '설비번호',
+    'part_code': '부품코드',
+    'worker': '작업자',
+}
+
+
+class _SessionState(dict):
+    """st.session_state 대체 (키/속성 접근 모두 지원)"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class _StreamlitStub(types.ModuleType):
+    """
+    화면 출력 없이 호출만 받는 streamlit 대체 모듈입니다.
+    페이지 컴포넌트의 데이터 준비/집계 함수를 Streamlit 실행 환경 없이 그대로 호출하는 데 사용합니다.
+    """
+
+    def __init__(self):
+        super().__init__('streamlit')
+        self.session_state = _SessionState()
+
+    def columns(self, spec, **kwargs):
+        count = spec if isinstance(spec, int) else len(spec)
+        return [contextlib.nullcontext() for _ in range(count)]
+
+    @staticmethod
+    def _identity_decorator(func=None, **kwargs):
+        """@st.cache_resource / @st.cache_resource(ttl=...) 모두 원래 함수를 그대로 반환합니다."""
+        if func is None:
+            return lambda inner: inner
+        return func
+
+    cache_resource = _identity_decorator
+    cache_data = _identity_decorator
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _install_streamlit_stub():
+    """streamlit 이 설치되지 않은 환경에서는 대체 모듈을 등록해 페이지 모듈을 가져올 수 있게 합니다."""
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        sys.modules['streamlit'] = _StreamlitStub()
+
+
+@contextlib.contextmanager
+def _stubbed_streamlit(module):
+    """module 의 st 를 빈 세션 상태의 대체 모듈로 바꿉니다 (세션 메모를 거치지 않고 매번 계산)."""
+    original = module.st
+    module.st = _StreamlitStub()
+    try:
+        yield module.st
+    finally:
+        module.st = original
+
+
+def benchmark(name):
+    """벤치마크 함수를 등록하는 데코레이터입니다. 함수는 BenchmarkContext 를 인자로 받습니다."""
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    """벤치마크 함수에 전달되는 데이터 세트와 파생 데이터입니다."""
+
+    def __init__(self, data, sqlite_path=None, lang='ko'):
+        self.data = data
+        self.sqlite_path = sqlite_path
+        self.lang = lang
+        self._cache = {}
+
+    def records(self, table):
+        """테이블을 페이지 함수에 전달하는 딕셔너리 목록 형식으로 반환합니다."""
+        if table not in self._cache:
+            self._cache[table] = self.data[table].to_dict('records')
+        return self._cache[table]
+
+    def report_frames(self):
+        """보고서 페이지와 같은 한글 컬럼 이름의 데이터프레임을 반환합니다."""
+        if 'report_frames' not in self._cache:
+            errors = self.data['error_history'][list(REPORT_ERROR_COLUMNS)].rename(columns=REPORT_ERROR_COLUMNS)
+            errors['시간'] = pd.to_datetime(errors['발생시간']).dt.hour
+            parts = self.data['parts_replacement'][list(REPORT_PARTS_COLUMNS)].rename(columns=REPORT_PARTS_COLUMNS)
+            self._cache['report_frames'] = (errors, parts)
+        return self._cache['report_frames']
+
+
+# ---------------------------------------------------------------------------
+# 대시보드
+# ---------------------------------------------------------------------------
+
+@benchmark('dashboard.data_prep')
+def bench_dashboard_data_prep(ctx):
+    """대시보드 데이터 준비 (스냅샷 생성 + 화면에 표시하는 지표 읽기)"""
+    from services.dashboard_snapshot import DashboardSnapshot
+    snapshot = DashboardSnapshot.from_records(
+        ctx.records('equipment'), ctx.records('error_history'), ctx.records('parts_replacement')
+    )
+    _read_dashboard_snapshot(snapshot)
+
+
+def _read_dashboard_snapshot(snapshot):
+    """DashboardComponent.render 가 스냅샷에서 읽는 지표"""
+    snapshot.top_counts('status_counts')
+    snapshot.top_counts('error_code_counts')
+    snapshot.top_counts('parts_counts')
+    snapshot.daily_error_series(days=30)
+    snapshot.average_repair_time
+
+
+@benchmark('dashboard.snapshot_build')
+def bench_dashboard_snapshot_build(ctx):
+    """데이터 버전 변경 시 대시보드 스냅샷 전체 재계산"""
+    from services.dashboard_snapshot import DashboardSnapshot
+    DashboardSnapshot.from_records(
+        ctx.records('equipment'), ctx.records('error_history'), ctx.records('parts_replacement')
+    )
+
+
+@benchmark('dashboard.snapshot_read')
+def bench_dashboard_snapshot_read(ctx):
+    """스냅샷에서 대시보드 지표 읽기 (재실행마다 수행)"""
+    from services.dashboard_snapshot import DashboardSnapshot
+    snapshot = ctx._cache.get('dashboard_snapshot')
+    if snapshot is None:
+        snapshot = ctx._cache['dashboard_snapshot'] = DashboardSnapshot.from_records(
+            ctx.records('equipment'), ctx.records('error_history'), ctx.records('parts_replacement')
+        )
+    _read_dashboard_snapshot(snapshot)
+
+
+@benchmark('dashboard.charts')
+def bench_dashboard_charts(ctx):
+    """대시보드 차트 모듈 (데이터 준비 + Figure 생성/직렬화, Figure 캐시 미사용)"""
+    from modules.charts.equipment_charts import (
+        render_equipment_status_pie_chart, render_error_type_bar_chart,
+        render_daily_errors_line_chart, render_parts_replacement_bar_chart,
+    )
+    from modules.charts.figure_cache import clear_figure_cache
+    clear_figure_cache()
+    render_equipment_status_pie_chart(ctx.records('equipment'), ctx.lang)
+    render_error_type_bar_chart(ctx.records('error_history'), ctx.lang)
+    render_daily_errors_line_chart(ctx.records('error_history'), ctx.lang)
+    render_parts_replacement_bar_chart(ctx.records('parts_replacement'), ctx.lang)
+
+
+# ---------------------------------------------------------------------------
+# 보고서
+# ---------------------------------------------------------------------------
+
+@benchmark('reports.data_prep')
+def bench_reports_data_prep(ctx):
+    """보고서 데이터 준비 (ReportsComponent.get_report_data + 고장/부품/작업자/다운타임 탭 집계와 Figure 생성)"""
+    import components.reports as reports
+    start_date, end_date = _report_period(ctx)
+    component = reports.ReportsComponent(ctx.lang, lazy=False)
+    original_loader = reports.load_report_frames
+    # 저장소 조회만 벤치마크 데이터로 바꾸고 행 → 데이터프레임 변환은 페이지 함수를 그대로 사용합니다.
+    reports.load_report_frames = lambda start, end: reports.report_frames_from_records(
+        ctx.records('error_history'), ctx.records('parts_replacement')
+    )
+    try:
+        with _stubbed_streamlit(reports):
+            df_errors, df_parts, data_version = component.get_report_data(start_date, end_date, ctx.lang)
+            filters = (str(start_date), str(end_date), ctx.lang, data_version)
+            component.render_error_tab(df_errors, df_parts, ctx.lang, filters)
+            component.render_parts_tab(df_errors, df_parts, ctx.lang, filters)
+            component.render_worker_tab(df_errors, df_parts, ctx.lang, filters)
+            component.render_downtime_tab(df_errors, df_parts, ctx.lang, filters)
+    finally:
+        reports.load_report_frames = original_loader
+
+
+def _report_period(ctx):
+    timestamps = pd.to_datetime(ctx.data['error_history']['timestamp'])
+    return timestamps.min().date(), timestamps.max().date()
+
+
+@benchmark('reports.charts')
+def bench_reports_charts(ctx):
+    """보고서 차트 모듈 (데이터 준비 + Figure 생성/직렬화, Figure 캐시 미사용)"""
+    from modules.charts.reports_charts import (
+        render_error_code_bar_chart, render_error_trend_by_hour, render_worker_bar_charts,
+        render_equipment_downtime_bar_chart, render_error_repair_time_bar_chart,
+    )
+    from modules.charts.figure_cache import clear_figure_cache
+    clear_figure_cache()
+    errors, _ = ctx.report_frames()
+    render_error_code_bar_chart(errors, ctx.lang)
+    render_error_trend_by_hour(errors, ctx.lang)
+    render_worker_bar_charts(errors, ctx.lang)
+    render_equipment_downtime_bar_chart(errors, ctx.lang)
+    render_error_repair_time_bar_chart(errors, ctx.lang)
+
+
+@benchmark('reports.charts_cached')
+def bench_reports_charts_cached(ctx):
+    """같은 데이터로 보고서 차트를 다시 그릴 때 (데이터 지문 계산 + Figure 캐시 조회)"""
+    from modules.charts.reports_charts import (
+        render_error_code_bar_chart, render_error_trend_by_hour, render_worker_bar_charts,
+        render_equipment_downtime_bar_chart, render_error_repair_time_bar_chart,
+    )
+    errors, _ = ctx.report_frames()
+    render_error_code_bar_chart(errors, ctx.lang)
+    render_error_trend_by_hour(errors, ctx.lang)
+    render_worker_bar_charts(errors, ctx.lang)
+    render_equipment_downtime_bar_chart(errors, ctx.lang)
+    render_error_repair_time_bar_chart(errors, ctx.lang)
+
+
+@benchmark('reports.stats_python')
+def bench_reports_stats_python(ctx):
+    """DB 집계 함수를 사용할 수 없을 때의 앱 측 통계 집계"""
+    from utils.supabase_client import _aggregate_error_stats, _aggregate_parts_stats, _aggregate_model_change_stats
+    _aggregate_error_stats(ctx.records('error_history'))
+    _aggregate_parts_stats(ctx.records('parts_replacement'))
+    _aggregate_model_change_stats(ctx.records('model_changes'))
+
+
+# ---------------------------------------------------------------------------
+# 신뢰성 지표
+# ---------------------------------------------------------------------------
+
+def _reliability_window(ctx, days):
+    end = pd.Timestamp(ctx.data['error_history']['timestamp'].max()).normalize() + pd.Timedelta(days=1)
+    return end - pd.Timedelta(days=days), end
+
+
+@benchmark('reliability.by_machine')
+def bench_reliability_by_machine(ctx):
+    """최근 1년 설비별/건물별 MTBF·MTTR·가동률"""
+    from services.reliability_service import compute_reliability
+    start, end = _reliability_window(ctx, 365)
+    frames = (ctx.data['equipment'], ctx.data['error_history'], ctx.data['equipment_stops'])
+    compute_reliability(*frames, start, end, by='equipment_number')
+    compute_reliability(*frames, start, end, by='building')
+
+
+@benchmark('reliability.rolling')
+def bench_reliability_rolling(ctx):
+    """최근 1년 일별 30일 이동 신뢰성 지표 (설비 유형별)"""
+    from services.reliability_service import rolling_reliability
+    start, end = _reliability_window(ctx, 365)
+    rolling_reliability(ctx.data['equipment'], ctx.data['error_history'], ctx.data['equipment_stops'],
+                        start, end, window_days=30, by='equipment_type')
+
+
+# ---------------------------------------------------------------------------
+# 로컬 SQLite 백엔드
+# ---------------------------------------------------------------------------
+
+@benchmark('sqlite.history_pages')
+def bench_sqlite_history_pages(ctx):
+    """키셋 페이지네이션으로 최근 고장 이력 20페이지 조회"""
+    client = _sqlite_client(ctx)
+    if client is None:
+        return
+    cursor = None
+    for _ in range(20):
+        query = client.table('error_history').select('id, timestamp, equipment_number, error_code, repair_time')
+        if cursor:
+            query = query.or_(
+                f'timestamp.lt."{cursor[0]}",and(timestamp.eq."{cursor[0]}",id.lt."{cursor[1]}")'
+            )
+        rows = query.order('timestamp', desc=True).order('id', desc=True).limit(50).execute().data
+        if not rows:
+            break
+        cursor = (rows[-1]['timestamp'], rows[-1]['id'])
+
+
+@benchmark('sqlite.stats_rpc')
+def bench_sqlite_stats_rpc(ctx):
+    """DB 측 보고서 통계 집계 함수"""
+    client = _sqlite_client(ctx)
+    if client is None:
+        return
+    client.rpc('report_error_stats', {}).execute()
+    client.rpc('report_parts_stats', {}).execute()
+    client.rpc('report_model_change_stats', {}).execute()
+
+
+@benchmark('serial_index.lookup_many')
+def bench_serial_index_lookup(ctx):
+    """전체 설비의 시리얼 번호 일괄 조회"""
+    from utils.serial_index import EquipmentSerialIndex
+    rows = ctx.records('equipment_serials')
+    index = ctx._cache.get('serial_index')
+    if index is None:
+        index = ctx._cache['serial_index'] = EquipmentSerialIndex(lambda: rows)
+    index.lookup_many(ctx.data['equipment']['equipment_number'].tolist())
+
+
+@benchmark('suspensions.interval_index')
+def bench_suspension_interval_index(ctx):
+    """계획 정지 인터벌 인덱스 생성 + 일별 정지 설비 조회 + 등록 중복 검사 + 1년 가동 가능 캘린더"""
+    from utils.interval_index import SuspensionIndex
+    rows = ctx.records('plan_suspensions')
+    equipment = ctx.data['equipment']['equipment_number'].tolist()
+    index = SuspensionIndex(rows)
+    end = max(str(row['start_date'])[:10] for row in rows)
+    end_date = datetime.fromisoformat(end).date()
+    for offset in range(0, 365, 7):
+        index.machines_down(end_date - timedelta(days=offset))
+    for number in equipment:
+        index.find_conflicts(number, end_date, end_date + timedelta(days=3))
+    index.availability_calendar(end_date - timedelta(days=365), end_date, len(equipment))
+
+
+def _sqlite_client(ctx):
+    if not ctx.sqlite_path:
+        return None
+    if 'sqlite_client' not in ctx._cache:
+        from utils.sqlite_backend import SQLiteClient
+        ctx._cache['sqlite_client'] = SQLiteClient(ctx.sqlite_path, seed=False)
+    return ctx._cache['sqlite_client']
+
+
+# ---------------------------------------------------------------------------
+# 실행 및 비교
+# ---------------------------------------------------------------------------
+
+def run_benchmarks(ctx, repeat=5, only=None):
+    """
+    등록된 벤치마크를 실행하고 이름별 측정 결과를 반환합니다.
+
+    Args:
+        ctx (BenchmarkContext): 벤치마크 데이터
+        repeat (int): 반복 횟수 (첫 실행은 워밍업으로 제외)
+        only (list): 이름 접두사 필터
+
+    Returns:
+        tuple: (이름 → {'min', 'median', 'max'} (초), 실패한 벤치마크 이름 목록)
+    """
+    results = {}
+    failures = []
+    for name, func in BENCHMARKS:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            func(ctx)
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func(ctx)
+                timings.append(time.perf_counter() - started)
+        except Exception as e:
+            print(f"{name:<32} 실패: {e}")
+            traceback.print_exc()
+            failures.append(name)
+            continue
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+        }
+        print(f"{name:<32} {results[name]['median'] * 1000:10.1f} ms (min {results[name]['min'] * 1000:.1f})")
+    return results, failures
+
+
+def compare_results(results, baseline, threshold=1.2):
+    """
+    기준선 대비 중앙값이 threshold 배 이상 느려진 벤치마크 목록을 반환합니다.
+
+    Returns:
+        list: (이름, 기준 중앙값, 현재 중앙값, 비율)
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base or base['median'] <= 0:
+            continue
+        ratio = current['median'] / base['median']
+        if ratio >= threshold:
+            regressions.append((name, base['median'], current['median'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설비 관리 앱 데이터 처리 벤치마크")
+    parser.add_argument('--machines', type=int, default=800, help="설비 대수")
+    parser.add_argument('--days', type=int, default=365, help="생성 기간 (일)")
+    parser.add_argument('--error-rate', type=float, default=0.25, help="설비당 일평균 고장 건수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    parser.add_argument('--parquet', help="생성 대신 읽어올 Parquet 디렉터리")
+    parser.add_argument('--sqlite', help="SQLite 벤치마크에 사용할 DB 경로 (없으면 임시 파일 생성)")
+    parser.add_argument('--no-sqlite', action='store_true', help="SQLite 벤치마크 생략")
+    parser.add_argument('--repeat', type=int, default=5, help="반복 횟수")
+    parser.add_argument('--only', nargs='*', help="실행할 벤치마크 이름 접두사")
+    parser.add_argument('--save', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--compare', help="비교할 기준선 JSON 경로")
+    parser.add_argument('--threshold', type=float, default=1.2, help="성능 저하 판정 비율")
+    args = parser.parse_args(argv)
+
+    if args.parquet:
+        data = read_parquet_dataset(args.parquet)
+    else:
+        data = generate_plant_data(args.machines, args.days, error_rate=args.error_rate, seed=args.seed)
+    print(', '.join(f"{table} {len(df):,}행" for table, df in data.items()))
+
+    sqlite_path = None
+    if not args.no_sqlite:
+        sqlite_path = args.sqlite
+        if sqlite_path is None:
+            sqlite_path = os.path.join(tempfile.mkdtemp(prefix='equipment-bench-'), 'bench.db')
+        if not os.path.exists(sqlite_path):
+            write_to_sqlite(data, sqlite_path)
+
+    _install_streamlit_stub()
+    ctx = BenchmarkContext(data, sqlite_path)
+    results, failures = run_benchmarks(ctx, repeat=args.repeat, only=args.only)
+    if failures:
+        # 일부 벤치마크가 빠진 결과는 기준선으로 저장하거나 비교하지 않습니다.
+        print(f"벤치마크 실패 ({len(failures)}건): {', '.join(failures)}")
+        return 1
+
+    if args.save:
+        payload = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'rows': {table: len(df) for table, df in data.items()},
+            'results': results,
+        }
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print("성능 저하 감지:")
+            for name, base, current, ratio in regressions:
+                print(f"  {name}: {base * 1000:.1f} ms → {current * 1000:.1f} ms ({ratio:.2f}x)")
+            return 1
+        print("성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
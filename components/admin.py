@@ -1,5 +1,5 @@
 import streamlit as st
-from components.language import _normalize_language_code, get_text
+from components.language import _normalize_language_code, get_text, get_admin_text
 from utils.supabase_client import get_supabase, fetch_data, update_data, delete_data, insert_data
 
 class AdminComponent:
@@ -19,7 +19,8 @@ class AdminComponent:
         tabs = st.tabs([
             get_text("user_management", lang),
             get_text("equipment_management", lang),
-            get_text("error_codes", lang)
+            get_text("error_codes", lang),
+            get_admin_text("bulk_import", lang)
         ])
         
         with tabs[0]:
@@ -31,6 +32,9 @@ class AdminComponent:
         with tabs[2]:
             self.render_error_codes()
 
+        with tabs[3]:
+            self.render_bulk_import(lang)
+
     def render_user_management(self):
         # 사용자 관리 UI 구현
         pass
@@ -41,4 +45,41 @@ class AdminComponent:
 
     def render_error_codes(self):
         # 오류 코드 관리 UI 구현
-        pass 
\ No newline at end of file
+        pass
+
+    def render_bulk_import(self, lang):
+        """CSV / Excel 이력 데이터 일괄 가져오기 UI"""
+        from services.bulk_import_service import IMPORT_TABLES, import_history_file
+
+        table = st.selectbox(get_admin_text("import_table", lang), list(IMPORT_TABLES), key="bulk_import_table")
+        st.caption(", ".join(dict.fromkeys(IMPORT_TABLES[table]['columns'])))
+        uploaded_file = st.file_uploader(get_admin_text("import_file", lang), type=["csv", "xlsx"],
+                                         key="bulk_import_file")
+        dry_run = st.checkbox(get_admin_text("import_dry_run", lang), value=True, key="bulk_import_dry_run")
+
+        if uploaded_file is None or not st.button(get_admin_text("import_start", lang), key="bulk_import_start"):
+            return
+
+        progress_text = st.empty()
+        summary = import_history_file(
+            uploaded_file, table, dry_run=dry_run,
+            progress=lambda s: progress_text.text(get_admin_text("import_progress", lang).format(**s))
+        )
+        progress_text.empty()
+
+        if summary['completed']:
+            st.success(get_admin_text("import_done", lang).format(**summary))
+        else:
+            st.error(get_admin_text("import_stopped", lang))
+            st.info(get_admin_text("import_done", lang).format(**summary))
+
+        errors = summary['errors']
+        if not errors.empty:
+            st.subheader(f"{get_admin_text('import_errors', lang)} ({summary['invalid']})")
+            st.dataframe(errors, hide_index=True)
+            st.download_button(
+                get_admin_text("import_errors_download", lang),
+                errors.to_csv(index=False).encode('utf-8-sig'),
+                file_name=f"{table}_import_errors.csv",
+                mime="text/csv"
+            ) 
\ No newline at end of file
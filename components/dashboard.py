@@ -5,7 +5,14 @@ from datetime import datetime, timedelta
 import random
 from components.language import get_text
 from services.plan_service import PlanService
+from services.dashboard_snapshot import DashboardSnapshot, get_dashboard_snapshot, DAILY_WINDOW_DAYS
 from utils.supabase_client import get_equipment_list, get_error_history, get_parts_replacement
+from modules.charts.downsampling import build_time_series_figure, target_points
+
+# 일별 고장 건수 차트 기간 (일, 최대 기간은 스냅샷이 보관하는 최근 기간)
+DAILY_ERROR_PERIODS = [30, 90, DAILY_WINDOW_DAYS]
+# 2열 배치에서 차트 한 개의 대략적인 폭 (픽셀)
+DASHBOARD_CHART_WIDTH = 500
 
 class DashboardComponent:
     def __init__(self, lang=None):
@@ -20,15 +27,7 @@ class DashboardComponent:
         
         st.title(get_text("dashboard", lang))
         
-        # 예시 데이터 생성
-        equipment_list = generate_equipment_data(lang)
-        error_history = generate_error_data(datetime.now() - timedelta(days=30), datetime.now())
-        parts_history = generate_parts_data(datetime.now() - timedelta(days=30), datetime.now())
-        
-        # 데이터프레임 변환
-        df_equipment = pd.DataFrame(equipment_list)
-        df_errors = pd.DataFrame(error_history)
-        df_parts = pd.DataFrame(parts_history)
+        snapshot = self.get_snapshot(lang)
         
         # 2x2 그리드 레이아웃
         col1, col2 = st.columns(2)
@@ -36,9 +35,9 @@ class DashboardComponent:
         # 첫 번째 열
         with col1:
             # 설비 상태 요약
-            if not df_equipment.empty:
+            if snapshot.status_counts:
                 # 상태별 카운트
-                status_counts = df_equipment['status'].value_counts()
+                status_counts = snapshot.status_counts
                 
                 # 설비 상태 요약 지표 표시
                 st.subheader(get_text("equipment_status_summary", lang))
@@ -70,9 +69,10 @@ class DashboardComponent:
                         st.rerun()
                 
                 # 파이 차트로 시각화
+                status_items = snapshot.top_counts('status_counts')
                 fig_status = px.pie(
-                    values=status_counts.values,
-                    names=status_counts.index,
+                    values=[count for _, count in status_items],
+                    names=[status for status, _ in status_items],
                     title=get_text("equipment_status_distribution", lang),
                     height=300
                 )
@@ -80,11 +80,11 @@ class DashboardComponent:
                 st.plotly_chart(fig_status, use_container_width=True)
             
             # 고장 유형별 분포
-            if not df_errors.empty:
-                error_types = df_errors['error_code'].value_counts()
+            if snapshot.error_code_counts:
+                error_types = snapshot.top_counts('error_code_counts')
                 fig_error_types = px.bar(
-                    x=error_types.index,
-                    y=error_types.values,
+                    x=[code for code, _ in error_types],
+                    y=[count for _, count in error_types],
                     title=get_text("error_distribution", lang),
                     labels={
                         'x': get_text("error_code", lang), 
@@ -97,30 +97,31 @@ class DashboardComponent:
         
         # 두 번째 열
         with col2:
-            # 시간별 고장 건수
-            if not df_errors.empty:
-                df_errors['date'] = pd.to_datetime(df_errors['timestamp']).dt.date
-                daily_errors = df_errors.groupby('date').size().reset_index(name='count')
-                fig_errors = px.line(
-                    daily_errors,
-                    x='date',
-                    y='count',
+            # 일별 고장 건수 (기본 최근 30일, 긴 기간은 차트 폭에 맞춰 다운샘플링)
+            if snapshot.daily_errors:
+                period = st.selectbox(
+                    get_text("chart_period", lang),
+                    DAILY_ERROR_PERIODS,
+                    format_func=lambda days: f"{days}{get_text('days_unit', lang)}",
+                    key="dashboard_daily_error_period"
+                )
+                dates, counts = snapshot.daily_error_series(days=period)
+                fig_errors = build_time_series_figure(
+                    dates,
+                    counts,
                     title=get_text("daily_errors", lang),
-                    labels={
-                        'date': get_text("date", lang), 
-                        'count': get_text("count", lang)
-                    },
-                    height=300
+                    x_label=get_text("date", lang),
+                    y_label=get_text("count", lang),
+                    max_points=target_points(DASHBOARD_CHART_WIDTH)
                 )
-                fig_errors.update_layout(margin=dict(l=10, r=10, t=40, b=10))
                 st.plotly_chart(fig_errors, use_container_width=True)
             
             # 부품별 교체 횟수
-            if not df_parts.empty:
-                parts_counts = df_parts['part_code'].value_counts()
+            if snapshot.parts_counts:
+                parts_counts = snapshot.top_counts('parts_counts')
                 fig_parts_types = px.bar(
-                    x=parts_counts.index,
-                    y=parts_counts.values,
+                    x=[code for code, _ in parts_counts],
+                    y=[count for _, count in parts_counts],
                     title=get_text("parts_replacement", lang),
                     labels={
                         'x': get_text("part_code", lang), 
@@ -137,18 +138,37 @@ class DashboardComponent:
         with col1:
             st.metric(
                 get_text("average_repair_time", lang),
-                f"{df_errors['repair_time'].mean():.1f} {get_text('minutes', lang)}"
+                f"{snapshot.average_repair_time:.1f} {get_text('minutes', lang)}"
             )
         with col2:
             st.metric(
                 get_text("max_repair_time", lang),
-                f"{df_errors['repair_time'].max()} {get_text('minutes', lang)}"
+                f"{snapshot.repair_max} {get_text('minutes', lang)}"
             )
         with col3:
             st.metric(
                 get_text("total_downtime", lang),
-                f"{df_errors['repair_time'].sum()} {get_text('minutes', lang)}"
+                f"{snapshot.repair_total} {get_text('minutes', lang)}"
+            )
+
+    def get_snapshot(self, lang):
+        """
+        대시보드 스냅샷을 가져옵니다.
+        저장소가 설정되지 않은 경우 세션마다 한 번 생성한 예시 데이터 스냅샷을 사용합니다.
+        """
+        snapshot = get_dashboard_snapshot()
+        if snapshot is not None:
+            return snapshot
+        
+        sample_key = f"dashboard_sample_snapshot_{lang}"
+        if sample_key not in st.session_state:
+            start_date = datetime.now() - timedelta(days=30)
+            st.session_state[sample_key] = DashboardSnapshot.from_records(
+                generate_equipment_data(lang),
+                generate_error_data(start_date, datetime.now()),
+                generate_parts_data(start_date, datetime.now())
             )
+        return st.session_state[sample_key]
 
     def render_suspended_plans(self):
         st.subheader(get_text("plan_suspension", self.lang))
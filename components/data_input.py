@@ -40,6 +40,8 @@ except ImportError:
     def insert_data(*args, **kwargs): return None
     def add_equipment_stop(*args, **kwargs): return None
 
+from utils.serial_index import normalize_equipment_number
+
 try:
     from components.language import _normalize_language_code, get_text
 except ImportError:
@@ -61,6 +63,34 @@ except ImportError:
     Image = ImageMock()
     io = __import__('io')
 
+try:
+    from utils.image_pipeline import compress_image_bytes, compress_uploaded_images, make_previews, read_upload
+except ImportError:
+    print("ERROR: 'utils.image_pipeline' module could not be loaded.")
+    # 임시 대체 함수들
+    def compress_image_bytes(data, max_size=1024, quality=85): return data
+    def compress_uploaded_images(files, *args, **kwargs): return []
+    def make_previews(files, *args, **kwargs): return []
+    def read_upload(file): return file.getvalue()
+
+try:
+    from utils.write_queue import enqueue_write, get_write_queue
+except ImportError:
+    print("ERROR: 'utils.write_queue' module not found.")
+    # 임시 대체 함수들
+    def enqueue_write(*args, **kwargs): raise RuntimeError("write queue unavailable")
+    def get_write_queue(): return None
+
+try:
+    from utils.image_store import store_images, serialize_image_refs
+    from components.image_gallery import render_image_gallery
+except ImportError:
+    print("ERROR: image store modules could not be loaded.")
+    # 임시 대체 함수들
+    def store_images(images): return []
+    def serialize_image_refs(refs): return None
+    def render_image_gallery(*args, **kwargs): return None
+
 # 데이터 입력 페이지 텍스트
 DATA_INPUT_TEXTS = {
     "data_input": {
@@ -135,6 +165,30 @@ DATA_INPUT_TEXTS = {
         "ko": "데이터가 현재 세션에만 저장되었고 데이터베이스에는 저장되지 않았습니다.",
         "vi": "Dữ liệu đã được lưu trong phiên hiện tại nhưng không lưu vào cơ sở dữ liệu"
     },
+    "save_queued": {
+        "ko": "저장되었습니다. 네트워크가 연결되면 데이터베이스로 자동 전송됩니다.",
+        "vi": "Đã lưu. Dữ liệu sẽ được tự động gửi lên cơ sở dữ liệu khi có kết nối mạng"
+    },
+    "queue_pending": {
+        "ko": "데이터베이스 전송 대기 중",
+        "vi": "Đang chờ gửi lên cơ sở dữ liệu"
+    },
+    "queue_failed": {
+        "ko": "전송 실패 (자동 재시도 중지)",
+        "vi": "Gửi thất bại (đã dừng tự động thử lại)"
+    },
+    "queue_retry": {
+        "ko": "다시 전송",
+        "vi": "Gửi lại"
+    },
+    "queue_failed_rows": {
+        "ko": "전송 실패 항목",
+        "vi": "Các mục gửi thất bại"
+    },
+    "queue_discard": {
+        "ko": "실패 항목 삭제",
+        "vi": "Xóa các mục thất bại"
+    },
     "save_error": {
         "ko": "데이터베이스 저장 오류",
         "vi": "Lỗi khi lưu vào cơ sở dữ liệu"
@@ -237,51 +291,21 @@ for i in range(1, 801):
 
 def get_serial_number(equipment_number):
     """설비 번호에 해당하는 시리얼 번호를 반환합니다.
-    먼저 데이터베이스에서 조회하고, 없으면 기본 매핑에서 가져옵니다."""
+    먼저 시리얼 인덱스(메모리)에서 조회하고, 없으면 기본 매핑에서 가져옵니다."""
     
-    # 1. 데이터베이스에서 시리얼 번호 조회 시도
+    # 1. 시리얼 인덱스에서 조회 (네트워크 요청 없음)
     db_serial = get_serial_by_equipment_number(equipment_number)
     if db_serial:
         return db_serial
     
-    # 2. 데이터베이스에서 찾지 못한 경우 기본 매핑 사용
-    return DEFAULT_EQUIPMENT_SERIAL_MAPPING.get(equipment_number, None)
+    # 2. 인덱스에서 찾지 못한 경우 기본 매핑 사용 ('12', 'EQ012' 등 입력 형식 정규화)
+    return DEFAULT_EQUIPMENT_SERIAL_MAPPING.get(normalize_equipment_number(equipment_number), None)
 
 # 이미지 압축 함수
 def compress_image(file, max_size=1024, quality=85):
     """이미지를 압축하여 메모리 사용량을 줄입니다."""
-    # 이미지 열기
-    img = Image.open(file)
-    
-    # RGBA 이미지를 RGB로 변환 (JPG는 알파 채널을 지원하지 않음)
-    if img.mode == 'RGBA':
-        # 흰색 배경에 합성
-        bg = Image.new('RGB', img.size, (255, 255, 255))
-        bg.paste(img, mask=img.split()[3])  # 알파 채널을 마스크로 사용
-        img = bg
-    elif img.mode != 'RGB':
-        img = img.convert('RGB')
-    
-    # 이미지 크기 확인 및 조정
-    w, h = img.size
-    if max(w, h) > max_size:
-        if w > h:
-            new_w, new_h = max_size, int(h * max_size / w)
-        else:
-            new_w, new_h = int(w * max_size / h), max_size
-        # LANCZOS 대신 호환성 있는 리사이징 필터 사용
-        try:
-            img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-        except AttributeError:
-            # 구버전 Pillow에서는 ANTIALIAS 사용
-            img = img.resize((new_w, new_h), Image.ANTIALIAS)
-    
-    # 압축된 이미지를 바이트로 변환
-    buffer = io.BytesIO()
-    img.save(buffer, format='JPEG', quality=quality, optimize=True)
-    buffer.seek(0)
-    
-    return buffer
+    # 큰 JPEG 는 축소 디코딩 후 리사이즈합니다 (utils/image_pipeline.py)
+    return io.BytesIO(compress_image_bytes(read_upload(file), max_size, quality))
 
 class DataInputComponent:
     def __init__(self, lang=None):
@@ -295,6 +319,7 @@ class DataInputComponent:
             lang = _normalize_language_code(st.session_state.current_lang)
         
         st.title(get_input_text("data_input", lang))
+        self.render_write_queue_status(lang)
         
         # 입력 유형 선택
         input_tabs = st.tabs([
@@ -320,6 +345,30 @@ class DataInputComponent:
         with input_tabs[3]:
             self.render_equipment_stop_input(lang)
     
+    def render_write_queue_status(self, lang):
+        """데이터베이스 전송 대기/실패 건수를 표시합니다."""
+        queue = get_write_queue()
+        if queue is None:
+            return
+        counts = queue.pending_counts()
+        pending = sum(counts['pending'].values())
+        failed = sum(counts['failed'].values())
+        if pending:
+            st.info(f"{get_input_text('queue_pending', lang)}: {pending}")
+        if failed:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.warning(f"{get_input_text('queue_failed', lang)}: {failed} ({queue.last_error or '-'})")
+            with col2:
+                if st.button(get_input_text("queue_retry", lang), key="write_queue_retry"):
+                    queue.retry_failed()
+            with col3:
+                if st.button(get_input_text("queue_discard", lang), key="write_queue_discard"):
+                    queue.discard_failed()
+            # 실패 보관 상태의 행과 행별 백엔드 오류 메시지
+            with st.expander(get_input_text("queue_failed_rows", lang)):
+                st.dataframe(pd.DataFrame(queue.failed_rows()), use_container_width=True)
+    
     def render_error_input(self, lang):
         """오류 입력 폼을 렌더링합니다."""
         with st.form("error_input_form"):
@@ -363,10 +412,10 @@ class DataInputComponent:
                 st.subheader(get_input_text("image_preview", lang))
                 image_cols = st.columns(min(len(uploaded_files), 4))
                 
-                for i, file in enumerate(uploaded_files[:10]):  # 최대 10개까지만 표시
+                # 작은 썸네일로 미리보기 (최대 10개까지만 표시)
+                for i, preview in enumerate(make_previews(uploaded_files[:10])):
                     with image_cols[i % 4]:
-                        img = Image.open(file)
-                        st.image(img, caption=f"{get_input_text('image', lang)} {i+1}", width=150)
+                        st.image(preview, caption=f"{get_input_text('image', lang)} {i+1}", width=150)
             
             # 설비 번호 입력 시 시리얼 번호 자동 조회
             if equipment_number:
@@ -385,30 +434,25 @@ class DataInputComponent:
                 if not all([equipment_number, error_code, error_detail, worker, supervisor]):
                     st.error(get_input_text("fill_all_fields", lang))
                 else:
+                    image_paths = []
                     try:
-                        # 이미지 처리
-                        image_data = []
+                        # 이미지 처리: 최대 10개까지 병렬 압축 후 이미지 저장소에 저장 (행에는 해시만 기록)
                         if uploaded_files:
-                            for file in uploaded_files[:10]:  # 최대 10개까지만 저장
-                                compressed_image = compress_image(file)
-                                image_data.append({
-                                    "filename": file.name,
-                                    "image_data": compressed_image
-                                })
+                            image_paths = store_images(compress_uploaded_images(uploaded_files[:10]))
                         
-                        # 데이터 저장
-                        add_error_history(
-                            equipment_number=equipment_number,
-                            serial_number=serial_number or "",
-                            error_code=error_code,
-                            error_detail=error_detail,
-                            repair_time=repair_time,
-                            worker=worker,
-                            supervisor=supervisor,
-                            images=image_data
-                        )
+                        # 쓰기 대기열에 저장 (데이터베이스 전송은 백그라운드에서 처리)
+                        enqueue_write('error_history', {
+                            "equipment_number": equipment_number,
+                            "serial_number": serial_number or "",
+                            "error_code": error_code,
+                            "error_detail": error_detail,
+                            "repair_time": repair_time,
+                            "worker": worker,
+                            "supervisor": supervisor,
+                            "image_paths": serialize_image_refs(image_paths)
+                        })
                         
-                        st.success(get_input_text("save_success", lang))
+                        st.success(get_input_text("save_queued", lang))
                         
                         # 저장 후 폼 초기화
                         st.session_state.equipment_number = ""
@@ -434,7 +478,8 @@ class DataInputComponent:
                             "repair_time": repair_time,
                             "worker": worker,
                             "supervisor": supervisor,
-                            "image_count": len(uploaded_files) if uploaded_files else 0
+                            "image_count": len(uploaded_files) if uploaded_files else 0,
+                            "image_paths": image_paths
                         })
                         
                         st.info(get_input_text("save_session", lang))
@@ -459,6 +504,8 @@ class DataInputComponent:
                         st.write(f"{get_input_text('supervisor', lang)}: {entry['supervisor']}")
                         if 'image_count' in entry and entry['image_count'] > 0:
                             st.write(f"{get_input_text('image_count', lang)}: {entry['image_count']}")
+                    
+                    render_image_gallery(entry.get('image_paths'), key=f"error_entry_{i}", lang=lang)
     
     def render_parts_input(self, lang):
         """부품 교체 입력 폼을 렌더링합니다."""
@@ -505,10 +552,10 @@ class DataInputComponent:
                 st.subheader(get_input_text("image_preview", lang))
                 image_cols = st.columns(min(len(parts_uploaded_files), 4))
                 
-                for i, file in enumerate(parts_uploaded_files[:10]):  # 최대 10개까지만 표시
+                # 작은 썸네일로 미리보기 (최대 10개까지만 표시)
+                for i, preview in enumerate(make_previews(parts_uploaded_files[:10])):
                     with image_cols[i % 4]:
-                        img = Image.open(file)
-                        st.image(img, caption=f"{get_input_text('image', lang)} {i+1}", width=150)
+                        st.image(preview, caption=f"{get_input_text('image', lang)} {i+1}", width=150)
             
             # 설비 번호 입력 시 시리얼 번호 자동 조회
             if parts_equipment_number:
@@ -527,29 +574,24 @@ class DataInputComponent:
                 if not all([parts_equipment_number, part_code, parts_worker, parts_supervisor]):
                     st.error(get_input_text("fill_all_fields", lang))
                 else:
+                    image_paths = []
                     try:
-                        # 이미지 처리
-                        image_data = []
+                        # 이미지 처리: 최대 10개까지 병렬 압축 후 이미지 저장소에 저장 (행에는 해시만 기록)
                         if parts_uploaded_files:
-                            for file in parts_uploaded_files[:10]:  # 최대 10개까지만 저장
-                                compressed_image = compress_image(file)
-                                image_data.append({
-                                    "filename": file.name,
-                                    "image_data": compressed_image
-                                })
+                            image_paths = store_images(compress_uploaded_images(parts_uploaded_files[:10]))
                         
-                        # 데이터 저장
-                        add_parts_replacement(
-                            equipment_number=parts_equipment_number,
-                            serial_number=parts_serial_number or "",
-                            part_code=part_code,
-                            repair_time=parts_repair_time,
-                            worker=parts_worker,
-                            supervisor=parts_supervisor,
-                            images=image_data
-                        )
+                        # 쓰기 대기열에 저장 (데이터베이스 전송은 백그라운드에서 처리)
+                        enqueue_write('parts_replacement', {
+                            "equipment_number": parts_equipment_number,
+                            "serial_number": parts_serial_number or "",
+                            "part_code": part_code,
+                            "repair_time": parts_repair_time,
+                            "worker": parts_worker,
+                            "supervisor": parts_supervisor,
+                            "image_paths": serialize_image_refs(image_paths)
+                        })
                         
-                        st.success(get_input_text("save_success", lang))
+                        st.success(get_input_text("save_queued", lang))
                         
                         # 저장 후 폼 초기화
                         st.session_state.parts_equipment_number = ""
@@ -573,7 +615,8 @@ class DataInputComponent:
                             "repair_time": parts_repair_time,
                             "worker": parts_worker,
                             "supervisor": parts_supervisor,
-                            "image_count": len(parts_uploaded_files) if parts_uploaded_files else 0
+                            "image_count": len(parts_uploaded_files) if parts_uploaded_files else 0,
+                            "image_paths": image_paths
                         })
                         
                         st.info(get_input_text("save_session", lang))
@@ -597,6 +640,8 @@ class DataInputComponent:
                         st.write(f"{get_input_text('supervisor', lang)}: {entry['supervisor']}")
                         if 'image_count' in entry and entry['image_count'] > 0:
                             st.write(f"{get_input_text('image_count', lang)}: {entry['image_count']}")
+                    
+                    render_image_gallery(entry.get('image_paths'), key=f"parts_entry_{i}", lang=lang)
     
     def render_model_change_input(self, lang):
         """모델 교체 입력 폼을 렌더링합니다."""
@@ -631,17 +676,17 @@ class DataInputComponent:
                     st.error(get_input_text("fill_all_fields", lang))
                 else:
                     try:
-                        # 데이터 저장
-                        add_model_change(
-                            equipment_number=model_equipment_number,
-                            from_model=from_model,
-                            to_model=to_model,
-                            change_time=model_change_time,
-                            worker=model_worker,
-                            supervisor=model_supervisor
-                        )
+                        # 쓰기 대기열에 저장 (model_changes 테이블 컬럼명으로 변환)
+                        enqueue_write('model_changes', {
+                            "equipment_number": model_equipment_number,
+                            "model_from": from_model,
+                            "model_to": to_model,
+                            "duration_minutes": model_change_time,
+                            "worker": model_worker,
+                            "supervisor": model_supervisor
+                        })
                         
-                        st.success(get_input_text("save_success", lang))
+                        st.success(get_input_text("save_queued", lang))
                         
                         # 저장 후 폼 초기화
                         st.session_state.model_equipment_number = ""
@@ -730,18 +775,20 @@ class DataInputComponent:
                     st.error(get_input_text("fill_all_fields", lang))
                 else:
                     try:
-                        # 데이터 저장
-                        add_equipment_stop(
-                            equipment_number=stop_equipment_number,
-                            stop_reason=stop_reason,
-                            start_time=stop_start_time,
-                            duration_minutes=stop_duration,
-                            worker=stop_worker,
-                            supervisor=stop_supervisor,
-                            details=stop_detail
-                        )
+                        # 쓰기 대기열에 저장 (종료 시각은 시작 시각 + 정지 시간)
+                        enqueue_write('equipment_stops', {
+                            "equipment_number": stop_equipment_number,
+                            "serial_number": get_serial_number(stop_equipment_number) or "",
+                            "stop_reason": stop_reason,
+                            "start_time": stop_start_time,
+                            "end_time": stop_start_time + timedelta(minutes=stop_duration),
+                            "duration_minutes": stop_duration,
+                            "worker": stop_worker,
+                            "supervisor": stop_supervisor,
+                            "details": stop_detail
+                        })
                         
-                        st.success(get_input_text("save_success", lang))
+                        st.success(get_input_text("save_queued", lang))
                         
                         # 저장 후 폼 초기화
                         st.session_state.stop_equipment_number = ""
@@ -770,7 +817,7 @@ class DataInputComponent:
                             "details": stop_detail
                         })
                         
-                    st.info(get_input_text("save_session", lang))
+                        st.info(get_input_text("save_session", lang))
     
 
 # 원래 함수는 주석 처리합니다
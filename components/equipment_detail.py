@@ -3,6 +3,11 @@ import pandas as pd
 from datetime import datetime, timedelta
 import random
 from components.language import get_text
+from components.image_gallery import render_image_gallery
+from utils.supabase_client import supabase, get_history_page, get_equipment_list
+from utils.equipment_index import get_equipment_index
+from utils.query_cache import get_data_version
+from services.equipment_timeline import EquipmentTimeline, TIMELINE_TABLES, to_event
 
 # 추가 텍스트 정의
 EQUIPMENT_TEXTS = {
@@ -77,9 +82,72 @@ EQUIPMENT_TEXTS = {
     "part_code": {
         "ko": "부품 코드",
         "vi": "Mã linh kiện"
+    },
+    "photo_records": {
+        "ko": "사진이 있는 이력",
+        "vi": "Lịch sử có ảnh"
+    },
+    "equipment_search": {
+        "ko": "설비 검색 (번호, 시리얼, 유형, 건물, 상태)",
+        "vi": "Tìm thiết bị (số, serial, loại, tòa nhà, trạng thái)"
+    },
+    "no_search_result": {
+        "ko": "검색 결과가 없습니다.",
+        "vi": "Không có kết quả tìm kiếm"
+    },
+    "equipment_timeline": {
+        "ko": "설비 이력 타임라인",
+        "vi": "Dòng thời gian thiết bị"
+    },
+    "no_timeline": {
+        "ko": "설비 이력이 없습니다.",
+        "vi": "Không có lịch sử thiết bị"
+    },
+    "load_more": {
+        "ko": "더 보기",
+        "vi": "Xem thêm"
+    },
+    "event_time": {
+        "ko": "시간",
+        "vi": "Thời gian"
+    },
+    "event_type": {
+        "ko": "구분",
+        "vi": "Loại"
+    },
+    "event_summary": {
+        "ko": "내용",
+        "vi": "Nội dung"
+    },
+    "duration_minutes": {
+        "ko": "소요 시간(분)",
+        "vi": "Thời gian (phút)"
+    },
+    "event_error": {
+        "ko": "고장",
+        "vi": "Lỗi"
+    },
+    "event_parts": {
+        "ko": "부품 교체",
+        "vi": "Thay linh kiện"
+    },
+    "event_stop": {
+        "ko": "설비 정지",
+        "vi": "Dừng thiết bị"
+    },
+    "event_model_change": {
+        "ko": "모델 변경",
+        "vi": "Thay đổi model"
+    },
+    "event_plan_suspension": {
+        "ko": "계획 정지",
+        "vi": "Tạm dừng kế hoạch"
     }
 }
 
+# 설비 상세 화면에서 조회하는 최근 이력 건수
+HISTORY_LIMIT = 100
+
 def get_equipment_text(key, lang):
     """설비 상세 페이지 전용 텍스트를 가져옵니다."""
     if key in EQUIPMENT_TEXTS:
@@ -99,37 +167,36 @@ class EquipmentDetailComponent:
             
         st.title(get_equipment_text("equipment_detail", lang))
         
-        # 설비 목록 로드 (예시 데이터 사용)
-        equipment_list = generate_equipment_data(lang)
+        # 설비 목록 로드 (저장소가 없으면 예시 데이터 사용)
+        if supabase:
+            index = get_equipment_index(get_equipment_list)
+        else:
+            index = get_equipment_index(lambda: generate_equipment_data(lang), key=('example', lang))
         
         # 설비 선택
-        df_equipment = pd.DataFrame(equipment_list)
-        selected_equipment = st.selectbox(
-            get_equipment_text("equipment_select", lang),
-            df_equipment['equipment_number'].tolist(),
-            format_func=lambda x: f"{x} ({df_equipment[df_equipment['equipment_number'] == x]['equipment_type'].iloc[0]})"
-        )
+        selected_equipment = self.render_equipment_selector(index, lang)
         
         if selected_equipment:
             # 선택된 설비 정보 표시
-            equipment_info = df_equipment[df_equipment['equipment_number'] == selected_equipment].iloc[0]
+            equipment_info = index.get(selected_equipment)
             
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric(get_equipment_text("equipment_number", lang), equipment_info['equipment_number'])
             with col2:
-                st.metric(get_equipment_text("equipment_type", lang), equipment_info['equipment_type'])
+                st.metric(get_equipment_text("equipment_type", lang), equipment_info.get('equipment_type') or '-')
             with col3:
-                st.metric(get_equipment_text("current_status", lang), equipment_info['status'])
+                st.metric(get_equipment_text("current_status", lang), equipment_info.get('status') or '-')
+            
+            # 전체 이력 타임라인
+            self.render_timeline(selected_equipment, lang)
             
             # 고장 이력
             st.subheader(get_equipment_text("error_history", lang))
-            error_history = generate_error_history(lang)
-            df_errors = pd.DataFrame(error_history)
-            df_errors = df_errors[df_errors['equipment_number'] == selected_equipment]
+            df_errors = load_equipment_history('error_history', selected_equipment, lang)
             if not df_errors.empty:
                 st.dataframe(
-                    df_errors,
+                    df_errors.drop(columns=['id', 'image_paths'], errors='ignore'),
                     column_config={
                         "timestamp": st.column_config.DatetimeColumn(
                             get_equipment_text("occurrence_time", lang),
@@ -143,17 +210,16 @@ class EquipmentDetailComponent:
                         "supervisor": get_equipment_text("supervisor", lang)
                     }
                 )
+                self.render_history_photos(df_errors, 'error', 'error_code', lang)
             else:
                 st.info(get_equipment_text("no_error_history", lang))
             
             # 부품 교체 이력
             st.subheader(get_equipment_text("parts_history", lang))
-            parts_history = generate_parts_replacement(lang)
-            df_parts = pd.DataFrame(parts_history)
-            df_parts = df_parts[df_parts['equipment_number'] == selected_equipment]
+            df_parts = load_equipment_history('parts_replacement', selected_equipment, lang)
             if not df_parts.empty:
                 st.dataframe(
-                    df_parts,
+                    df_parts.drop(columns=['id', 'image_paths'], errors='ignore'),
                     column_config={
                         "timestamp": st.column_config.DatetimeColumn(
                             get_equipment_text("replacement_time", lang),
@@ -164,9 +230,92 @@ class EquipmentDetailComponent:
                         "supervisor": get_equipment_text("supervisor", lang)
                     }
                 )
+                self.render_history_photos(df_parts, 'parts', 'part_code', lang)
             else:
                 st.info(get_equipment_text("no_parts_history", lang))
 
+    def render_equipment_selector(self, index, lang):
+        """
+        검색어로 후보를 좁힌 뒤 설비를 선택합니다.
+        검색과 표시 문자열은 미리 만든 인덱스에서 조회하므로 옵션 수가 많아도 옵션당 비용이 일정합니다.
+        """
+        query = st.text_input(get_equipment_text("equipment_search", lang), key="equipment_search")
+        options = index.search(query) if query.strip() else index.numbers
+        if not options:
+            st.info(get_equipment_text("no_search_result", lang))
+            return None
+        return st.selectbox(
+            get_equipment_text("equipment_select", lang),
+            options,
+            format_func=index.label,
+            key="equipment_select"
+        )
+
+    def get_timeline(self, equipment_number, lang):
+        """
+        세션에 보관된 설비 타임라인을 반환합니다.
+        설비가 바뀌거나 이력 데이터 버전이 바뀌면 첫 페이지부터 다시 불러옵니다.
+        """
+        state_key = (equipment_number, get_data_version(*TIMELINE_TABLES), bool(supabase))
+        entry = st.session_state.get('equipment_timeline')
+        if entry is None or entry[0] != state_key:
+            streams = None if supabase else example_timeline_streams(equipment_number, lang)
+            timeline = EquipmentTimeline(equipment_number, streams=streams)
+            timeline.load_more()
+            entry = (state_key, timeline)
+            st.session_state['equipment_timeline'] = entry
+        return entry[1]
+
+    def render_timeline(self, equipment_number, lang):
+        """고장/부품 교체/설비 정지/모델 변경/계획 정지 이력을 하나의 최신순 목록으로 표시합니다."""
+        st.subheader(get_equipment_text("equipment_timeline", lang))
+        timeline = self.get_timeline(equipment_number, lang)
+        if not timeline.events:
+            st.info(get_equipment_text("no_timeline", lang))
+            return
+        
+        df_events = pd.DataFrame(timeline.events, columns=['time', 'event_type', 'summary', 'duration_minutes', 'worker'])
+        df_events['event_type'] = df_events['event_type'].map(lambda t: get_equipment_text(f"event_{t}", lang))
+        st.dataframe(
+            df_events,
+            column_config={
+                "time": st.column_config.DatetimeColumn(
+                    get_equipment_text("event_time", lang),
+                    format="YYYY-MM-DD HH:mm"
+                ),
+                "event_type": get_equipment_text("event_type", lang),
+                "summary": get_equipment_text("event_summary", lang),
+                "duration_minutes": get_equipment_text("duration_minutes", lang),
+                "worker": get_equipment_text("worker", lang)
+            },
+            hide_index=True
+        )
+        # 버튼 콜백에서 다음 페이지를 불러오므로 다시 실행된 화면에 바로 반영됩니다.
+        if timeline.has_more:
+            st.button(get_equipment_text("load_more", lang), key="timeline_load_more", on_click=timeline.load_more)
+
+    def render_history_photos(self, df, prefix, label_column, lang):
+        """사진이 있는 이력을 선택하면 해당 이력의 사진만 불러와 표시합니다."""
+        if 'image_paths' not in df.columns:
+            return
+        photo_rows = df[df['image_paths'].notna() & (df['image_paths'] != '')]
+        if photo_rows.empty:
+            return
+        
+        labels = {
+            index: f"{pd.to_datetime(row['timestamp']).strftime('%Y-%m-%d %H:%M')} {row.get(label_column, '')}"
+            for index, row in photo_rows.iterrows()
+        }
+        selected = st.selectbox(
+            get_equipment_text("photo_records", lang),
+            list(labels),
+            format_func=labels.get,
+            key=f"{prefix}_photo_record"
+        )
+        if selected is not None:
+            row = photo_rows.loc[selected]
+            render_image_gallery(row['image_paths'], key=f"{prefix}_{row.get('id', selected)}", lang=lang)
+
 # 예시 설비 데이터
 def generate_equipment_data(lang='ko'):
     """설비 데이터 예시를 생성합니다."""
@@ -223,6 +372,28 @@ def generate_equipment_data(lang='ko'):
     return equipment_data
 
 # 예시 고장 이력 데이터
+def load_equipment_history(table, equipment_number, lang='ko'):
+    """
+    설비의 최근 이력을 데이터프레임으로 조회합니다.
+    저장소가 설정되지 않았으면 예시 데이터를 사용합니다.
+    """
+    if supabase:
+        rows, _ = get_history_page(table, page_size=HISTORY_LIMIT, equipment_number=equipment_number)
+        return pd.DataFrame(rows)
+    
+    generator = generate_error_history if table == 'error_history' else generate_parts_replacement
+    df = pd.DataFrame(generator(lang))
+    return df[df['equipment_number'] == equipment_number]
+
+def example_timeline_streams(equipment_number, lang='ko'):
+    """저장소가 없을 때 예시 고장/부품 교체 이력으로 최신순 이벤트 스트림을 만듭니다."""
+    streams = []
+    for event_type, generator in (('error', generate_error_history), ('parts', generate_parts_replacement)):
+        rows = [row for row in generator(lang) if row['equipment_number'] == equipment_number]
+        rows.sort(key=lambda row: row['timestamp'], reverse=True)
+        streams.append([to_event(event_type, row, 'timestamp') for row in rows])
+    return streams
+
 def generate_error_history(lang='ko'):
     """고장 이력 예시를 생성합니다."""
     # 언어 코드 표준화
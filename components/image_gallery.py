@@ -0,0 +1,71 @@
+import streamlit as st
+from components.language import _normalize_language_code
+from utils.image_store import get_image_store, parse_image_refs, THUMBNAIL_SIZES
+
+# 사진 표시 텍스트
+GALLERY_TEXTS = {
+    "show_photos": {
+        "ko": "사진 보기",
+        "vi": "Xem ảnh"
+    },
+    "photo": {
+        "ko": "사진",
+        "vi": "Ảnh"
+    },
+    "view_original": {
+        "ko": "원본 보기",
+        "vi": "Xem ảnh gốc"
+    },
+    "photo_missing": {
+        "ko": "사진을 찾을 수 없습니다.",
+        "vi": "Không tìm thấy ảnh."
+    }
+}
+
+def get_gallery_text(key, lang):
+    """사진 표시 전용 텍스트를 가져옵니다."""
+    lang = _normalize_language_code(lang)
+    if key in GALLERY_TEXTS:
+        return GALLERY_TEXTS[key].get(lang, GALLERY_TEXTS[key]['ko'])
+    return f"[{key}]"
+
+def render_image_gallery(image_paths, key, lang='ko', columns=4):
+    """
+    이력 행의 사진을 필요할 때만 불러와 표시합니다.
+    체크박스를 선택하기 전에는 이미지 파일을 읽지 않으며, 원본은 선택한 한 장만 읽습니다.
+
+    Args:
+        image_paths: image_paths 컬럼 값 (해시 목록)
+        key (str): 위젯 키 접두사
+        lang (str): 언어 코드
+        columns (int): 썸네일 열 수
+    """
+    refs = parse_image_refs(image_paths)
+    if not refs:
+        return
+
+    if not st.checkbox(f"{get_gallery_text('show_photos', lang)} ({len(refs)})", key=f"{key}_show_photos"):
+        return
+
+    store = get_image_store()
+    cols = st.columns(min(len(refs), columns))
+    for i, ref in enumerate(refs):
+        with cols[i % columns]:
+            thumbnail = store.thumbnail(ref, THUMBNAIL_SIZES[0])
+            if thumbnail:
+                st.image(thumbnail, caption=f"{get_gallery_text('photo', lang)} {i+1}", width=THUMBNAIL_SIZES[0])
+            else:
+                st.caption(get_gallery_text("photo_missing", lang))
+
+    selected = st.selectbox(
+        get_gallery_text("view_original", lang),
+        [None] + list(range(len(refs))),
+        format_func=lambda i: "-" if i is None else f"{get_gallery_text('photo', lang)} {i+1}",
+        key=f"{key}_original"
+    )
+    if selected is not None:
+        original = store.get(refs[selected])
+        if original:
+            st.image(original, use_column_width=True)
+        else:
+            st.caption(get_gallery_text("photo_missing", lang))
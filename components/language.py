@@ -216,6 +216,18 @@ TEXTS = {
         "ko": "날짜",
         "vi": "Ngày"
     },
+    "chart_range": {
+        "ko": "표시 구간",
+        "vi": "Khoảng hiển thị"
+    },
+    "chart_period": {
+        "ko": "조회 기간",
+        "vi": "Khoảng thời gian"
+    },
+    "days_unit": {
+        "ko": "일",
+        "vi": "ngày"
+    },
     
     # 부품 관련
     "part_code": {
@@ -305,6 +317,34 @@ TEXTS = {
     "plan_resumed": {
         "ko": "계획이 재개되었습니다.",
         "vi": "Kế hoạch đã tiếp tục"
+    },
+    "start_date": {
+        "ko": "시작일",
+        "vi": "Ngày bắt đầu"
+    },
+    "end_date": {
+        "ko": "종료일",
+        "vi": "Ngày kết thúc"
+    },
+    "suspension_conflict": {
+        "ko": "같은 설비에 기간이 겹치는 계획 정지가 있습니다.",
+        "vi": "Thiết bị đã có kế hoạch tạm dừng trùng thời gian"
+    },
+    "availability_calendar": {
+        "ko": "가동 가능 캘린더",
+        "vi": "Lịch khả dụng"
+    },
+    "machines_down": {
+        "ko": "정지 설비 수",
+        "vi": "Số thiết bị dừng"
+    },
+    "machines_available": {
+        "ko": "가동 가능 설비 수",
+        "vi": "Số thiết bị khả dụng"
+    },
+    "fleet_availability": {
+        "ko": "가동 가능률 (%)",
+        "vi": "Tỷ lệ khả dụng (%)"
     }
 }
 
@@ -333,6 +373,46 @@ ADMIN_TEXTS = {
     "model_management": {
         "ko": "모델 관리",
         "vi": "Quản lý model"
+    },
+    "bulk_import": {
+        "ko": "이력 일괄 가져오기",
+        "vi": "Nhập dữ liệu lịch sử hàng loạt"
+    },
+    "import_table": {
+        "ko": "대상 데이터",
+        "vi": "Loại dữ liệu"
+    },
+    "import_file": {
+        "ko": "CSV / Excel 파일",
+        "vi": "Tệp CSV / Excel"
+    },
+    "import_dry_run": {
+        "ko": "검증만 하기 (저장하지 않음)",
+        "vi": "Chỉ kiểm tra (không lưu)"
+    },
+    "import_start": {
+        "ko": "가져오기 시작",
+        "vi": "Bắt đầu nhập"
+    },
+    "import_progress": {
+        "ko": "{read}행 처리 중 (정상 {valid}, 오류 {invalid}, 저장 {inserted})",
+        "vi": "Đang xử lý {read} dòng (hợp lệ {valid}, lỗi {invalid}, đã lưu {inserted})"
+    },
+    "import_done": {
+        "ko": "완료: {read}행 중 정상 {valid}, 오류 {invalid}, 신규 저장 {inserted}",
+        "vi": "Hoàn tất: {read} dòng, hợp lệ {valid}, lỗi {invalid}, lưu mới {inserted}"
+    },
+    "import_stopped": {
+        "ko": "저장 중 오류가 발생해 중단되었습니다. 같은 파일로 다시 실행하면 이어서 저장됩니다.",
+        "vi": "Đã dừng do lỗi khi lưu. Chạy lại với cùng tệp để tiếp tục."
+    },
+    "import_errors": {
+        "ko": "검증 오류 행",
+        "vi": "Các dòng lỗi"
+    },
+    "import_errors_download": {
+        "ko": "오류 목록 다운로드",
+        "vi": "Tải danh sách lỗi"
     }
 }
 
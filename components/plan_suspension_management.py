@@ -1,5 +1,7 @@
 import streamlit as st
-from utils.supabase_client import get_supabase
+import pandas as pd
+from utils.supabase_client import get_supabase, get_plan_suspension_index, get_equipment_list
+from modules.charts.downsampling import build_time_series_figure
 from components.language import get_text, _normalize_language_code
 from datetime import datetime, date, timedelta
 import pkg_resources
@@ -25,10 +27,11 @@ class PlanSuspensionManagementComponent:
         st.title(get_text("plan_suspension_management", lang))
         
         # 중단 중인 계획과 중단 이력 탭 생성
-        tab1, tab2, tab3 = st.tabs([
+        tab1, tab2, tab3, tab4 = st.tabs([
             get_text("current_suspensions", lang),
             get_text("create_suspension", lang),
-            get_text("suspension_history", lang)
+            get_text("suspension_history", lang),
+            get_text("availability_calendar", lang)
         ])
         
         # 중단 중인 계획 탭
@@ -42,6 +45,10 @@ class PlanSuspensionManagementComponent:
         # 중단 이력 탭
         with tab3:
             self.render_suspension_history()
+        
+        # 가동 가능 캘린더 탭
+        with tab4:
+            self.render_availability_calendar()
     
     def create_suspension(self):
         """새로운 계획 정지 등록 폼"""
@@ -98,6 +105,21 @@ class PlanSuspensionManagementComponent:
                     st.error(get_text("enter_equipment_number", self.lang))
                     return
                 
+                # 같은 설비에 기간이 겹치는 설비 PM/모델 변경 정지가 있으면 등록하지 않음
+                index = get_plan_suspension_index()
+                if index is not None:
+                    conflicts = index.find_conflicts(
+                        equipment_number, start_date, estimated_end_date
+                    )
+                    if conflicts:
+                        st.error(get_text("suspension_conflict", self.lang))
+                        for item in conflicts:
+                            st.markdown(
+                                f"- {item.get('type', 'N/A')} {item.get('plan_id', '')} "
+                                f"({item.get('start_date', 'N/A')} ~ {item.get('end_date') or item.get('estimated_end_date') or ''})"
+                            )
+                        return
+                
                 try:
                     # 데이터 준비
                     suspension_data = {
@@ -135,8 +157,11 @@ class PlanSuspensionManagementComponent:
         today = date.today()
         
         try:
-            suspensions = self.supabase.table('plan_suspensions').select('*').is_('end_date', 'null').execute()
-            suspensions_data = suspensions.data
+            # 오늘을 포함하는 정지 기간 (종료일이 없거나 오늘 이후)
+            index = get_plan_suspension_index()
+            if index is None:
+                raise LookupError('plan_suspensions')
+            suspensions_data = index.suspended_on(today)
         except Exception as e:
             st.warning(f"{get_text('database_error', self.lang)}: plan_suspensions 테이블이 존재하지 않습니다.")
             # 가상 데이터 생성
@@ -435,4 +460,48 @@ class PlanSuspensionManagementComponent:
                 st.write(f"**{get_text('resume_date', self.lang)}:** {record.get('end_date', 'N/A')}")
                 st.write(f"**{get_text('reason', self.lang)}:** {record.get('reason', 'N/A')}")
                 st.write(f"**{get_text('responsible_person', self.lang)}:** {record.get('responsible_person', 'N/A')}")
-                st.write(f"**{get_text('status', self.lang)}:** {status}") 
\ No newline at end of file
+                st.write(f"**{get_text('status', self.lang)}:** {status}") 
+    
+    def render_availability_calendar(self):
+        """전체 설비의 일별 정지 설비 수와 가동 가능률을 표시합니다."""
+        index = get_plan_suspension_index()
+        if index is None:
+            st.warning(f"{get_text('database_error', self.lang)}: plan_suspensions 테이블이 존재하지 않습니다.")
+            return
+        
+        today = date.today()
+        col1, col2 = st.columns(2)
+        with col1:
+            start = st.date_input(get_text("start_date", self.lang), value=today - timedelta(days=30), key="calendar_start")
+        with col2:
+            end = st.date_input(get_text("end_date", self.lang), value=today + timedelta(days=30), key="calendar_end")
+        if end < start:
+            return
+        
+        total_machines = len(get_equipment_list())
+        calendar = pd.DataFrame(index.availability_calendar(start, end, total_machines))
+        if calendar.empty or not total_machines:
+            return
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(get_text("machines_down", self.lang), int(calendar['down'].max()))
+        with col2:
+            st.metric(get_text("machines_available", self.lang), int(calendar['available'].min()))
+        
+        fig = build_time_series_figure(
+            pd.to_datetime(calendar['date']), calendar['availability'] * 100,
+            title=get_text("availability_calendar", self.lang),
+            y_label=get_text("fleet_availability", self.lang)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            calendar[calendar['down'] > 0],
+            column_config={
+                "date": get_text("date", self.lang),
+                "down": get_text("machines_down", self.lang),
+                "available": get_text("machines_available", self.lang),
+                "availability": None
+            },
+            hide_index=True
+        )
@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 import random
+from collections import OrderedDict
 from components.language import get_text, _normalize_language_code
 
 # 보고서 페이지 텍스트
@@ -122,6 +123,86 @@ REPORTS_TEXTS = {
     "minutes": {
         "ko": "분",
         "vi": "phút"
+    },
+    "start_date": {
+        "ko": "시작일",
+        "vi": "Ngày bắt đầu"
+    },
+    "end_date": {
+        "ko": "종료일",
+        "vi": "Ngày kết thúc"
+    },
+    "select_report": {
+        "ko": "보고서 선택",
+        "vi": "Chọn báo cáo"
+    },
+    "reliability_analysis": {
+        "ko": "신뢰성 지표",
+        "vi": "Chỉ số độ tin cậy"
+    },
+    "group_by": {
+        "ko": "집계 기준",
+        "vi": "Nhóm theo"
+    },
+    "building": {
+        "ko": "건물",
+        "vi": "Tòa nhà"
+    },
+    "equipment_type": {
+        "ko": "설비 유형",
+        "vi": "Loại thiết bị"
+    },
+    "machines": {
+        "ko": "설비 대수",
+        "vi": "Số thiết bị"
+    },
+    "failures": {
+        "ko": "고장 건수",
+        "vi": "Số lần hỏng"
+    },
+    "mtbf_hours": {
+        "ko": "MTBF (시간)",
+        "vi": "MTBF (giờ)"
+    },
+    "mttr_minutes": {
+        "ko": "MTTR (분)",
+        "vi": "MTTR (phút)"
+    },
+    "availability": {
+        "ko": "가동률 (%)",
+        "vi": "Tỷ lệ vận hành (%)"
+    },
+    "failure_rate": {
+        "ko": "고장률 (1,000시간당)",
+        "vi": "Tỷ lệ hỏng (trên 1.000 giờ)"
+    },
+    "availability_by_group": {
+        "ko": "그룹별 가동률",
+        "vi": "Tỷ lệ vận hành theo nhóm"
+    },
+    "rolling_availability": {
+        "ko": "가동률 추이 (최근 30일 이동)",
+        "vi": "Xu hướng tỷ lệ vận hành (trượt 30 ngày)"
+    },
+    "date": {
+        "ko": "날짜",
+        "vi": "Ngày"
+    },
+    "daily_error_trend": {
+        "ko": "일별 고장 발생 추이",
+        "vi": "Xu hướng xuất hiện lỗi theo ngày"
+    },
+    "repair_downtime": {
+        "ko": "수리 시간 (분)",
+        "vi": "Thời gian sửa chữa (phút)"
+    },
+    "stop_minutes": {
+        "ko": "정지 시간 (분)",
+        "vi": "Thời gian dừng máy (phút)"
+    },
+    "downtime_top_equipment": {
+        "ko": "다운타임 상위 {count}대 설비",
+        "vi": "{count} thiết bị có thời gian ngừng máy cao nhất"
     }
 }
 
@@ -212,9 +293,96 @@ def generate_sample_data(lang='ko'):
     
     return pd.DataFrame(error_data), pd.DataFrame(parts_data)
 
+# 보고서 탭 (표시 순서)
+REPORT_TABS = ["error_type_analysis", "parts_consumption", "worker_statistics", "downtime_analysis",
+               "reliability_analysis"]
+# 세션별로 보관하는 탭 계산 결과 수 (기간/언어/데이터 버전 조합)
+REPORT_MEMO_SIZE = 16
+# 기간이 이 일수를 넘으면 원본 이력 대신 일별 집계 테이블로 보고서를 만듭니다.
+ROLLUP_MIN_DAYS = 31
+# 일별 집계 보고서의 설비별 다운타임 차트에 표시하는 설비 수
+DOWNTIME_TOP_EQUIPMENT = 30
+
+def data_version_of(*frames):
+    """
+    조회한 데이터의 내용 지문 묶음을 반환합니다 (탭 계산 결과 메모 키).
+    다른 프로세스의 쓰기는 이 프로세스의 데이터 버전을 바꾸지 않으므로, TTL 만료 후 다시 조회한
+    데이터가 달라지면 지문으로 이전 계산 결과를 쓰지 않게 합니다.
+    """
+    from modules.charts.figure_cache import data_fingerprint
+    return tuple(data_fingerprint(frame) for frame in frames)
+
+def load_report_frames(start_date, end_date):
+    """
+    기간 내 고장/부품 교체 이력을 보고서용 데이터프레임으로 불러옵니다.
+    저장소가 설정되지 않은 경우 None 을, 조회 오류 시 빈 데이터프레임을 반환합니다.
+    """
+    from utils.supabase_client import supabase, query_cache, _select_range
+    if not supabase:
+        return None
+
+    start = datetime.combine(start_date, datetime.min.time()).isoformat()
+    end = datetime.combine(end_date, datetime.max.time()).isoformat()
+    try:
+        errors = query_cache.get_or_load(
+            'error_history', ('report_range', start, end),
+            lambda: _select_range('error_history', 'timestamp,equipment_number,error_code,repair_time,worker', start, end)
+        )
+        parts = query_cache.get_or_load(
+            'parts_replacement', ('report_range', start, end),
+            lambda: _select_range('parts_replacement', 'timestamp,equipment_number,part_code,worker', start, end)
+        )
+    except Exception as e:
+        st.error(f"데이터 조회 오류: {str(e)}")
+        errors, parts = [], []
+    return report_frames_from_records(errors, parts)
+
+def report_frames_from_records(errors, parts):
+    """고장/부품 교체 이력 행 목록을 보고서용(한글 컬럼) 데이터프레임으로 변환합니다."""
+    df_errors = pd.DataFrame(errors, columns=['timestamp', 'equipment_number', 'error_code', 'repair_time', 'worker'])
+    df_errors.columns = ['발생시간', '설비번호', '오류코드', '수리시간', '작업자']
+    df_errors['발생시간'] = pd.to_datetime(df_errors['발생시간'])
+    df_errors['수리시간'] = pd.to_numeric(df_errors['수리시간']).fillna(0)
+    df_parts = pd.DataFrame(parts, columns=['timestamp', 'equipment_number', 'part_code', 'worker'])
+    df_parts.columns = ['교체시간', '설비번호', '부품코드', '작업자']
+    df_parts['교체시간'] = pd.to_datetime(df_parts['교체시간'])
+    return df_errors, df_parts
+
+def load_report_rollups(start_date, end_date):
+    """
+    기간 내 일별 집계(고장/부품 교체/설비 정지)를 데이터프레임으로 불러옵니다.
+    저장소가 설정되지 않은 경우 None 을 반환합니다.
+    """
+    from utils.supabase_client import (
+        supabase, get_error_daily_rollup, get_parts_daily_rollup, get_downtime_daily_rollup
+    )
+    if not supabase:
+        return None
+
+    df_errors = pd.DataFrame(
+        get_error_daily_rollup(start_date, end_date),
+        columns=['day', 'equipment_number', 'error_code', 'occurrences', 'total_repair_time', 'max_repair_time']
+    )
+    df_parts = pd.DataFrame(get_parts_daily_rollup(start_date, end_date), columns=['day', 'part_code', 'replacements'])
+    df_downtime = pd.DataFrame(
+        get_downtime_daily_rollup(start_date, end_date),
+        columns=['day', 'equipment_number', 'stops', 'stop_minutes']
+    )
+    for frame in (df_errors, df_parts, df_downtime):
+        frame['day'] = pd.to_datetime(frame['day'])
+    numeric = {
+        'occurrences': df_errors, 'total_repair_time': df_errors, 'max_repair_time': df_errors,
+        'replacements': df_parts, 'stops': df_downtime, 'stop_minutes': df_downtime
+    }
+    for column, frame in numeric.items():
+        frame[column] = pd.to_numeric(frame[column]).fillna(0)
+    return df_errors, df_parts, df_downtime
+
 class ReportsComponent:
-    def __init__(self, lang=None):
+    def __init__(self, lang=None, lazy=True):
         self.lang = lang if lang else 'kr'
+        # lazy=True 이면 선택한 탭의 데이터 준비와 차트 생성만 수행합니다.
+        self.lazy = lazy
         
     def render(self):
         """보고서 및 통계 페이지를 렌더링합니다."""
@@ -225,84 +393,178 @@ class ReportsComponent:
             
         st.title(get_report_text("reports_title", lang))
         
-        # 탭 생성
-        tabs = st.tabs([
-            get_report_text("error_type_analysis", lang),
-            get_report_text("parts_consumption", lang),
-            get_report_text("worker_statistics", lang),
-            get_report_text("downtime_analysis", lang)
-        ])
+        # 조회 기간
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input(get_report_text("start_date", lang),
+                                       value=datetime.now().date() - timedelta(days=30), key="reports_start_date")
+        with col2:
+            end_date = st.date_input(get_report_text("end_date", lang),
+                                     value=datetime.now().date(), key="reports_end_date")
+        
+        # 긴 기간은 원본 이력 대신 일별 집계로 보고서를 만듭니다.
+        rollups = None
+        if (end_date - start_date).days + 1 > ROLLUP_MIN_DAYS:
+            rollups = load_report_rollups(start_date, end_date)
+        if rollups is not None:
+            self.render_rollup_report(rollups, start_date, end_date, lang)
+            return
+        
+        df_errors, df_parts, data_version = self.get_report_data(start_date, end_date, lang)
+        filters = (str(start_date), str(end_date), lang, data_version)
         
-        # 예시 데이터 생성
-        error_data, parts_data = generate_sample_data(lang)
+        self.render_tabs([
+            lambda: self.render_error_tab(df_errors, df_parts, lang, filters),
+            lambda: self.render_parts_tab(df_errors, df_parts, lang, filters),
+            lambda: self.render_worker_tab(df_errors, df_parts, lang, filters),
+            lambda: self.render_downtime_tab(df_errors, df_parts, lang, filters),
+            lambda: self.render_reliability_tab(df_errors, df_parts, lang, filters)
+        ], lang)
         
-        # 오류 데이터 데이터프레임으로 변환
-        df_errors = pd.DataFrame(error_data)
-        df_errors['시간'] = df_errors['발생시간'].dt.hour
-        df_errors['월'] = df_errors['발생시간'].dt.month
+        self.render_summary(
+            df_errors['수리시간'].mean() if len(df_errors) else 0,
+            df_errors['수리시간'].max() if len(df_errors) else 0,
+            df_errors['수리시간'].sum(),
+            lang
+        )
+    
+    def render_tabs(self, renderers, lang):
+        """보고서 탭을 표시합니다. renderers 는 REPORT_TABS 순서의 탭 렌더링 함수 목록입니다."""
+        if self.lazy:
+            # 선택한 탭만 계산합니다 (st.tabs 는 모든 탭 내용을 매번 실행함).
+            selected = st.radio(
+                get_report_text("select_report", lang),
+                range(len(REPORT_TABS)),
+                format_func=lambda i: get_report_text(REPORT_TABS[i], lang),
+                horizontal=True,
+                key="reports_tab",
+                label_visibility="collapsed"
+            )
+            renderers[selected]()
+        else:
+            tabs = st.tabs([get_report_text(name, lang) for name in REPORT_TABS])
+            for tab, renderer in zip(tabs, renderers):
+                with tab:
+                    renderer()
+    
+    def render_summary(self, average_repair_time, max_repair_time, total_downtime, lang):
+        """통계 요약 (아래쪽에 표시)"""
+        st.subheader(get_report_text("statistics_summary", lang))
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric(
+                get_report_text("average_repair_time", lang),
+                f"{average_repair_time:.1f} {get_report_text('minutes', lang)}"
+            )
         
-        # 부품 데이터 데이터프레임으로 변환
-        df_parts = pd.DataFrame(parts_data)
-        df_parts['월'] = df_parts['교체시간'].dt.month
+        with col2:
+            st.metric(
+                get_report_text("max_repair_time", lang),
+                f"{max_repair_time} {get_report_text('minutes', lang)}"
+            )
         
-        # 고장 유형 분석 탭
-        with tabs[0]:
-            col1, col2 = st.columns(2)
+        with col3:
+            st.metric(
+                get_report_text("total_downtime", lang),
+                f"{total_downtime} {get_report_text('minutes', lang)}"
+            )
+    
+    def get_report_data(self, start_date, end_date, lang):
+        """
+        보고서 데이터프레임과 데이터 버전을 반환합니다.
+        저장소가 설정되지 않은 경우 세션마다 한 번 생성한 예시 데이터를 사용합니다.
+        """
+        frames = load_report_frames(start_date, end_date)
+        if frames is not None:
+            df_errors, df_parts = frames
+            data_version = data_version_of(df_errors, df_parts)
+        else:
+            sample_key = f"reports_sample_data_{_normalize_language_code(lang)}"
+            if sample_key not in st.session_state:
+                st.session_state[sample_key] = generate_sample_data(lang)
+            df_errors, df_parts = st.session_state[sample_key]
+            df_errors = df_errors[df_errors['발생시간'].dt.date.between(start_date, end_date)]
+            df_parts = df_parts[df_parts['교체시간'].dt.date.between(start_date, end_date)]
+            data_version = ('sample', sample_key)
+        
+        df_errors = df_errors.assign(시간=df_errors['발생시간'].dt.hour, 월=df_errors['발생시간'].dt.month)
+        df_parts = df_parts.assign(월=df_parts['교체시간'].dt.month)
+        return df_errors, df_parts, data_version
+    
+    def memoized(self, name, filters, build):
+        """
+        탭 계산 결과(집계 + Figure)를 기간/언어/데이터 버전(내용 지문)별로 세션에 보관합니다.
+        같은 조건으로 다시 실행되면 집계와 차트 생성을 건너뜁니다.
+        """
+        memo = st.session_state.setdefault('reports_memo', OrderedDict())
+        key = (name,) + filters
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+        result = build()
+        memo[key] = result
+        while len(memo) > REPORT_MEMO_SIZE:
+            memo.popitem(last=False)
+        return result
+    
+    def render_error_tab(self, df_errors, df_parts, lang, filters):
+        """고장 유형 분석 탭"""
+        def build():
+            # 오류 코드별 발생 횟수
+            error_counts = df_errors['오류코드'].value_counts().reset_index()
+            error_counts.columns = [get_report_text("error_code", lang), get_report_text("occurrences", lang)]
+            
+            fig_error_counts = px.bar(
+                error_counts,
+                x=get_report_text("error_code", lang),
+                y=get_report_text("occurrences", lang),
+                title=get_report_text("occurrences_by_error_code", lang)
+            )
             
-            with col1:
-                # 오류 코드별 발생 횟수
-                error_counts = df_errors['오류코드'].value_counts().reset_index()
-                error_counts.columns = [get_report_text("error_code", lang), get_report_text("occurrences", lang)]
-                
-                fig_error_counts = px.bar(
-                    error_counts,
-                    x=get_report_text("error_code", lang),
-                    y=get_report_text("occurrences", lang),
-                    title=get_report_text("occurrences_by_error_code", lang)
-                )
-                st.plotly_chart(fig_error_counts, use_container_width=True)
+            # 시간대별 고장 발생 추이
+            hour_counts = df_errors['시간'].value_counts().reset_index()
+            hour_counts.columns = [get_report_text("hour", lang), get_report_text("occurrences", lang)]
+            hour_counts = hour_counts.sort_values(by=get_report_text("hour", lang))
             
-            with col2:
-                # 시간대별 고장 발생 추이
-                hour_counts = df_errors['시간'].value_counts().reset_index()
-                hour_counts.columns = [get_report_text("hour", lang), get_report_text("occurrences", lang)]
-                hour_counts = hour_counts.sort_values(by=get_report_text("hour", lang))
-                
-                fig_hour_counts = px.line(
-                    hour_counts,
-                    x=get_report_text("hour", lang),
-                    y=get_report_text("occurrences", lang),
-                    markers=True,
-                    title=get_report_text("error_trend_by_hour", lang)
-                )
-                st.plotly_chart(fig_hour_counts, use_container_width=True)
+            fig_hour_counts = px.line(
+                hour_counts,
+                x=get_report_text("hour", lang),
+                y=get_report_text("occurrences", lang),
+                markers=True,
+                title=get_report_text("error_trend_by_hour", lang)
+            )
+            return fig_error_counts, fig_hour_counts
         
-        # 부품 소모 현황 탭
-        with tabs[1]:
-            col1, col2 = st.columns(2)
+        fig_error_counts, fig_hour_counts = self.memoized('error_type_analysis', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_error_counts, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_hour_counts, use_container_width=True)
+    
+    def render_parts_tab(self, df_errors, df_parts, lang, filters):
+        """부품 소모 현황 탭"""
+        def build():
+            # 부품별 교체 횟수
+            part_counts = df_parts['부품코드'].value_counts().reset_index()
+            part_counts.columns = [get_report_text("part_code", lang), get_report_text("replacements", lang)]
             
-            with col1:
-                # 부품별 교체 횟수
-                part_counts = df_parts['부품코드'].value_counts().reset_index()
-                part_counts.columns = [get_report_text("part_code", lang), get_report_text("replacements", lang)]
-                
-                fig_part_counts = px.bar(
-                    part_counts,
-                    x=get_report_text("part_code", lang),
-                    y=get_report_text("replacements", lang),
-                    title=get_report_text("replacements_by_part", lang)
-                )
-                st.plotly_chart(fig_part_counts, use_container_width=True)
+            fig_part_counts = px.bar(
+                part_counts,
+                x=get_report_text("part_code", lang),
+                y=get_report_text("replacements", lang),
+                title=get_report_text("replacements_by_part", lang)
+            )
             
-            with col2:
-                # 부품별 교체 비율
-                fig_part_pie = px.pie(
-                    part_counts,
-                    names=get_report_text("part_code", lang),
-                    values=get_report_text("replacements", lang),
-                    title=get_report_text("replacement_ratio_by_part", lang)
-                )
-                st.plotly_chart(fig_part_pie, use_container_width=True)
+            # 부품별 교체 비율
+            fig_part_pie = px.pie(
+                part_counts,
+                names=get_report_text("part_code", lang),
+                values=get_report_text("replacements", lang),
+                title=get_report_text("replacement_ratio_by_part", lang)
+            )
             
             # 월별 부품 교체 추이
             monthly_parts = df_parts.groupby('월').size().reset_index()
@@ -315,90 +577,299 @@ class ReportsComponent:
                 markers=True,
                 title=get_report_text("monthly_parts_trend", lang)
             )
-            st.plotly_chart(fig_monthly_parts, use_container_width=True)
+            return fig_part_counts, fig_part_pie, fig_monthly_parts
         
-        # 작업자별 통계 탭
-        with tabs[2]:
-            col1, col2 = st.columns(2)
+        fig_part_counts, fig_part_pie, fig_monthly_parts = self.memoized('parts_consumption', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_part_counts, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_part_pie, use_container_width=True)
+        st.plotly_chart(fig_monthly_parts, use_container_width=True)
+    
+    def render_worker_tab(self, df_errors, df_parts, lang, filters):
+        """작업자별 통계 탭"""
+        def build():
+            # 작업자별 처리 건수
+            worker_counts = df_errors['작업자'].value_counts().reset_index()
+            worker_counts.columns = [get_report_text("worker", lang), get_report_text("repairs", lang)]
             
-            with col1:
-                # 작업자별 처리 건수
-                worker_counts = df_errors['작업자'].value_counts().reset_index()
-                worker_counts.columns = [get_report_text("worker", lang), get_report_text("repairs", lang)]
-                
-                fig_worker_counts = px.bar(
-                    worker_counts,
-                    x=get_report_text("worker", lang),
-                    y=get_report_text("repairs", lang),
-                    title=get_report_text("repairs_by_worker", lang)
-                )
-                st.plotly_chart(fig_worker_counts, use_container_width=True)
+            fig_worker_counts = px.bar(
+                worker_counts,
+                x=get_report_text("worker", lang),
+                y=get_report_text("repairs", lang),
+                title=get_report_text("repairs_by_worker", lang)
+            )
             
-            with col2:
-                # 작업자별 평균 수리 시간
-                worker_repair_times = df_errors.groupby('작업자')['수리시간'].mean().reset_index()
-                worker_repair_times.columns = [get_report_text("worker", lang), get_report_text("avg_repair_time", lang)]
-                
-                fig_worker_times = px.bar(
-                    worker_repair_times,
-                    x=get_report_text("worker", lang),
-                    y=get_report_text("avg_repair_time", lang),
-                    title=get_report_text("avg_repair_time_by_worker", lang)
-                )
-                st.plotly_chart(fig_worker_times, use_container_width=True)
+            # 작업자별 평균 수리 시간
+            worker_repair_times = df_errors.groupby('작업자')['수리시간'].mean().reset_index()
+            worker_repair_times.columns = [get_report_text("worker", lang), get_report_text("avg_repair_time", lang)]
+            
+            fig_worker_times = px.bar(
+                worker_repair_times,
+                x=get_report_text("worker", lang),
+                y=get_report_text("avg_repair_time", lang),
+                title=get_report_text("avg_repair_time_by_worker", lang)
+            )
+            return fig_worker_counts, fig_worker_times
         
-        # 다운타임 분석 탭
-        with tabs[3]:
-            col1, col2 = st.columns(2)
+        fig_worker_counts, fig_worker_times = self.memoized('worker_statistics', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_worker_counts, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_worker_times, use_container_width=True)
+    
+    def render_downtime_tab(self, df_errors, df_parts, lang, filters):
+        """다운타임 분석 탭"""
+        def build():
+            # 설비별 다운타임
+            equipment_downtime = df_errors.groupby('설비번호')['수리시간'].sum().reset_index()
+            equipment_downtime.columns = [get_report_text("equipment_number", lang), get_report_text("total_downtime", lang)]
+            
+            fig_equipment_downtime = px.bar(
+                equipment_downtime,
+                x=get_report_text("equipment_number", lang),
+                y=get_report_text("total_downtime", lang),
+                title=get_report_text("downtime_by_equipment", lang)
+            )
             
-            with col1:
-                # 설비별 다운타임
-                equipment_downtime = df_errors.groupby('설비번호')['수리시간'].sum().reset_index()
-                equipment_downtime.columns = [get_report_text("equipment_number", lang), get_report_text("total_downtime", lang)]
-                
-                fig_equipment_downtime = px.bar(
-                    equipment_downtime,
-                    x=get_report_text("equipment_number", lang),
-                    y=get_report_text("total_downtime", lang),
-                    title=get_report_text("downtime_by_equipment", lang)
-                )
-                st.plotly_chart(fig_equipment_downtime, use_container_width=True)
+            # 오류 코드별 평균 수리 시간
+            error_repair_times = df_errors.groupby('오류코드')['수리시간'].mean().reset_index()
+            error_repair_times.columns = [get_report_text("error_code", lang), get_report_text("avg_repair_time", lang)]
             
-            with col2:
-                # 오류 코드별 평균 수리 시간
-                error_repair_times = df_errors.groupby('오류코드')['수리시간'].mean().reset_index()
-                error_repair_times.columns = [get_report_text("error_code", lang), get_report_text("avg_repair_time", lang)]
-                
-                fig_error_times = px.bar(
-                    error_repair_times,
-                    x=get_report_text("error_code", lang),
-                    y=get_report_text("avg_repair_time", lang),
-                    title=get_report_text("avg_repair_time_by_error", lang)
-                )
-                st.plotly_chart(fig_error_times, use_container_width=True)
+            fig_error_times = px.bar(
+                error_repair_times,
+                x=get_report_text("error_code", lang),
+                y=get_report_text("avg_repair_time", lang),
+                title=get_report_text("avg_repair_time_by_error", lang)
+            )
+            return fig_equipment_downtime, fig_error_times
         
-        # 통계 요약 (아래쪽에 표시)
-        st.subheader(get_report_text("statistics_summary", lang))
+        fig_equipment_downtime, fig_error_times = self.memoized('downtime_analysis', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_equipment_downtime, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_error_times, use_container_width=True)
+
+    def render_rollup_report(self, rollups, start_date, end_date, lang):
+        """일별 집계로 보고서 탭과 통계 요약을 표시합니다 (작업자별 통계만 원본 이력 사용)."""
+        df_error_days, df_parts_days, df_downtime_days = rollups
+        filters = (str(start_date), str(end_date), lang, data_version_of(*rollups))
         
-        col1, col2, col3 = st.columns(3)
+        def render_worker_tab():
+            # 작업자 정보는 집계에 없으므로 이 탭을 선택한 경우에만 원본 이력을 불러옵니다.
+            df_errors, df_parts, data_version = self.get_report_data(start_date, end_date, lang)
+            self.render_worker_tab(df_errors, df_parts, lang, (str(start_date), str(end_date), lang, data_version))
         
+        empty_errors = pd.DataFrame(columns=['발생시간', '설비번호', '수리시간'])
+        self.render_tabs([
+            lambda: self.render_error_rollup_tab(df_error_days, lang, filters),
+            lambda: self.render_parts_rollup_tab(df_parts_days, lang, filters),
+            render_worker_tab,
+            lambda: self.render_downtime_rollup_tab(df_error_days, df_downtime_days, lang, filters),
+            lambda: self.render_reliability_tab(empty_errors, None, lang, filters)
+        ], lang)
+        
+        occurrences = df_error_days['occurrences'].sum()
+        total_repair_time = int(df_error_days['total_repair_time'].sum())
+        self.render_summary(
+            total_repair_time / occurrences if occurrences else 0,
+            int(df_error_days['max_repair_time'].max()) if len(df_error_days) else 0,
+            total_repair_time,
+            lang
+        )
+    
+    def render_error_rollup_tab(self, df_error_days, lang, filters):
+        """고장 유형 분석 탭 (일별 집계, 시간대별 추이 대신 일별 추이 표시)"""
+        from modules.charts.downsampling import build_time_series_figure
+        
+        def build():
+            error_counts = df_error_days.groupby('error_code')['occurrences'].sum() \
+                .sort_values(ascending=False).reset_index()
+            error_counts.columns = [get_report_text("error_code", lang), get_report_text("occurrences", lang)]
+            
+            fig_error_counts = px.bar(
+                error_counts,
+                x=get_report_text("error_code", lang),
+                y=get_report_text("occurrences", lang),
+                title=get_report_text("occurrences_by_error_code", lang)
+            )
+            
+            daily_counts = df_error_days.groupby('day')['occurrences'].sum()
+            fig_daily_counts = build_time_series_figure(
+                daily_counts.index,
+                daily_counts.values,
+                title=get_report_text("daily_error_trend", lang),
+                x_label=get_report_text("date", lang),
+                y_label=get_report_text("occurrences", lang),
+                height=450
+            )
+            return fig_error_counts, fig_daily_counts
+        
+        fig_error_counts, fig_daily_counts = self.memoized('error_type_analysis:rollup', filters, build)
+        col1, col2 = st.columns(2)
         with col1:
-            st.metric(
-                get_report_text("average_repair_time", lang),
-                f"{df_errors['수리시간'].mean():.1f} {get_report_text('minutes', lang)}"
+            st.plotly_chart(fig_error_counts, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_daily_counts, use_container_width=True)
+    
+    def render_parts_rollup_tab(self, df_parts_days, lang, filters):
+        """부품 소모 현황 탭 (일별 집계)"""
+        def build():
+            part_counts = df_parts_days.groupby('part_code')['replacements'].sum() \
+                .sort_values(ascending=False).reset_index()
+            part_counts.columns = [get_report_text("part_code", lang), get_report_text("replacements", lang)]
+            
+            fig_part_counts = px.bar(
+                part_counts,
+                x=get_report_text("part_code", lang),
+                y=get_report_text("replacements", lang),
+                title=get_report_text("replacements_by_part", lang)
+            )
+            
+            fig_part_pie = px.pie(
+                part_counts,
+                names=get_report_text("part_code", lang),
+                values=get_report_text("replacements", lang),
+                title=get_report_text("replacement_ratio_by_part", lang)
+            )
+            
+            # 여러 해에 걸친 기간이므로 연-월 단위로 집계합니다.
+            monthly_parts = df_parts_days.groupby(df_parts_days['day'].dt.strftime('%Y-%m'))['replacements'] \
+                .sum().reset_index()
+            monthly_parts.columns = [get_report_text("month", lang), get_report_text("replacements", lang)]
+            
+            fig_monthly_parts = px.line(
+                monthly_parts,
+                x=get_report_text("month", lang),
+                y=get_report_text("replacements", lang),
+                markers=True,
+                title=get_report_text("monthly_parts_trend", lang)
             )
+            return fig_part_counts, fig_part_pie, fig_monthly_parts
         
+        fig_part_counts, fig_part_pie, fig_monthly_parts = self.memoized('parts_consumption:rollup', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_part_counts, use_container_width=True)
         with col2:
-            st.metric(
-                get_report_text("max_repair_time", lang),
-                f"{df_errors['수리시간'].max()} {get_report_text('minutes', lang)}"
+            st.plotly_chart(fig_part_pie, use_container_width=True)
+        st.plotly_chart(fig_monthly_parts, use_container_width=True)
+    
+    def render_downtime_rollup_tab(self, df_error_days, df_downtime_days, lang, filters):
+        """다운타임 분석 탭 (일별 집계, 다운타임 상위 설비의 수리 시간 + 정지 시간)"""
+        def build():
+            downtime = pd.DataFrame({
+                get_report_text("repair_downtime", lang): df_error_days.groupby('equipment_number')['total_repair_time'].sum(),
+                get_report_text("stop_minutes", lang): df_downtime_days.groupby('equipment_number')['stop_minutes'].sum()
+            }).fillna(0)
+            downtime = downtime.loc[downtime.sum(axis=1).nlargest(DOWNTIME_TOP_EQUIPMENT).index]
+            downtime.index.name = get_report_text("equipment_number", lang)
+            downtime = downtime.reset_index()
+            
+            fig_equipment_downtime = px.bar(
+                downtime,
+                x=get_report_text("equipment_number", lang),
+                y=[get_report_text("repair_downtime", lang), get_report_text("stop_minutes", lang)],
+                title=get_report_text("downtime_top_equipment", lang).format(count=DOWNTIME_TOP_EQUIPMENT)
             )
+            
+            error_totals = df_error_days.groupby('error_code')[['total_repair_time', 'occurrences']].sum()
+            error_repair_times = (error_totals['total_repair_time'] / error_totals['occurrences']).round(2).reset_index()
+            error_repair_times.columns = [get_report_text("error_code", lang), get_report_text("avg_repair_time", lang)]
+            
+            fig_error_times = px.bar(
+                error_repair_times,
+                x=get_report_text("error_code", lang),
+                y=get_report_text("avg_repair_time", lang),
+                title=get_report_text("avg_repair_time_by_error", lang)
+            )
+            return fig_equipment_downtime, fig_error_times
         
-        with col3:
-            st.metric(
-                get_report_text("total_downtime", lang),
-                f"{df_errors['수리시간'].sum()} {get_report_text('minutes', lang)}"
+        fig_equipment_downtime, fig_error_times = self.memoized('downtime_analysis:rollup', filters, build)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_equipment_downtime, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_error_times, use_container_width=True)
+    
+    def get_reliability_frames(self, df_errors, filters):
+        """
+        신뢰성 지표 계산용 (설비 목록, 고장 이력, 정지 이력)과 데이터 버전을 반환합니다.
+        저장소가 설정되지 않은 경우 보고서 예시 데이터로 설비 목록을 구성합니다 (정지 이력 없음).
+        """
+        from services.reliability_service import load_reliability_frames, DEFAULT_ROLLING_DAYS
+        
+        # 이동 지표의 첫 날짜도 온전한 기간으로 계산하도록 이동 기간만큼 앞부터 불러옵니다.
+        start = pd.Timestamp(filters[0]) - pd.Timedelta(days=DEFAULT_ROLLING_DAYS - 1)
+        end = pd.Timestamp(filters[1]) + pd.Timedelta(days=1)
+        frames = load_reliability_frames(start, end)
+        if frames is not None:
+            return frames, data_version_of(*frames)
+        
+        numbers = sorted(df_errors['설비번호'].unique())
+        equipment = [{'equipment_number': number, 'building': f"{'ABC'[i % 3]}동", 'equipment_type': 'SMT'}
+                     for i, number in enumerate(numbers)]
+        errors = df_errors.rename(columns={'발생시간': 'timestamp', '설비번호': 'equipment_number',
+                                           '수리시간': 'repair_time'})
+        return (equipment, errors, []), filters[3]
+    
+    def render_reliability_tab(self, df_errors, df_parts, lang, filters):
+        """신뢰성 지표 탭 (MTBF / MTTR / 가동률 / 고장률)"""
+        from services.reliability_service import compute_reliability, rolling_reliability
+        
+        group_by = st.radio(
+            get_report_text("group_by", lang),
+            ['building', 'equipment_type', 'equipment_number'],
+            format_func=lambda name: get_report_text(name, lang),
+            horizontal=True,
+            key="reports_reliability_group"
+        )
+        (equipment, errors, stops), data_version = self.get_reliability_frames(df_errors, filters)
+        start = pd.Timestamp(filters[0])
+        end = pd.Timestamp(filters[1]) + pd.Timedelta(days=1)
+        
+        def build():
+            metrics = compute_reliability(equipment, errors, stops, start, end, by=group_by)
+            labels = {name: get_report_text(name, lang) for name in
+                      ['machines', 'failures', 'mtbf_hours', 'mttr_minutes', 'availability', 'failure_rate']}
+            table = metrics[list(labels)].rename(columns=labels).round(2)
+            table.index.name = get_report_text(group_by, lang)
+            table = table.reset_index()
+            
+            fig_availability = px.bar(
+                table.sort_values(labels['availability']),
+                x=table.columns[0],
+                y=labels['availability'],
+                hover_data=[labels['mtbf_hours'], labels['mttr_minutes']],
+                title=get_report_text("availability_by_group", lang)
+            )
+            
+            # 전체 설비 기준 최근 30일 이동 가동률
+            trend = rolling_reliability(equipment, errors, stops, start, end)
+            trend = trend[['date', 'availability']].rename(columns={
+                'date': get_report_text("date", lang),
+                'availability': labels['availability']
+            })
+            fig_trend = px.line(
+                trend,
+                x=get_report_text("date", lang),
+                y=labels['availability'],
+                title=get_report_text("rolling_availability", lang)
             )
+            return table, fig_availability, fig_trend
+        
+        table, fig_availability, fig_trend = self.memoized(
+            'reliability_analysis', filters + (group_by, data_version), build
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_availability, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_trend, use_container_width=True)
+        st.dataframe(table, use_container_width=True, hide_index=True)
 
 # 원래 함수는 주석 처리합니다
 # def show_reports(lang='ko'):
@@ -74,6 +74,8 @@ CREATE TABLE IF NOT EXISTS parts_replacement (
     worker VARCHAR(100),
     supervisor VARCHAR(100),
     part_code VARCHAR(20),
+    repair_time INTEGER,
+    image_paths TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -127,39 +129,53 @@ ALTER TABLE parts_replacement ENABLE ROW LEVEL SECURITY;
 ALTER TABLE equipment_stops ENABLE ROW LEVEL SECURITY;
 ALTER TABLE equipment_serials ENABLE ROW LEVEL SECURITY;
 
+-- 현재 사용자가 관리자인지 확인 (RLS 를 거치지 않고 users 조회)
+-- 정책에서는 (SELECT public.is_admin()) 로 감싸 문장당 한 번만 계산되게 합니다.
+CREATE OR REPLACE FUNCTION public.is_admin()
+RETURNS BOOLEAN
+LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = public AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM public.users WHERE id = auth.uid() AND role = 'admin'
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.is_admin() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.is_admin() TO authenticated;
+
 -- 관리자는 모든 테이블에 대한 모든 권한 부여
 CREATE POLICY admin_all_users ON users FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_equipment ON equipment FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_error_codes ON error_codes FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_parts ON parts FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_error_history ON error_history FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_parts_replacement ON parts_replacement FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY admin_all_equipment_stops ON equipment_stops FOR ALL TO authenticated USING (
-    auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    (SELECT public.is_admin())
 );
 
 CREATE POLICY "Public equipment_serials access" ON equipment_serials FOR SELECT USING (true);
 CREATE POLICY "Authenticated users can insert equipment_serials" ON equipment_serials FOR INSERT WITH CHECK (auth.role() = 'authenticated');
 CREATE POLICY "Users can update their own equipment_serials" ON equipment_serials FOR UPDATE USING (auth.role() = 'authenticated');
-CREATE POLICY "Admins can delete equipment_serials" ON equipment_serials FOR DELETE USING (auth.role() = 'authenticated' AND (SELECT role FROM users WHERE id = auth.uid()) = 'admin');
+CREATE POLICY "Admins can delete equipment_serials" ON equipment_serials FOR DELETE TO authenticated USING ((SELECT public.is_admin()));
 
 -- 일반 사용자 정책 설정
 CREATE POLICY read_all_equipment ON equipment FOR SELECT TO authenticated USING (true);
@@ -168,12 +184,12 @@ CREATE POLICY read_all_parts ON parts FOR SELECT TO authenticated USING (true);
 
 -- 사용자는 자신의 프로필만 볼 수 있음
 CREATE POLICY read_own_user_profile ON users FOR SELECT TO authenticated USING (
-    auth.uid() = id OR auth.uid() IN (SELECT id FROM users WHERE role = 'admin')
+    id = (SELECT auth.uid()) OR (SELECT public.is_admin())
 );
 
 -- 사용자는 자신의 프로필만 수정할 수 있음
 CREATE POLICY update_own_user_profile ON users FOR UPDATE TO authenticated USING (
-    auth.uid() = id
+    id = (SELECT auth.uid())
 );
 
 -- 오류 이력 및 부품 교체 이력 읽기 정책
@@ -243,4 +259,18 @@ ON CONFLICT (part_code) DO NOTHING;
 
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_equipment_serials_equipment_number ON equipment_serials(equipment_number);
-CREATE INDEX IF NOT EXISTS idx_equipment_serials_serial_number ON equipment_serials(serial_number); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_equipment_serials_serial_number ON equipment_serials(serial_number);
+
+-- 이력 테이블 인덱스 (설비별 조회 + 기간 조회/키셋 페이지 조회)
+-- 월별 파티션 전환은 migrations/partition_history_tables.sql 을 적용합니다.
+CREATE INDEX IF NOT EXISTS idx_error_history_equipment_time ON error_history(equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_error_history_time ON error_history(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_error_history_time_brin ON error_history USING brin (timestamp);
+CREATE INDEX IF NOT EXISTS idx_error_history_error_code ON error_history(error_code);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_equipment_time ON parts_replacement(equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_time ON parts_replacement(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_time_brin ON parts_replacement USING brin (timestamp);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_part_code ON parts_replacement(part_code);
+CREATE INDEX IF NOT EXISTS idx_equipment_stops_equipment_time ON equipment_stops(equipment_number, start_time);
+CREATE INDEX IF NOT EXISTS idx_equipment_stops_time ON equipment_stops(start_time, id);
+CREATE INDEX IF NOT EXISTS idx_equipment_stops_time_brin ON equipment_stops USING brin (start_time, end_time); 
\ No newline at end of file
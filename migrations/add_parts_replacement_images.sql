@@ -0,0 +1,7 @@
+-- 부품 교체 이력에 수리 시간과 사진 컬럼 추가
+-- image_paths 에는 이미지 저장소(utils/image_store.py)의 SHA-256 해시 목록을 JSON 배열 문자열로 저장합니다.
+ALTER TABLE public.parts_replacement ADD COLUMN IF NOT EXISTS repair_time INTEGER;
+ALTER TABLE public.parts_replacement ADD COLUMN IF NOT EXISTS image_paths TEXT;
+
+COMMENT ON COLUMN public.error_history.image_paths IS '이미지 저장소 해시 목록 (JSON 배열)';
+COMMENT ON COLUMN public.parts_replacement.image_paths IS '이미지 저장소 해시 목록 (JSON 배열)';
@@ -0,0 +1,377 @@
+-- 일별 집계(rollup) 테이블 생성
+-- 보고서/차트가 긴 기간을 조회할 때 원본 이력 대신 읽는 일 단위 합계입니다.
+--   error_daily_rollup    : 설비 × 일 × 오류 코드별 고장 건수/수리 시간
+--   parts_daily_rollup    : 부품 × 일별 교체 건수
+--   downtime_daily_rollup : 설비 × 일별 정지 건수/정지 시간(분, 날짜 경계에서 나눔)
+--
+-- 갱신 방식
+--   INSERT       : 문장 단위 트리거가 새로 들어온 행만 집계해 더합니다 (일괄 저장도 한 번에 반영).
+--   UPDATE/DELETE: 변경된 행이 속한 날짜만 원본에서 다시 집계합니다.
+--   정기 보정    : refresh_daily_rollups(시작일, 종료일) 로 지정 기간을 다시 계산합니다.
+--
+-- 앱은 시간대 정보 없이 현지 시각을 저장하므로(UTC 로 해석됨) 날짜는 UTC 기준으로 자릅니다.
+
+-- 적용 후 기존 이력으로 최초 집계:
+--   SELECT public.refresh_daily_rollups();
+
+CREATE OR REPLACE FUNCTION public.rollup_day(ts TIMESTAMP WITH TIME ZONE)
+RETURNS DATE
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT (ts AT TIME ZONE 'UTC')::date;
+$$;
+
+-- 집계 테이블 (기본 키가 날짜로 시작하므로 기간 조회는 기본 키 인덱스를 사용)
+CREATE TABLE IF NOT EXISTS public.error_daily_rollup (
+    day DATE NOT NULL,
+    equipment_number VARCHAR(50) NOT NULL DEFAULT '',
+    error_code VARCHAR(20) NOT NULL DEFAULT '',
+    occurrences INTEGER NOT NULL DEFAULT 0,
+    total_repair_time BIGINT NOT NULL DEFAULT 0,
+    max_repair_time INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, equipment_number, error_code)
+);
+
+CREATE TABLE IF NOT EXISTS public.parts_daily_rollup (
+    day DATE NOT NULL,
+    part_code VARCHAR(20) NOT NULL DEFAULT '',
+    replacements INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, part_code)
+);
+
+CREATE TABLE IF NOT EXISTS public.downtime_daily_rollup (
+    day DATE NOT NULL,
+    equipment_number VARCHAR(50) NOT NULL DEFAULT '',
+    stops INTEGER NOT NULL DEFAULT 0,
+    stop_minutes NUMERIC(12, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, equipment_number)
+);
+
+COMMENT ON TABLE public.error_daily_rollup IS '설비 × 일 × 오류 코드별 고장 집계 (트리거로 갱신)';
+COMMENT ON TABLE public.parts_daily_rollup IS '부품 × 일별 교체 집계 (트리거로 갱신)';
+COMMENT ON TABLE public.downtime_daily_rollup IS '설비 × 일별 정지 시간 집계 (트리거로 갱신)';
+
+-- 집계 테이블은 읽기만 허용하고, 갱신은 SECURITY DEFINER 함수에서만 수행합니다.
+ALTER TABLE public.error_daily_rollup ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.parts_daily_rollup ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.downtime_daily_rollup ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS read_all_error_daily_rollup ON public.error_daily_rollup;
+CREATE POLICY read_all_error_daily_rollup ON public.error_daily_rollup FOR SELECT TO authenticated USING (true);
+DROP POLICY IF EXISTS read_all_parts_daily_rollup ON public.parts_daily_rollup;
+CREATE POLICY read_all_parts_daily_rollup ON public.parts_daily_rollup FOR SELECT TO authenticated USING (true);
+DROP POLICY IF EXISTS read_all_downtime_daily_rollup ON public.downtime_daily_rollup;
+CREATE POLICY read_all_downtime_daily_rollup ON public.downtime_daily_rollup FOR SELECT TO authenticated USING (true);
+
+-- ---------------------------------------------------------------------------
+-- 기간 재계산 함수 (NULL 이면 전체 기간)
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.refresh_error_daily_rollup(start_day DATE DEFAULT NULL, end_day DATE DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    DELETE FROM public.error_daily_rollup r
+    WHERE (start_day IS NULL OR r.day >= start_day)
+      AND (end_day IS NULL OR r.day <= end_day);
+
+    INSERT INTO public.error_daily_rollup (day, equipment_number, error_code, occurrences, total_repair_time, max_repair_time)
+    SELECT
+        public.rollup_day(eh.timestamp),
+        COALESCE(eh.equipment_number, ''),
+        COALESCE(eh.error_code, ''),
+        COUNT(*),
+        COALESCE(SUM(eh.repair_time), 0),
+        COALESCE(MAX(eh.repair_time), 0)
+    FROM public.error_history eh
+    WHERE eh.timestamp IS NOT NULL
+      AND (start_day IS NULL OR eh.timestamp >= start_day::timestamp AT TIME ZONE 'UTC')
+      AND (end_day IS NULL OR eh.timestamp < (end_day + 1)::timestamp AT TIME ZONE 'UTC')
+    GROUP BY 1, 2, 3;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.refresh_parts_daily_rollup(start_day DATE DEFAULT NULL, end_day DATE DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    DELETE FROM public.parts_daily_rollup r
+    WHERE (start_day IS NULL OR r.day >= start_day)
+      AND (end_day IS NULL OR r.day <= end_day);
+
+    INSERT INTO public.parts_daily_rollup (day, part_code, replacements)
+    SELECT
+        public.rollup_day(pr.timestamp),
+        COALESCE(pr.part_code, ''),
+        COUNT(*)
+    FROM public.parts_replacement pr
+    WHERE pr.timestamp IS NOT NULL
+      AND (start_day IS NULL OR pr.timestamp >= start_day::timestamp AT TIME ZONE 'UTC')
+      AND (end_day IS NULL OR pr.timestamp < (end_day + 1)::timestamp AT TIME ZONE 'UTC')
+    GROUP BY 1, 2;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.refresh_downtime_daily_rollup(start_day DATE DEFAULT NULL, end_day DATE DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    DELETE FROM public.downtime_daily_rollup r
+    WHERE (start_day IS NULL OR r.day >= start_day)
+      AND (end_day IS NULL OR r.day <= end_day);
+
+    -- 여러 날에 걸친 정지는 날짜별로 나눠 각 날짜에 겹치는 시간만 더합니다.
+    INSERT INTO public.downtime_daily_rollup (day, equipment_number, stops, stop_minutes)
+    SELECT
+        d::date,
+        COALESCE(s.equipment_number, ''),
+        COUNT(*),
+        SUM(EXTRACT(EPOCH FROM
+            LEAST(s.end_time, (d + INTERVAL '1 day') AT TIME ZONE 'UTC')
+            - GREATEST(s.start_time, d AT TIME ZONE 'UTC')
+        ) / 60)
+    FROM public.equipment_stops s
+    CROSS JOIN LATERAL generate_series(
+        public.rollup_day(s.start_time)::timestamp,
+        public.rollup_day(s.end_time - INTERVAL '1 microsecond')::timestamp,
+        INTERVAL '1 day'
+    ) AS d
+    WHERE s.end_time > s.start_time
+      AND (start_day IS NULL OR s.end_time > start_day::timestamp AT TIME ZONE 'UTC')
+      AND (end_day IS NULL OR s.start_time < (end_day + 1)::timestamp AT TIME ZONE 'UTC')
+      AND (start_day IS NULL OR d >= start_day::timestamp)
+      AND (end_day IS NULL OR d <= end_day::timestamp)
+    GROUP BY 1, 2;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.refresh_daily_rollups(start_day DATE DEFAULT NULL, end_day DATE DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    PERFORM public.refresh_error_daily_rollup(start_day, end_day);
+    PERFORM public.refresh_parts_daily_rollup(start_day, end_day);
+    PERFORM public.refresh_downtime_daily_rollup(start_day, end_day);
+END;
+$$;
+
+-- ---------------------------------------------------------------------------
+-- INSERT: 새 행만 집계해 더하기 (문장 단위 트리거 + 전이 테이블)
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.error_rollup_after_insert()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    INSERT INTO public.error_daily_rollup AS r (day, equipment_number, error_code, occurrences, total_repair_time, max_repair_time)
+    SELECT
+        public.rollup_day(n.timestamp),
+        COALESCE(n.equipment_number, ''),
+        COALESCE(n.error_code, ''),
+        COUNT(*),
+        COALESCE(SUM(n.repair_time), 0),
+        COALESCE(MAX(n.repair_time), 0)
+    FROM new_rows n
+    WHERE n.timestamp IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, equipment_number, error_code) DO UPDATE SET
+        occurrences = r.occurrences + EXCLUDED.occurrences,
+        total_repair_time = r.total_repair_time + EXCLUDED.total_repair_time,
+        max_repair_time = GREATEST(r.max_repair_time, EXCLUDED.max_repair_time);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.parts_rollup_after_insert()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    INSERT INTO public.parts_daily_rollup AS r (day, part_code, replacements)
+    SELECT public.rollup_day(n.timestamp), COALESCE(n.part_code, ''), COUNT(*)
+    FROM new_rows n
+    WHERE n.timestamp IS NOT NULL
+    GROUP BY 1, 2
+    ON CONFLICT (day, part_code) DO UPDATE SET
+        replacements = r.replacements + EXCLUDED.replacements;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.downtime_rollup_after_insert()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+BEGIN
+    INSERT INTO public.downtime_daily_rollup AS r (day, equipment_number, stops, stop_minutes)
+    SELECT
+        d::date,
+        COALESCE(n.equipment_number, ''),
+        COUNT(*),
+        SUM(EXTRACT(EPOCH FROM
+            LEAST(n.end_time, (d + INTERVAL '1 day') AT TIME ZONE 'UTC')
+            - GREATEST(n.start_time, d AT TIME ZONE 'UTC')
+        ) / 60)
+    FROM new_rows n
+    CROSS JOIN LATERAL generate_series(
+        public.rollup_day(n.start_time)::timestamp,
+        public.rollup_day(n.end_time - INTERVAL '1 microsecond')::timestamp,
+        INTERVAL '1 day'
+    ) AS d
+    WHERE n.end_time > n.start_time
+    GROUP BY 1, 2
+    ON CONFLICT (day, equipment_number) DO UPDATE SET
+        stops = r.stops + EXCLUDED.stops,
+        stop_minutes = r.stop_minutes + EXCLUDED.stop_minutes;
+    RETURN NULL;
+END;
+$$;
+
+-- ---------------------------------------------------------------------------
+-- UPDATE/DELETE: 변경 전후 행이 속한 날짜만 다시 집계
+-- (전이 테이블은 이벤트별 트리거에만 지정할 수 있으므로 UPDATE 와 DELETE 트리거를 나눕니다.)
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.error_rollup_after_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    affected DATE;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        FOR affected IN
+            SELECT public.rollup_day(o.timestamp) FROM old_rows o WHERE o.timestamp IS NOT NULL
+            UNION
+            SELECT public.rollup_day(n.timestamp) FROM new_rows n WHERE n.timestamp IS NOT NULL
+        LOOP
+            PERFORM public.refresh_error_daily_rollup(affected, affected);
+        END LOOP;
+    ELSE
+        FOR affected IN
+            SELECT DISTINCT public.rollup_day(o.timestamp) FROM old_rows o WHERE o.timestamp IS NOT NULL
+        LOOP
+            PERFORM public.refresh_error_daily_rollup(affected, affected);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.parts_rollup_after_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    affected DATE;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        FOR affected IN
+            SELECT public.rollup_day(o.timestamp) FROM old_rows o WHERE o.timestamp IS NOT NULL
+            UNION
+            SELECT public.rollup_day(n.timestamp) FROM new_rows n WHERE n.timestamp IS NOT NULL
+        LOOP
+            PERFORM public.refresh_parts_daily_rollup(affected, affected);
+        END LOOP;
+    ELSE
+        FOR affected IN
+            SELECT DISTINCT public.rollup_day(o.timestamp) FROM old_rows o WHERE o.timestamp IS NOT NULL
+        LOOP
+            PERFORM public.refresh_parts_daily_rollup(affected, affected);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.downtime_rollup_after_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    first_day DATE;
+    last_day DATE;
+BEGIN
+    -- 정지 구간은 여러 날에 걸칠 수 있으므로 변경 행 전체를 덮는 기간을 다시 집계합니다.
+    IF TG_OP = 'UPDATE' THEN
+        SELECT MIN(public.rollup_day(x.start_time)), MAX(public.rollup_day(x.end_time))
+        INTO first_day, last_day
+        FROM (
+            SELECT o.start_time, o.end_time FROM old_rows o
+            UNION ALL
+            SELECT n.start_time, n.end_time FROM new_rows n
+        ) x;
+    ELSE
+        SELECT MIN(public.rollup_day(o.start_time)), MAX(public.rollup_day(o.end_time))
+        INTO first_day, last_day
+        FROM old_rows o;
+    END IF;
+    IF first_day IS NOT NULL THEN
+        PERFORM public.refresh_downtime_daily_rollup(first_day, last_day);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- ---------------------------------------------------------------------------
+-- 트리거
+-- ---------------------------------------------------------------------------
+
+DROP TRIGGER IF EXISTS error_history_rollup_insert ON public.error_history;
+CREATE TRIGGER error_history_rollup_insert
+AFTER INSERT ON public.error_history
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_insert();
+
+DROP TRIGGER IF EXISTS error_history_rollup_update ON public.error_history;
+CREATE TRIGGER error_history_rollup_update
+AFTER UPDATE ON public.error_history
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_change();
+
+DROP TRIGGER IF EXISTS error_history_rollup_delete ON public.error_history;
+CREATE TRIGGER error_history_rollup_delete
+AFTER DELETE ON public.error_history
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_change();
+
+DROP TRIGGER IF EXISTS parts_replacement_rollup_insert ON public.parts_replacement;
+CREATE TRIGGER parts_replacement_rollup_insert
+AFTER INSERT ON public.parts_replacement
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.parts_rollup_after_insert();
+
+DROP TRIGGER IF EXISTS parts_replacement_rollup_update ON public.parts_replacement;
+CREATE TRIGGER parts_replacement_rollup_update
+AFTER UPDATE ON public.parts_replacement
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.parts_rollup_after_change();
+
+DROP TRIGGER IF EXISTS parts_replacement_rollup_delete ON public.parts_replacement;
+CREATE TRIGGER parts_replacement_rollup_delete
+AFTER DELETE ON public.parts_replacement
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.parts_rollup_after_change();
+
+DROP TRIGGER IF EXISTS equipment_stops_rollup_insert ON public.equipment_stops;
+CREATE TRIGGER equipment_stops_rollup_insert
+AFTER INSERT ON public.equipment_stops
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_insert();
+
+DROP TRIGGER IF EXISTS equipment_stops_rollup_update ON public.equipment_stops;
+CREATE TRIGGER equipment_stops_rollup_update
+AFTER UPDATE ON public.equipment_stops
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_change();
+
+DROP TRIGGER IF EXISTS equipment_stops_rollup_delete ON public.equipment_stops;
+CREATE TRIGGER equipment_stops_rollup_delete
+AFTER DELETE ON public.equipment_stops
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_change();
+
+-- 권한: 집계 테이블 읽기만 허용, 재계산 함수는 서비스 역할에서 실행
+GRANT SELECT ON public.error_daily_rollup, public.parts_daily_rollup, public.downtime_daily_rollup TO authenticated;
+REVOKE EXECUTE ON FUNCTION public.refresh_error_daily_rollup(DATE, DATE) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.refresh_parts_daily_rollup(DATE, DATE) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.refresh_downtime_daily_rollup(DATE, DATE) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.refresh_daily_rollups(DATE, DATE) FROM PUBLIC;
+
+-- 정기 보정 (pg_cron 확장을 사용하는 경우): 매일 00:30 에 최근 3일 재계산
+-- SELECT cron.schedule('refresh-daily-rollups', '30 0 * * *',
+--     $$SELECT public.refresh_daily_rollups(CURRENT_DATE - 2, CURRENT_DATE)$$);
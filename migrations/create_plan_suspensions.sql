@@ -22,6 +22,8 @@ CREATE TABLE IF NOT EXISTS public.plan_suspensions (
 CREATE INDEX IF NOT EXISTS idx_plan_suspensions_equipment_number ON public.plan_suspensions(equipment_number);
 CREATE INDEX IF NOT EXISTS idx_plan_suspensions_status ON public.plan_suspensions(status);
 CREATE INDEX IF NOT EXISTS idx_plan_suspensions_type ON public.plan_suspensions(type);
+-- 설비별 타임라인 페이지 조회 (시작일, id 역순)
+CREATE INDEX IF NOT EXISTS idx_plan_suspensions_equipment_start ON public.plan_suspensions(equipment_number, start_date DESC, id DESC);
 
 -- 설명 추가
 COMMENT ON TABLE public.plan_suspensions IS '설비 정지 계획 정보 테이블';
@@ -0,0 +1,118 @@
+-- 보고서 통계 집계 함수 생성
+-- get_error_stats / get_parts_stats / get_model_change_stats 에서 호출하며
+-- 원본 행 대신 그룹별 집계 결과만 반환합니다.
+
+-- 모델 변경 이력 테이블 (앱에서 사용 중이나 스키마에 누락되어 있던 테이블)
+CREATE TABLE IF NOT EXISTS public.model_changes (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    equipment_number VARCHAR(50),
+    serial_number VARCHAR(50),
+    model_from VARCHAR(100),
+    model_to VARCHAR(100),
+    duration_minutes INTEGER DEFAULT 0,
+    details TEXT,
+    worker VARCHAR(100),
+    supervisor VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 설비별 시간순 조회 / 기간 페이지 조회
+CREATE INDEX IF NOT EXISTS idx_model_changes_equipment_time ON public.model_changes(equipment_number, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_model_changes_time ON public.model_changes(timestamp, id);
+
+ALTER TABLE public.model_changes ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS read_all_model_changes ON public.model_changes;
+CREATE POLICY read_all_model_changes ON public.model_changes FOR SELECT TO authenticated USING (true);
+DROP POLICY IF EXISTS insert_model_changes ON public.model_changes;
+CREATE POLICY insert_model_changes ON public.model_changes FOR INSERT TO authenticated WITH CHECK (true);
+
+-- 오류 코드별 통계
+CREATE OR REPLACE FUNCTION public.report_error_stats(
+    start_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    end_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS TABLE (
+    error_code VARCHAR,
+    occurrences BIGINT,
+    total_repair_time BIGINT,
+    avg_repair_time NUMERIC,
+    max_repair_time INTEGER
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        eh.error_code,
+        COUNT(*) AS occurrences,
+        SUM(eh.repair_time) AS total_repair_time,
+        ROUND(AVG(eh.repair_time), 2) AS avg_repair_time,
+        MAX(eh.repair_time) AS max_repair_time
+    FROM public.error_history eh
+    WHERE (start_ts IS NULL OR eh.timestamp >= start_ts)
+      AND (end_ts IS NULL OR eh.timestamp <= end_ts)
+    GROUP BY eh.error_code
+    ORDER BY occurrences DESC;
+$$;
+
+-- 부품 코드별 교체 통계
+CREATE OR REPLACE FUNCTION public.report_parts_stats(
+    start_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    end_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS TABLE (
+    part_code VARCHAR,
+    replacements BIGINT
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        pr.part_code,
+        COUNT(*) AS replacements
+    FROM public.parts_replacement pr
+    WHERE (start_ts IS NULL OR pr.timestamp >= start_ts)
+      AND (end_ts IS NULL OR pr.timestamp <= end_ts)
+    GROUP BY pr.part_code
+    ORDER BY replacements DESC;
+$$;
+
+-- 모델 변경 통계 (총 변경 횟수, 평균 소요 시간, 모델별 변경 횟수)
+CREATE OR REPLACE FUNCTION public.report_model_change_stats(
+    p_equipment_number VARCHAR DEFAULT NULL,
+    start_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    end_ts TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS JSON
+LANGUAGE sql STABLE AS $$
+    WITH filtered AS (
+        SELECT
+            COALESCE(mc.model_from, 'Unknown') AS model_from,
+            COALESCE(mc.model_to, 'Unknown') AS model_to,
+            COALESCE(mc.duration_minutes, 0) AS duration_minutes
+        FROM public.model_changes mc
+        WHERE (p_equipment_number IS NULL OR mc.equipment_number = p_equipment_number)
+          AND (start_ts IS NULL OR mc.timestamp >= start_ts)
+          AND (end_ts IS NULL OR mc.timestamp <= end_ts)
+    ),
+    model_counts AS (
+        -- 이전 모델도 0건으로 목록에 포함하고, 변경 횟수는 신규 모델 기준으로 집계
+        SELECT name, SUM(cnt) AS count
+        FROM (
+            SELECT model_to AS name, 1 AS cnt FROM filtered
+            UNION ALL
+            SELECT model_from AS name, 0 AS cnt FROM filtered
+        ) m
+        GROUP BY name
+    )
+    SELECT json_build_object(
+        'total_changes', (SELECT COUNT(*) FROM filtered),
+        'avg_duration', COALESCE((SELECT AVG(duration_minutes) FROM filtered), 0),
+        'models', COALESCE(
+            (SELECT json_agg(json_build_object('name', name, 'count', count) ORDER BY count DESC) FROM model_counts),
+            '[]'::json
+        )
+    );
+$$;
+
+-- 인증된 사용자에게 실행 권한 부여 (RLS는 호출자 권한으로 적용됨)
+GRANT EXECUTE ON FUNCTION public.report_error_stats(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.report_parts_stats(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.report_model_change_stats(VARCHAR, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) TO authenticated;
@@ -0,0 +1,63 @@
+-- RLS 관리자 정책 재작성
+-- 기존 정책의 auth.uid() IN (SELECT id FROM users WHERE role = 'admin') 조건은
+-- 행마다 auth.uid() 호출과 users 서브쿼리 비교를 수행하므로 이력 테이블처럼 행이 많은 테이블에서 느립니다.
+-- 또한 users 테이블의 정책이 users 를 다시 조회해 "infinite recursion detected in policy" 오류가 발생합니다.
+--
+-- 변경 내용
+--   public.is_admin(): 현재 사용자가 관리자인지 확인하는 STABLE SECURITY DEFINER 함수 (RLS 를 거치지 않고 users 조회)
+--   정책은 (SELECT public.is_admin()) 형태로 사용해 문장당 한 번만 계산되는 InitPlan 이 되게 합니다.
+--   (함수를 SELECT 로 감싸지 않으면 STABLE 함수라도 행마다 호출됩니다.)
+--
+-- 측정: benchmarks/rls_policy_benchmark.sql (로컬 PostgreSQL, 100만 행)
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.is_admin()
+RETURNS BOOLEAN
+LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = public AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM public.users WHERE id = auth.uid() AND role = 'admin'
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.is_admin() FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.is_admin() TO authenticated;
+
+-- 관리자는 모든 테이블에 대한 모든 권한 부여
+DROP POLICY IF EXISTS admin_all_users ON public.users;
+CREATE POLICY admin_all_users ON public.users FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_equipment ON public.equipment;
+CREATE POLICY admin_all_equipment ON public.equipment FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_error_codes ON public.error_codes;
+CREATE POLICY admin_all_error_codes ON public.error_codes FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_parts ON public.parts;
+CREATE POLICY admin_all_parts ON public.parts FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_error_history ON public.error_history;
+CREATE POLICY admin_all_error_history ON public.error_history FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_parts_replacement ON public.parts_replacement;
+CREATE POLICY admin_all_parts_replacement ON public.parts_replacement FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS admin_all_equipment_stops ON public.equipment_stops;
+CREATE POLICY admin_all_equipment_stops ON public.equipment_stops FOR ALL TO authenticated USING ((SELECT public.is_admin()));
+
+DROP POLICY IF EXISTS "Admins can delete equipment_serials" ON public.equipment_serials;
+CREATE POLICY "Admins can delete equipment_serials" ON public.equipment_serials FOR DELETE TO authenticated USING ((SELECT public.is_admin()));
+
+-- 사용자는 자신의 프로필만 볼 수 있음 (관리자는 전체)
+DROP POLICY IF EXISTS read_own_user_profile ON public.users;
+CREATE POLICY read_own_user_profile ON public.users FOR SELECT TO authenticated USING (
+    id = (SELECT auth.uid()) OR (SELECT public.is_admin())
+);
+
+DROP POLICY IF EXISTS update_own_user_profile ON public.users;
+CREATE POLICY update_own_user_profile ON public.users FOR UPDATE TO authenticated USING (
+    id = (SELECT auth.uid())
+);
+
+COMMIT;
@@ -0,0 +1,249 @@
+-- 이력 테이블 인덱스 및 월별 파티션
+-- - error_history(timestamp), equipment_stops(start_time) 를 월별 범위 파티션 테이블로 전환
+-- - 설비 번호 + 시간 복합 B-tree 인덱스, 키셋 페이지 조회용 (시간, id) 인덱스, 시간 컬럼 BRIN 인덱스 추가
+-- - 파티션은 ensure_history_partitions() 가 미리 만들고, 범위 밖의 행은 기본(default) 파티션에 저장
+--
+-- 파티션 테이블의 기본 키는 파티션 컬럼을 포함해야 하므로 (id, timestamp) / (id, start_time) 로 바뀝니다.
+-- 앱의 일괄 저장(bulk_upsert_data)은 이 컬럼 조합으로 중복을 판단합니다.
+--
+-- 기존 테이블은 *_legacy 로 이름을 바꿔 보관합니다. 데이터 확인 후 삭제하세요:
+--   DROP TABLE public.error_history_legacy;
+--   DROP TABLE public.equipment_stops_legacy;
+--
+-- 일별 집계 트리거(create_daily_rollups.sql)가 적용되어 있으면 새 테이블에 다시 연결합니다.
+-- 관리자 정책은 public.is_admin() 을 사용하므로 optimize_rls_policies.sql 을 먼저 적용하세요.
+
+BEGIN;
+
+-- ---------------------------------------------------------------------------
+-- 파티션 생성 함수
+-- ---------------------------------------------------------------------------
+
+-- parent 테이블에 month 가 속한 월의 파티션을 만들고 이름을 반환합니다 (이미 있으면 그대로 반환).
+-- 기본 파티션에 해당 월의 행이 있으면 새 파티션으로 옮긴 뒤 연결합니다.
+CREATE OR REPLACE FUNCTION public.create_monthly_partition(parent TEXT, partition_column TEXT, month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    month_start TIMESTAMP WITH TIME ZONE := date_trunc('month', month)::timestamp AT TIME ZONE 'UTC';
+    month_end TIMESTAMP WITH TIME ZONE := (date_trunc('month', month) + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC';
+    partition_name TEXT := format('%s_y%sm%s', parent, to_char(month, 'YYYY'), to_char(month, 'MM'));
+    default_name TEXT := parent || '_default';
+BEGIN
+    IF to_regclass('public.' || partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                   partition_name, parent);
+    IF to_regclass('public.' || default_name) IS NOT NULL THEN
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM public.%I WHERE %I >= %L AND %I < %L RETURNING *) '
+            'INSERT INTO public.%I SELECT * FROM moved',
+            default_name, partition_column, month_start, partition_column, month_end, partition_name
+        );
+    END IF;
+    EXECUTE format('ALTER TABLE public.%I ATTACH PARTITION public.%I FOR VALUES FROM (%L) TO (%L)',
+                   parent, partition_name, month_start, month_end);
+    -- 파티션을 직접 조회하는 것은 막고 부모 테이블의 정책으로만 접근하게 합니다.
+    EXECUTE format('ALTER TABLE public.%I ENABLE ROW LEVEL SECURITY', partition_name);
+    RETURN partition_name;
+END;
+$$;
+
+-- 이번 달부터 months_ahead 개월 뒤까지의 파티션을 만듭니다 (매월 실행).
+CREATE OR REPLACE FUNCTION public.ensure_history_partitions(months_ahead INTEGER DEFAULT 3)
+RETURNS VOID
+LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') + make_interval(months => months_ahead),
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        PERFORM public.create_monthly_partition('error_history', 'timestamp', month);
+        PERFORM public.create_monthly_partition('equipment_stops', 'start_time', month);
+    END LOOP;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.create_monthly_partition(TEXT, TEXT, DATE) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.ensure_history_partitions(INTEGER) FROM PUBLIC;
+
+-- ---------------------------------------------------------------------------
+-- error_history → 월별 파티션 (timestamp)
+-- ---------------------------------------------------------------------------
+
+ALTER TABLE public.error_history RENAME TO error_history_legacy;
+ALTER TABLE public.error_history_legacy RENAME CONSTRAINT error_history_pkey TO error_history_legacy_pkey;
+REVOKE ALL ON public.error_history_legacy FROM anon, authenticated;
+-- init_database.sql 로 만든 인덱스는 이름이 겹치므로 보관 테이블에서 제거합니다.
+DROP INDEX IF EXISTS public.idx_error_history_equipment_time;
+DROP INDEX IF EXISTS public.idx_error_history_time;
+DROP INDEX IF EXISTS public.idx_error_history_time_brin;
+DROP INDEX IF EXISTS public.idx_error_history_error_code;
+
+CREATE TABLE public.error_history (
+    LIKE public.error_history_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS
+) PARTITION BY RANGE (timestamp);
+
+ALTER TABLE public.error_history
+    ALTER COLUMN timestamp SET NOT NULL,
+    ADD PRIMARY KEY (id, timestamp),
+    ADD FOREIGN KEY (equipment_id) REFERENCES public.equipment(id),
+    ADD FOREIGN KEY (error_code_id) REFERENCES public.error_codes(id),
+    ADD FOREIGN KEY (worker_id) REFERENCES public.users(id),
+    ADD FOREIGN KEY (supervisor_id) REFERENCES public.users(id);
+
+CREATE TABLE public.error_history_default PARTITION OF public.error_history DEFAULT;
+ALTER TABLE public.error_history_default ENABLE ROW LEVEL SECURITY;
+
+-- 기존 데이터 기간부터 향후 3개월까지 파티션 생성
+SELECT public.create_monthly_partition('error_history', 'timestamp', m::date)
+FROM generate_series(
+    date_trunc('month', COALESCE((SELECT MIN(timestamp) FROM public.error_history_legacy), NOW()) AT TIME ZONE 'UTC'),
+    date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS m;
+
+INSERT INTO public.error_history (
+    id, equipment_id, error_code_id, timestamp, equipment_number, serial_number, repair_time, repair_method,
+    worker_id, supervisor_id, worker, supervisor, error_code, error_detail, image_paths, created_at
+)
+SELECT
+    id, equipment_id, error_code_id, COALESCE(timestamp, created_at, NOW()), equipment_number, serial_number,
+    repair_time, repair_method, worker_id, supervisor_id, worker, supervisor, error_code, error_detail,
+    image_paths, created_at
+FROM public.error_history_legacy;
+
+CREATE INDEX idx_error_history_equipment_time ON public.error_history (equipment_number, timestamp);
+CREATE INDEX idx_error_history_time ON public.error_history (timestamp, id);
+CREATE INDEX idx_error_history_time_brin ON public.error_history USING brin (timestamp) WITH (pages_per_range = 32);
+CREATE INDEX idx_error_history_error_code ON public.error_history (error_code);
+
+ALTER TABLE public.error_history ENABLE ROW LEVEL SECURITY;
+CREATE POLICY admin_all_error_history ON public.error_history FOR ALL TO authenticated USING (
+    (SELECT public.is_admin())
+);
+CREATE POLICY read_all_error_history ON public.error_history FOR SELECT TO authenticated USING (true);
+CREATE POLICY insert_error_history ON public.error_history FOR INSERT TO authenticated WITH CHECK (true);
+GRANT SELECT, INSERT, UPDATE, DELETE ON public.error_history TO authenticated;
+
+-- ---------------------------------------------------------------------------
+-- equipment_stops → 월별 파티션 (start_time)
+-- ---------------------------------------------------------------------------
+
+ALTER TABLE public.equipment_stops RENAME TO equipment_stops_legacy;
+ALTER TABLE public.equipment_stops_legacy RENAME CONSTRAINT equipment_stops_pkey TO equipment_stops_legacy_pkey;
+REVOKE ALL ON public.equipment_stops_legacy FROM anon, authenticated;
+DROP INDEX IF EXISTS public.idx_equipment_stops_equipment_time;
+DROP INDEX IF EXISTS public.idx_equipment_stops_time;
+DROP INDEX IF EXISTS public.idx_equipment_stops_time_brin;
+
+CREATE TABLE public.equipment_stops (
+    LIKE public.equipment_stops_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS
+) PARTITION BY RANGE (start_time);
+
+ALTER TABLE public.equipment_stops
+    ADD PRIMARY KEY (id, start_time),
+    ADD FOREIGN KEY (equipment_id) REFERENCES public.equipment(id);
+
+CREATE TABLE public.equipment_stops_default PARTITION OF public.equipment_stops DEFAULT;
+ALTER TABLE public.equipment_stops_default ENABLE ROW LEVEL SECURITY;
+
+SELECT public.create_monthly_partition('equipment_stops', 'start_time', m::date)
+FROM generate_series(
+    date_trunc('month', COALESCE((SELECT MIN(start_time) FROM public.equipment_stops_legacy), NOW()) AT TIME ZONE 'UTC'),
+    date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS m;
+
+INSERT INTO public.equipment_stops (
+    id, equipment_id, timestamp, equipment_number, serial_number, stop_reason, start_time, end_time,
+    duration_minutes, details, worker, supervisor, created_at
+)
+SELECT
+    id, equipment_id, timestamp, equipment_number, serial_number, stop_reason, start_time, end_time,
+    duration_minutes, details, worker, supervisor, created_at
+FROM public.equipment_stops_legacy;
+
+CREATE INDEX idx_equipment_stops_equipment_time ON public.equipment_stops (equipment_number, start_time);
+CREATE INDEX idx_equipment_stops_time ON public.equipment_stops (start_time, id);
+CREATE INDEX idx_equipment_stops_time_brin ON public.equipment_stops USING brin (start_time, end_time) WITH (pages_per_range = 32);
+
+ALTER TABLE public.equipment_stops ENABLE ROW LEVEL SECURITY;
+CREATE POLICY admin_all_equipment_stops ON public.equipment_stops FOR ALL TO authenticated USING (
+    (SELECT public.is_admin())
+);
+CREATE POLICY read_all_equipment_stops ON public.equipment_stops FOR SELECT TO authenticated USING (true);
+CREATE POLICY insert_equipment_stops ON public.equipment_stops FOR INSERT TO authenticated WITH CHECK (true);
+GRANT SELECT, INSERT, UPDATE, DELETE ON public.equipment_stops TO authenticated;
+
+-- ---------------------------------------------------------------------------
+-- parts_replacement 인덱스 (파티션 없이 인덱스만 추가)
+-- ---------------------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_equipment_time ON public.parts_replacement (equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_time ON public.parts_replacement (timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_time_brin ON public.parts_replacement USING brin (timestamp) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_part_code ON public.parts_replacement (part_code);
+
+-- ---------------------------------------------------------------------------
+-- 일별 집계 트리거 다시 연결 (create_daily_rollups.sql 적용 환경)
+-- ---------------------------------------------------------------------------
+
+DO $$
+BEGIN
+    IF to_regprocedure('public.error_rollup_after_insert()') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS error_history_rollup_insert ON public.error_history_legacy;
+        DROP TRIGGER IF EXISTS error_history_rollup_update ON public.error_history_legacy;
+        DROP TRIGGER IF EXISTS error_history_rollup_delete ON public.error_history_legacy;
+        DROP TRIGGER IF EXISTS equipment_stops_rollup_insert ON public.equipment_stops_legacy;
+        DROP TRIGGER IF EXISTS equipment_stops_rollup_update ON public.equipment_stops_legacy;
+        DROP TRIGGER IF EXISTS equipment_stops_rollup_delete ON public.equipment_stops_legacy;
+
+        CREATE TRIGGER error_history_rollup_insert
+        AFTER INSERT ON public.error_history
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_insert();
+
+        CREATE TRIGGER error_history_rollup_update
+        AFTER UPDATE ON public.error_history
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_change();
+
+        CREATE TRIGGER error_history_rollup_delete
+        AFTER DELETE ON public.error_history
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.error_rollup_after_change();
+
+        CREATE TRIGGER equipment_stops_rollup_insert
+        AFTER INSERT ON public.equipment_stops
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_insert();
+
+        CREATE TRIGGER equipment_stops_rollup_update
+        AFTER UPDATE ON public.equipment_stops
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_change();
+
+        CREATE TRIGGER equipment_stops_rollup_delete
+        AFTER DELETE ON public.equipment_stops
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION public.downtime_rollup_after_change();
+    END IF;
+END;
+$$;
+
+COMMIT;
+
+ANALYZE public.error_history;
+ANALYZE public.equipment_stops;
+
+-- 파티션 자동 생성 (pg_cron 확장을 사용하는 경우): 매월 1일 01:00 에 향후 3개월 파티션 생성
+-- SELECT cron.schedule('ensure-history-partitions', '0 1 1 * *',
+--     $$SELECT public.ensure_history_partitions(3)$$);
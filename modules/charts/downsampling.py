@@ -0,0 +1,175 @@
+"""
+시계열 차트 다운샘플링 모듈
+- LTTB (Largest-Triangle-Three-Buckets): 선 모양을 유지하면서 점 수를 줄임
+- 최소/최대 버킷: 구간별 최소/최대값을 남겨 급격한 변화(피크)를 보존
+- 차트 폭(픽셀)과 표시 구간에 맞춰 점 수를 정하므로, 이력이 길어져도 브라우저로 보내는 데이터 크기가 일정
+- 점이 많은 경우 WebGL(scattergl) trace 로 그림
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from components.language import get_text
+
+# 기본 차트 폭(픽셀)과 픽셀당 점 수 (use_container_width 기준 넓은 화면)
+DEFAULT_CHART_WIDTH = 800
+POINTS_PER_PIXEL = 2
+# 이 점 수를 넘으면 WebGL trace 사용
+WEBGL_THRESHOLD = 1000
+
+
+def target_points(width=DEFAULT_CHART_WIDTH, points_per_pixel=POINTS_PER_PIXEL):
+    """차트 폭에 맞는 최대 점 수를 반환합니다."""
+    return max(int(width * points_per_pixel), 3)
+
+
+def _numeric(values):
+    """날짜/시간 값은 ns 정수로, 나머지는 float 배열로 변환합니다."""
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series) or (
+        series.dtype == object and len(series) and hasattr(series.iloc[0], 'year')
+    ):
+        return pd.to_datetime(series).to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    return series.to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB 알고리즘으로 남길 점의 인덱스를 반환합니다 (첫 점과 마지막 점 포함).
+
+    Args:
+        x (numpy.ndarray): 정렬된 x 값 (숫자)
+        y (numpy.ndarray): y 값
+        threshold (int): 남길 점 수
+
+    Returns:
+        numpy.ndarray: 인덱스 배열
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 구간을 threshold - 2 개 버킷으로 나눕니다.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 버킷의 평균점 (마지막 버킷은 마지막 점)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        # 이전 선택점, 다음 버킷 평균점과 만드는 삼각형 넓이가 가장 큰 점을 선택합니다.
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if not np.all(np.isnan(area)) else start
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, buckets):
+    """
+    구간별 최소/최대 점의 인덱스를 반환합니다 (첫 점과 마지막 점 포함).
+    버킷당 최대 2개 점이 남으므로 결과는 최대 2 * buckets + 2 개입니다.
+    """
+    n = len(y)
+    if buckets < 1 or 2 * buckets >= n:
+        return np.arange(n)
+    bucket = np.arange(n) * buckets // n
+    # 버킷 → 값 순으로 정렬하면 각 버킷의 처음/끝이 최소/최대입니다.
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends], [0, n - 1]]))
+
+
+def downsample_series(x, y, max_points=None, x_range=None, method='lttb'):
+    """
+    시계열을 표시 구간으로 자른 뒤 max_points 개 이하로 줄입니다.
+
+    Args:
+        x: x 값 (날짜/시간 또는 숫자, 오름차순)
+        y: y 값
+        max_points (int): 최대 점 수 (기본값: target_points())
+        x_range (tuple): (시작, 끝) 표시 구간. None 이면 전체
+        method (str): 'lttb' 또는 'minmax'
+
+    Returns:
+        tuple: (x 배열, y 배열)
+    """
+    max_points = max_points or target_points()
+    x = pd.Series(x).reset_index(drop=True)
+    y = pd.Series(y).reset_index(drop=True)
+
+    if x_range is not None:
+        start, end = x_range
+        if pd.api.types.is_datetime64_any_dtype(x) or (len(x) and hasattr(x.iloc[0], 'year')):
+            keys = pd.to_datetime(x)
+            start, end = pd.Timestamp(start), pd.Timestamp(end)
+        else:
+            keys = x
+        mask = ((keys >= start) & (keys <= end)).to_numpy()
+        x, y = x[mask].reset_index(drop=True), y[mask].reset_index(drop=True)
+
+    if len(x) <= max_points:
+        return x.to_numpy(), y.to_numpy()
+
+    y_values = y.to_numpy(dtype=float)
+    if method == 'minmax':
+        indices = minmax_indices(y_values, max(max_points // 2 - 1, 1))
+    else:
+        indices = lttb_indices(_numeric(x), y_values, max_points)
+    return x.to_numpy()[indices], y.to_numpy()[indices]
+
+
+def time_series_trace(x, y, name=None, mode='lines'):
+    """점 수에 따라 Scatter 또는 WebGL(Scattergl) trace 를 만듭니다."""
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, mode=mode, name=name)
+
+
+def build_time_series_figure(x, y, title=None, x_label=None, y_label=None, max_points=None,
+                             x_range=None, method='lttb', height=300):
+    """
+    다운샘플링한 시계열 라인 차트 Figure 를 만듭니다.
+
+    Args:
+        x, y: 시계열 값
+        title (str): 차트 제목
+        x_label, y_label (str): 축 제목
+        max_points (int): 최대 점 수 (기본값: 차트 폭 기준)
+        x_range (tuple): 표시 구간
+        method (str): 'lttb' 또는 'minmax'
+        height (int): 차트 높이
+
+    Returns:
+        plotly.graph_objects.Figure
+    """
+    x_values, y_values = downsample_series(x, y, max_points, x_range, method)
+    fig = go.Figure(time_series_trace(x_values, y_values))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        height=height,
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+    return fig
+
+
+def select_time_range(start, end, key, lang='ko'):
+    """
+    차트 표시 구간을 선택하는 슬라이더를 표시합니다.
+    Plotly 확대/축소는 서버로 전달되지 않으므로, 구간을 좁히면 해당 구간만 다시 다운샘플링합니다.
+
+    Returns:
+        tuple: (시작, 끝)
+    """
+    if start >= end:
+        return start, end
+    return st.slider(get_text("chart_range", lang), min_value=start, max_value=end,
+                     value=(start, end), key=key)
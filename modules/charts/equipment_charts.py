@@ -4,6 +4,8 @@
 - 고장 유형별 분포 바 차트
 - 시간별 고장 건수 라인 차트
 - 부품별 교체 횟수 바 차트
+
+차트 Figure 는 입력 데이터 지문 기준으로 figure_cache 에 보관되어 같은 데이터로 다시 그릴 때 재사용됩니다.
 """
 
 import streamlit as st
@@ -11,6 +13,10 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 from components.language import get_text
+from modules.charts.figure_cache import cached_figure
+from modules.charts.downsampling import (
+    DEFAULT_CHART_WIDTH, build_time_series_figure, select_time_range, target_points
+)
 import random
 
 def render_equipment_status_pie_chart(equipment_data, lang='ko'):
@@ -28,21 +34,26 @@ def render_equipment_status_pie_chart(equipment_data, lang='ko'):
         st.info(get_text("no_equipment_data", lang))
         return
     
-    df_equipment = pd.DataFrame(equipment_data)
-    
-    # 상태 분포 계산
-    status_counts = df_equipment['status'].value_counts()
-    
-    # 파이 차트 생성
-    fig_status = px.pie(
-        values=status_counts.values,
-        names=status_counts.index,
-        title=get_text("equipment_status_distribution", lang),
-        height=300
-    )
+    def build():
+        df_equipment = pd.DataFrame(equipment_data)
+        
+        # 상태 분포 계산
+        status_counts = df_equipment['status'].value_counts()
+        
+        # 파이 차트 생성
+        fig_status = px.pie(
+            values=status_counts.values,
+            names=status_counts.index,
+            title=get_text("equipment_status_distribution", lang),
+            height=300
+        )
+        
+        # 차트 레이아웃 조정
+        fig_status.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+        return fig_status
     
-    # 차트 레이아웃 조정
-    fig_status.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+    fig_status = cached_figure('equipment_status_pie', equipment_data, build, lang=lang,
+                               columns=['status'], tables=('equipment',))
     
     # 차트 표시
     st.plotly_chart(fig_status, use_container_width=True)
@@ -62,36 +73,44 @@ def render_error_type_bar_chart(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    df_errors = pd.DataFrame(error_data)
-    
-    # 오류 유형별 건수 계산
-    error_types = df_errors['error_code'].value_counts()
-    
-    # 바 차트 생성
-    fig_error_types = px.bar(
-        x=error_types.index,
-        y=error_types.values,
-        title=get_text("error_distribution", lang),
-        labels={
-            'x': get_text("error_code", lang), 
-            'y': get_text("count", lang)
-        },
-        height=300
-    )
+    def build():
+        df_errors = pd.DataFrame(error_data)
+        
+        # 오류 유형별 건수 계산
+        error_types = df_errors['error_code'].value_counts()
+        
+        # 바 차트 생성
+        fig_error_types = px.bar(
+            x=error_types.index,
+            y=error_types.values,
+            title=get_text("error_distribution", lang),
+            labels={
+                'x': get_text("error_code", lang), 
+                'y': get_text("count", lang)
+            },
+            height=300
+        )
+        
+        # 차트 레이아웃 조정
+        fig_error_types.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+        return fig_error_types
     
-    # 차트 레이아웃 조정
-    fig_error_types.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+    fig_error_types = cached_figure('error_type_bar', error_data, build, lang=lang,
+                                    columns=['error_code'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_error_types, use_container_width=True)
 
-def render_daily_errors_line_chart(error_data, lang='ko'):
+def render_daily_errors_line_chart(error_data, lang='ko', width=DEFAULT_CHART_WIDTH, key="daily_errors_line"):
     """
     일별 오류 발생 추이를 라인 차트로 표시합니다.
+    점이 차트 폭보다 많으면 표시 구간 슬라이더를 보여주고 구간 내 점을 LTTB 로 줄입니다.
     
     Args:
         error_data (list): 오류 데이터 목록
         lang (str): 언어 코드 ('ko' 또는 'vi')
+        width (int): 차트 폭 (픽셀, 최대 점 수 계산용)
+        key (str): 구간 슬라이더 위젯 키
         
     Returns:
         None: 차트는 streamlit을 통해 직접 화면에 표시됩니다.
@@ -100,29 +119,33 @@ def render_daily_errors_line_chart(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    df_errors = pd.DataFrame(error_data)
-    
-    # 날짜 형식 변환
-    df_errors['date'] = pd.to_datetime(df_errors['timestamp']).dt.date
-    
-    # 일별 오류 건수 집계
-    daily_errors = df_errors.groupby('date').size().reset_index(name='count')
-    
-    # 라인 차트 생성
-    fig_errors = px.line(
-        daily_errors,
-        x='date',
-        y='count',
-        title=get_text("daily_errors", lang),
-        labels={
-            'date': get_text("date", lang), 
-            'count': get_text("count", lang)
-        },
-        height=300
-    )
+    def daily_counts():
+        # 날짜 형식 변환 후 일별 오류 건수 집계
+        df_errors = pd.DataFrame(error_data, columns=['timestamp'])
+        return pd.to_datetime(df_errors['timestamp']).dt.date.value_counts().sort_index()
+    
+    max_points = target_points(width)
+    x_range = None
+    # 일수는 오류 건수보다 많을 수 없으므로, 건수가 적으면 구간 계산을 건너뜁니다.
+    if len(error_data) > max_points:
+        dates = daily_counts().index
+        if len(dates) > max_points:
+            x_range = select_time_range(dates[0], dates[-1], key, lang)
+    
+    def build():
+        daily_errors = daily_counts()
+        return build_time_series_figure(
+            daily_errors.index,
+            daily_errors.values,
+            title=get_text("daily_errors", lang),
+            x_label=get_text("date", lang),
+            y_label=get_text("count", lang),
+            max_points=max_points,
+            x_range=x_range
+        )
     
-    # 차트 레이아웃 조정
-    fig_errors.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+    fig_errors = cached_figure(f'daily_errors_line:{max_points}:{x_range}', error_data, build, lang=lang,
+                               columns=['timestamp'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_errors, use_container_width=True)
@@ -142,25 +165,30 @@ def render_parts_replacement_bar_chart(parts_data, lang='ko'):
         st.info(get_text("no_parts_data", lang))
         return
     
-    df_parts = pd.DataFrame(parts_data)
-    
-    # 부품별 교체 횟수 집계
-    parts_counts = df_parts['part_code'].value_counts()
-    
-    # 바 차트 생성
-    fig_parts_types = px.bar(
-        x=parts_counts.index,
-        y=parts_counts.values,
-        title=get_text("parts_replacement", lang),
-        labels={
-            'x': get_text("part_code", lang), 
-            'y': get_text("count", lang)
-        },
-        height=300
-    )
-    
-    # 차트 레이아웃 조정
-    fig_parts_types.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+    def build():
+        df_parts = pd.DataFrame(parts_data)
+        
+        # 부품별 교체 횟수 집계
+        parts_counts = df_parts['part_code'].value_counts()
+        
+        # 바 차트 생성
+        fig_parts_types = px.bar(
+            x=parts_counts.index,
+            y=parts_counts.values,
+            title=get_text("parts_replacement", lang),
+            labels={
+                'x': get_text("part_code", lang), 
+                'y': get_text("count", lang)
+            },
+            height=300
+        )
+        
+        # 차트 레이아웃 조정
+        fig_parts_types.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+        return fig_parts_types
+    
+    fig_parts_types = cached_figure('parts_replacement_bar', parts_data, build, lang=lang,
+                                    columns=['part_code'], tables=('parts_replacement',))
     
     # 차트 표시
     st.plotly_chart(fig_parts_types, use_container_width=True)
@@ -0,0 +1,149 @@
+"""
+차트 Figure 캐시 모듈
+- 입력 데이터 지문(fingerprint) + 차트 종류 + 언어를 키로 생성된 Figure 를 재사용
+- 여러 사용자가 같은 차트를 볼 때 집계와 px.* Figure 생성을 한 번만 수행
+- query_cache 쓰기 알림(데이터 버전 변경)을 받으면 해당 테이블로 만든 Figure 를 제거
+  (데이터가 바뀌면 지문도 바뀌므로 알림이 없는 데이터도 이전 Figure 를 쓰지 않음)
+
+Figure 는 프로세스 전역에서 공유되므로 캐시에서 받은 Figure 를 수정하지 말아야 합니다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.query_cache import add_write_listener
+
+FIGURE_CACHE_SIZE = 128
+
+
+def data_fingerprint(data, columns=None):
+    """
+    데이터프레임 또는 딕셔너리 목록의 내용 지문을 계산합니다.
+
+    Args:
+        data: pandas.DataFrame 또는 딕셔너리 목록
+        columns (list): 지문에 포함할 컬럼 (차트에서 사용하는 컬럼만 지정하면 더 빠름)
+
+    Returns:
+        str: 16진수 지문
+    """
+    if isinstance(data, pd.DataFrame):
+        frame = data if columns is None else data[[c for c in columns if c in data.columns]]
+    else:
+        frame = pd.DataFrame.from_records(list(data or []), columns=columns)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(frame.columns), len(frame))).encode('utf-8'))
+    if len(frame):
+        try:
+            hashed = pd.util.hash_pandas_object(frame, index=False)
+        except TypeError:
+            # 리스트/딕셔너리 등 해시할 수 없는 값이 있으면 문자열로 변환해 계산합니다.
+            hashed = pd.util.hash_pandas_object(frame.astype(str), index=False)
+        digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class _CachedFigure:
+    __slots__ = ('figure', 'tables', '_json')
+
+    def __init__(self, figure, tables):
+        self.figure = figure
+        self.tables = tables
+        self._json = None
+
+    def to_json(self):
+        if self._json is None:
+            self._json = self.figure.to_json()
+        return self._json
+
+
+class FigureCache:
+    """차트 Figure 를 지문 키로 보관하는 LRU 캐시입니다."""
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, chart, lang, data, build, columns, tables):
+        fingerprint = data_fingerprint(data, columns)
+        key = (chart, lang, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = _CachedFigure(build(), tuple(tables))
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_figure(self, chart, data, build, lang='ko', columns=None, tables=()):
+        """
+        캐시된 Figure 를 반환하고, 없으면 build() 로 만들어 저장합니다.
+
+        Args:
+            chart (str): 차트 종류 이름
+            data: Figure 를 만드는 입력 데이터 (지문 계산용)
+            build (callable): Figure 를 생성하는 함수
+            lang (str): 언어 코드
+            columns (list): 지문에 포함할 컬럼
+            tables (tuple): 데이터 출처 테이블 (쓰기 발생 시 제거)
+
+        Returns:
+            plotly.graph_objects.Figure
+        """
+        return self._lookup(chart, lang, data, build, columns, tables).figure
+
+    def get_json(self, chart, data, build, lang='ko', columns=None, tables=()):
+        """get_figure 와 같지만 직렬화된 Figure JSON 문자열을 반환합니다 (직렬화도 한 번만 수행)."""
+        return self._lookup(chart, lang, data, build, columns, tables).to_json()
+
+    def evict_tables(self, *tables):
+        """지정 테이블 데이터로 만든 Figure 를 제거합니다."""
+        tables = set(tables)
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if tables & set(entry.tables)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+figure_cache = FigureCache()
+
+
+def _on_write(table, rows, previous, current):
+    figure_cache.evict_tables(table)
+
+
+add_write_listener(_on_write)
+
+
+def cached_figure(chart, data, build, lang='ko', columns=None, tables=()):
+    """전역 Figure 캐시에서 Figure 를 가져옵니다 (FigureCache.get_figure 참고)."""
+    return figure_cache.get_figure(chart, data, build, lang=lang, columns=columns, tables=tables)
+
+
+def cached_figure_json(chart, data, build, lang='ko', columns=None, tables=()):
+    """전역 Figure 캐시에서 직렬화된 Figure JSON 을 가져옵니다."""
+    return figure_cache.get_json(chart, data, build, lang=lang, columns=columns, tables=tables)
+
+
+def clear_figure_cache():
+    figure_cache.clear()
@@ -7,6 +7,8 @@
 - 작업자별 평균 수리 시간 바 차트
 - 설비별 다운타임 바 차트
 - 오류 코드별 평균 수리 시간 바 차트
+
+차트 Figure 는 입력 데이터 지문 기준으로 figure_cache 에 보관되어 같은 데이터로 다시 그릴 때 재사용됩니다.
 """
 
 import streamlit as st
@@ -14,6 +16,7 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 from components.language import get_text
+from modules.charts.figure_cache import cached_figure
 import random
 
 def render_error_code_bar_chart(error_data, lang='ko'):
@@ -31,17 +34,22 @@ def render_error_code_bar_chart(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    # 오류 코드별 발생 횟수 집계
-    error_counts = error_data['오류코드'].value_counts().reset_index()
-    error_counts.columns = [get_text("error_code", lang), get_text("occurrences", lang)]
+    def build():
+        # 오류 코드별 발생 횟수 집계
+        error_counts = error_data['오류코드'].value_counts().reset_index()
+        error_counts.columns = [get_text("error_code", lang), get_text("occurrences", lang)]
+    
+        # 바 차트 생성
+        fig_error_counts = px.bar(
+            error_counts,
+            x=get_text("error_code", lang),
+            y=get_text("occurrences", lang),
+            title=get_text("occurrences_by_error_code", lang)
+        )
+        return fig_error_counts
     
-    # 바 차트 생성
-    fig_error_counts = px.bar(
-        error_counts,
-        x=get_text("error_code", lang),
-        y=get_text("occurrences", lang),
-        title=get_text("occurrences_by_error_code", lang)
-    )
+    fig_error_counts = cached_figure('error_code_bar', error_data, build, lang=lang,
+                                     columns=['오류코드'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_error_counts, use_container_width=True)
@@ -61,19 +69,24 @@ def render_error_trend_by_hour(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    # 시간대별 오류 발생 횟수 집계
-    hour_counts = error_data['시간'].value_counts().reset_index()
-    hour_counts.columns = [get_text("hour", lang), get_text("occurrences", lang)]
-    hour_counts = hour_counts.sort_values(by=get_text("hour", lang))
+    def build():
+        # 시간대별 오류 발생 횟수 집계
+        hour_counts = error_data['시간'].value_counts().reset_index()
+        hour_counts.columns = [get_text("hour", lang), get_text("occurrences", lang)]
+        hour_counts = hour_counts.sort_values(by=get_text("hour", lang))
     
-    # 라인 차트 생성
-    fig_hour_trend = px.line(
-        hour_counts,
-        x=get_text("hour", lang),
-        y=get_text("occurrences", lang),
-        title=get_text("error_trend_by_hour", lang),
-        markers=True
-    )
+        # 라인 차트 생성
+        fig_hour_trend = px.line(
+            hour_counts,
+            x=get_text("hour", lang),
+            y=get_text("occurrences", lang),
+            title=get_text("error_trend_by_hour", lang),
+            markers=True
+        )
+        return fig_hour_trend
+    
+    fig_hour_trend = cached_figure('error_trend_by_hour', error_data, build, lang=lang,
+                                   columns=['시간'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_hour_trend, use_container_width=True)
@@ -93,32 +106,42 @@ def render_worker_bar_charts(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    # 작업자별 처리 건수 집계
-    worker_counts = error_data['작업자'].value_counts().reset_index()
-    worker_counts.columns = [get_text("worker", lang), get_text("occurrences", lang)]
+    def build():
+        # 작업자별 처리 건수 집계
+        worker_counts = error_data['작업자'].value_counts().reset_index()
+        worker_counts.columns = [get_text("worker", lang), get_text("occurrences", lang)]
+    
+        # 처리 건수 바 차트 생성
+        fig_worker_counts = px.bar(
+            worker_counts,
+            x=get_text("worker", lang),
+            y=get_text("occurrences", lang),
+            title=get_text("occurrences_by_worker", lang)
+        )
+        return fig_worker_counts
     
-    # 처리 건수 바 차트 생성
-    fig_worker_counts = px.bar(
-        worker_counts,
-        x=get_text("worker", lang),
-        y=get_text("occurrences", lang),
-        title=get_text("occurrences_by_worker", lang)
-    )
+    fig_worker_counts = cached_figure('worker_count_bar', error_data, build, lang=lang,
+                                      columns=['작업자'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_worker_counts, use_container_width=True)
     
-    # 작업자별 평균 수리 시간 집계
-    worker_repair_times = error_data.groupby('작업자')['수리시간'].mean().reset_index()
-    worker_repair_times.columns = [get_text("worker", lang), get_text("avg_repair_time", lang)]
+    def build():
+        # 작업자별 평균 수리 시간 집계
+        worker_repair_times = error_data.groupby('작업자')['수리시간'].mean().reset_index()
+        worker_repair_times.columns = [get_text("worker", lang), get_text("avg_repair_time", lang)]
     
-    # 평균 수리 시간 바 차트 생성
-    fig_worker_times = px.bar(
-        worker_repair_times,
-        x=get_text("worker", lang),
-        y=get_text("avg_repair_time", lang),
-        title=get_text("avg_repair_time_by_worker", lang)
-    )
+        # 평균 수리 시간 바 차트 생성
+        fig_worker_times = px.bar(
+            worker_repair_times,
+            x=get_text("worker", lang),
+            y=get_text("avg_repair_time", lang),
+            title=get_text("avg_repair_time_by_worker", lang)
+        )
+        return fig_worker_times
+    
+    fig_worker_times = cached_figure('worker_repair_time_bar', error_data, build, lang=lang,
+                                     columns=['작업자', '수리시간'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_worker_times, use_container_width=True)
@@ -138,17 +161,22 @@ def render_equipment_downtime_bar_chart(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    # 설비별 다운타임 집계
-    equipment_downtime = error_data.groupby('설비번호')['수리시간'].sum().reset_index()
-    equipment_downtime.columns = [get_text("equipment_number", lang), get_text("downtime", lang)]
+    def build():
+        # 설비별 다운타임 집계
+        equipment_downtime = error_data.groupby('설비번호')['수리시간'].sum().reset_index()
+        equipment_downtime.columns = [get_text("equipment_number", lang), get_text("downtime", lang)]
+    
+        # 다운타임 바 차트 생성
+        fig_downtime = px.bar(
+            equipment_downtime,
+            x=get_text("equipment_number", lang),
+            y=get_text("downtime", lang),
+            title=get_text("downtime_by_equipment", lang)
+        )
+        return fig_downtime
     
-    # 다운타임 바 차트 생성
-    fig_downtime = px.bar(
-        equipment_downtime,
-        x=get_text("equipment_number", lang),
-        y=get_text("downtime", lang),
-        title=get_text("downtime_by_equipment", lang)
-    )
+    fig_downtime = cached_figure('equipment_downtime_bar', error_data, build, lang=lang,
+                                 columns=['설비번호', '수리시간'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_downtime, use_container_width=True)
@@ -168,17 +196,22 @@ def render_error_repair_time_bar_chart(error_data, lang='ko'):
         st.info(get_text("no_error_data", lang))
         return
     
-    # 오류 코드별 평균 수리 시간 집계
-    error_repair_times = error_data.groupby('오류코드')['수리시간'].mean().reset_index()
-    error_repair_times.columns = [get_text("error_code", lang), get_text("avg_repair_time", lang)]
-    
-    # 평균 수리 시간 바 차트 생성
-    fig_error_times = px.bar(
-        error_repair_times,
-        x=get_text("error_code", lang),
-        y=get_text("avg_repair_time", lang),
-        title=get_text("avg_repair_time_by_error", lang)
-    )
+    def build():
+        # 오류 코드별 평균 수리 시간 집계
+        error_repair_times = error_data.groupby('오류코드')['수리시간'].mean().reset_index()
+        error_repair_times.columns = [get_text("error_code", lang), get_text("avg_repair_time", lang)]
+    
+        # 평균 수리 시간 바 차트 생성
+        fig_error_times = px.bar(
+            error_repair_times,
+            x=get_text("error_code", lang),
+            y=get_text("avg_repair_time", lang),
+            title=get_text("avg_repair_time_by_error", lang)
+        )
+        return fig_error_times
+    
+    fig_error_times = cached_figure('error_repair_time_bar', error_data, build, lang=lang,
+                                    columns=['오류코드', '수리시간'], tables=('error_history',))
     
     # 차트 표시
     st.plotly_chart(fig_error_times, use_container_width=True)
@@ -11,7 +11,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
 from supabase.client import create_client, Client
-from utils.supabase_client import get_supabase_client
+from utils.supabase_client import get_supabase_client, get_plan_suspension_index
+from utils.query_cache import invalidate_tables
 from components.language import get_text
 import plotly.express as px
 import numpy as np
@@ -349,6 +350,7 @@ def save_plan_suspension(suspension_data, lang='ko'):
         response = supabase.table('plan_suspensions').insert(suspension_data).execute()
         
         if response.data:
+            invalidate_tables('plan_suspensions')
             return True
         else:
             return False
@@ -371,6 +373,16 @@ def get_plan_suspensions(plan_id=None, active_only=False, lang='ko'):
     supabase = get_supabase_client()
     
     try:
+        # 활성화된 중단 기록은 계획 정지 인터벌 인덱스에서 오늘을 포함하는 기간으로 조회
+        # (종료일이 없거나 종료일이 오늘 이후인 기록)
+        if active_only:
+            index = get_plan_suspension_index()
+            if index is not None:
+                active = index.suspended_on(date.today())
+                if plan_id:
+                    active = [row for row in active if row.get('plan_id') == plan_id]
+                return pd.DataFrame(active)
+        
         # 쿼리 생성
         query = supabase.table('plan_suspensions').select('*')
         
@@ -381,7 +393,7 @@ def get_plan_suspensions(plan_id=None, active_only=False, lang='ko'):
         # 활성화된 중단 기록만 조회하는 경우 필터링
         if active_only:
             today = date.today().isoformat()
-            query = query.is_('end_date', 'null').or_(f"end_date.gte.{today}")
+            query = query.or_(f"end_date.is.null,end_date.gte.{today}").lte('start_date', today)
         
         # 쿼리 실행
         response = query.execute()
@@ -415,6 +427,7 @@ def update_plan_suspension(suspension_id, update_data, lang='ko'):
         response = supabase.table('plan_suspensions').update(update_data).eq('id', suspension_id).execute()
         
         if response.data:
+            invalidate_tables('plan_suspensions')
             return True
         else:
             return False
@@ -0,0 +1,408 @@
+"""
+이력 데이터 일괄 가져오기 서비스 (CSV / Excel)
+- 큰 파일을 행 묶음(chunk) 단위로 읽어 메모리 사용량을 일정하게 유지
+- 설비 번호 / 오류 코드 / 부품 코드 / 시간 값을 pandas 벡터 연산으로 검증
+  (기준 테이블은 query_cache 에 캐시된 목록을 한 번만 읽어 집합으로 비교)
+- 검증된 행은 내용으로 만든 결정적 id(uuid5)로 일괄 upsert 하므로 같은 파일을 다시 가져와도 중복되지 않음
+
+사용 예:
+    python -m services.bulk_import_service error_history records.xlsx --dry-run
+"""
+
+import argparse
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from utils.serial_index import normalize_equipment_number
+
+IMPORT_CHUNK_ROWS = 5000
+# 검증 오류는 이 건수까지만 보관합니다 (화면 표시/다운로드용).
+MAX_ERROR_ROWS = 1000
+# 이 시각 이전/이후의 값은 잘못 입력된 날짜로 봅니다.
+MIN_TIMESTAMP = pd.Timestamp('2000-01-01')
+
+# 행 id 생성용 네임스페이스 (변경하면 기존 행과 중복 판단이 달라짐)
+IMPORT_NAMESPACE = uuid.UUID('3d8f6c2b-7a41-5e09-b6c3-2f4e8a1d9c70')
+
+# 테이블별 가져오기 설정
+# - columns: 파일 헤더(한국어/영어) → 테이블 컬럼
+# - required: 비어 있으면 안 되는 컬럼
+# - times / integers: 시간 / 정수로 변환할 컬럼
+# - references: 기준 테이블에 있어야 하는 컬럼 (equipment / error_codes / parts)
+# - key: 같은 기록인지 판단하는 컬럼 (id 생성에 사용)
+IMPORT_TABLES = {
+    'error_history': {
+        'columns': {
+            '일시': 'timestamp', '타임스탬프': 'timestamp', '설비번호': 'equipment_number',
+            '시리얼번호': 'serial_number', '오류코드': 'error_code', '고장내용': 'error_detail',
+            '수리시간': 'repair_time', '조치내용': 'repair_method', '작업자': 'worker', '관리자': 'supervisor',
+        },
+        'required': ['timestamp', 'equipment_number', 'error_code', 'repair_time'],
+        'times': ['timestamp'],
+        'integers': ['repair_time'],
+        'references': {'equipment_number': 'equipment', 'error_code': 'error_codes'},
+        'key': ['timestamp', 'equipment_number', 'error_code', 'worker'],
+    },
+    'parts_replacement': {
+        'columns': {
+            '일시': 'timestamp', '타임스탬프': 'timestamp', '설비번호': 'equipment_number',
+            '시리얼번호': 'serial_number', '부품코드': 'part_code', '수리시간': 'repair_time',
+            '작업자': 'worker', '관리자': 'supervisor',
+        },
+        'required': ['timestamp', 'equipment_number', 'part_code'],
+        'times': ['timestamp'],
+        'integers': ['repair_time'],
+        'references': {'equipment_number': 'equipment', 'part_code': 'parts'},
+        'key': ['timestamp', 'equipment_number', 'part_code', 'worker'],
+    },
+    'equipment_stops': {
+        'columns': {
+            '설비번호': 'equipment_number', '시리얼번호': 'serial_number', '정지사유': 'stop_reason',
+            '시작시간': 'start_time', '종료시간': 'end_time', '정지시간': 'duration_minutes',
+            '상세내용': 'details', '작업자': 'worker', '관리자': 'supervisor',
+        },
+        'required': ['equipment_number', 'stop_reason', 'start_time', 'end_time', 'duration_minutes'],
+        'times': ['start_time', 'end_time'],
+        'integers': ['duration_minutes'],
+        'references': {'equipment_number': 'equipment'},
+        'key': ['equipment_number', 'start_time', 'stop_reason'],
+    },
+    'model_changes': {
+        'columns': {
+            '일시': 'timestamp', '타임스탬프': 'timestamp', '설비번호': 'equipment_number',
+            '시리얼번호': 'serial_number', '이전모델': 'model_from', '변경모델': 'model_to',
+            '교체시간': 'duration_minutes', '상세내용': 'details', '작업자': 'worker', '관리자': 'supervisor',
+        },
+        'required': ['timestamp', 'equipment_number', 'model_from', 'model_to'],
+        'times': ['timestamp'],
+        'integers': ['duration_minutes'],
+        'references': {'equipment_number': 'equipment'},
+        'key': ['timestamp', 'equipment_number', 'model_from', 'model_to'],
+    },
+}
+
+
+def load_reference_data():
+    """
+    검증에 사용할 기준 목록을 불러옵니다 (query_cache 에 캐시된 목록 사용).
+
+    Returns:
+        dict: {'equipment': {정규화된 설비 번호: 저장된 설비 번호},
+               'error_codes': set, 'parts': set}
+              기준 목록이 비어 있으면 해당 검사는 건너뜁니다.
+    """
+    from utils.supabase_client import supabase, get_equipment_list, get_error_codes, get_parts_list
+
+    if not supabase:
+        return {'equipment': {}, 'error_codes': set(), 'parts': set()}
+    equipment = {}
+    for row in get_equipment_list():
+        number = row.get('equipment_number')
+        if number is not None:
+            equipment[normalize_equipment_number(number)] = str(number)
+    return {
+        'equipment': equipment,
+        'error_codes': {str(row['error_code']).strip() for row in get_error_codes() if row.get('error_code')},
+        'parts': {str(row['part_code']).strip() for row in get_parts_list() if row.get('part_code')},
+    }
+
+
+def _file_name(file):
+    return getattr(file, 'name', file if isinstance(file, str) else '')
+
+
+def iter_import_chunks(file, chunk_rows=IMPORT_CHUNK_ROWS, sheet_name=0):
+    """
+    CSV / Excel 파일을 chunk_rows 행씩 문자열 데이터프레임으로 읽습니다.
+    인덱스는 파일의 행 번호(헤더 = 1행)입니다.
+
+    Args:
+        file: 파일 경로 또는 업로드 파일 객체
+        chunk_rows (int): 한 번에 읽을 행 수
+        sheet_name: Excel 시트 이름 또는 순서
+
+    Yields:
+        pandas.DataFrame: 행 묶음
+    """
+    name = str(_file_name(file)).lower()
+    if name.endswith(('.xlsx', '.xlsm')):
+        yield from _iter_excel_chunks(file, chunk_rows, sheet_name)
+        return
+
+    reader = pd.read_csv(file, dtype=str, chunksize=chunk_rows, skipinitialspace=True,
+                         encoding='utf-8-sig')
+    start = 2
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def _iter_excel_chunks(file, chunk_rows, sheet_name):
+    """openpyxl 읽기 전용 모드로 행을 순서대로 읽어 전체 시트를 메모리에 올리지 않습니다."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Excel 파일을 읽으려면 openpyxl 패키지가 필요합니다: pip install openpyxl")
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(value).strip() if value is not None else f'column_{i}' for i, value in enumerate(header)]
+        buffer, start = [], 2
+        for row in rows:
+            buffer.append(row[:len(header)])
+            if len(buffer) >= chunk_rows:
+                yield _excel_frame(buffer, header, start)
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield _excel_frame(buffer, header, start)
+    finally:
+        workbook.close()
+
+
+def _excel_frame(rows, header, start):
+    frame = pd.DataFrame.from_records(rows, columns=header)
+    frame.index = pd.RangeIndex(start, start + len(frame))
+    # Excel 날짜 셀은 datetime 으로 읽히므로 그대로 두고, 나머지는 CSV 와 같이 문자열로 맞춥니다.
+    for column in frame.columns:
+        if not pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].where(frame[column].isna(), frame[column].astype(str))
+    return frame
+
+
+def _normalize_columns(df, config):
+    """파일 헤더를 테이블 컬럼명으로 바꾸고 설정에 없는 컬럼은 제외합니다."""
+    renamed = df.rename(columns=lambda c: str(c).strip()).rename(columns=config['columns'])
+    allowed = set(config['columns'].values())
+    # 같은 컬럼으로 바뀌는 헤더가 여러 개면 ('일시', '타임스탬프') 앞의 것을 사용합니다.
+    renamed = renamed.loc[:, ~renamed.columns.duplicated()]
+    frame = renamed.loc[:, [c for c in renamed.columns if c in allowed]].copy()
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            values = frame[column].str.strip()
+            frame[column] = values.mask(values == '')
+    return frame
+
+
+def _map_unique(series, func):
+    """고유값에만 func 를 적용해 전체 열에 펼칩니다 (반복 값이 많은 설비 번호 등)."""
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Series([func(value) for value in uniques], dtype=object)
+    result = mapped.reindex(codes).to_numpy()
+    result[codes < 0] = None
+    return pd.Series(result, index=series.index, dtype=object)
+
+
+def _parse_times(series):
+    """
+    시간 값을 시간대 없는 UTC 기준 datetime64 시리즈로 변환합니다 (형식 오류는 NaT).
+    Supabase/PostgreSQL 내보내기의 오프셋 포함 값과 시간대 없는 값이 섞여 있어도 같은 기준으로 비교할 수 있습니다.
+
+    >>> _parse_times(pd.Series(['2024-03-01 19:00', '2024-03-01T10:00:00+00:00', '2024-03-01T19:00:00+09:00'])).tolist()
+    [Timestamp('2024-03-01 19:00:00'), Timestamp('2024-03-01 10:00:00'), Timestamp('2024-03-01 10:00:00')]
+    """
+    return pd.to_datetime(series, errors='coerce', utc=True).dt.tz_convert(None)
+
+
+def validate_chunk(df, table, references):
+    """
+    행 묶음을 검증하고 저장할 행과 오류 행을 나눕니다.
+
+    Args:
+        df (pandas.DataFrame): iter_import_chunks 가 반환한 행 묶음
+        table (str): 대상 테이블
+        references (dict): load_reference_data() 결과
+
+    Returns:
+        tuple: (저장할 데이터프레임, 오류 데이터프레임[row, column, reason, value])
+    """
+    config = IMPORT_TABLES[table]
+    frame = _normalize_columns(df, config)
+    for column in config['required']:
+        if column not in frame.columns:
+            frame[column] = None
+
+    problems = {}
+    now = pd.Timestamp(datetime.now() + timedelta(days=1))
+    for column in config['times']:
+        if column in frame.columns:
+            parsed = _parse_times(frame[column])
+            problems[(column, '형식 오류')] = parsed.isna() & frame[column].notna()
+            problems[(column, '시간 범위 오류')] = (parsed < MIN_TIMESTAMP) | (parsed > now)
+            frame[column] = parsed
+    for column in config['integers']:
+        if column in frame.columns:
+            numbers = pd.to_numeric(frame[column], errors='coerce')
+            problems[(column, '형식 오류')] = (numbers.isna() & frame[column].notna()) | (numbers < 0)
+            frame[column] = numbers
+
+    if table == 'equipment_stops':
+        # 종료 시간 / 정지 시간 중 하나만 있으면 나머지를 계산합니다.
+        duration = pd.to_timedelta(frame['duration_minutes'], unit='m')
+        frame['end_time'] = frame['end_time'].fillna(frame['start_time'] + duration)
+        computed = (frame['end_time'] - frame['start_time']).dt.total_seconds() / 60
+        frame['duration_minutes'] = frame['duration_minutes'].fillna(computed)
+        problems[('end_time', '종료 시간이 시작 시간보다 이름')] = frame['end_time'] < frame['start_time']
+
+    for column in config['required']:
+        # 형식 오류로 비워진 값은 필수 값 누락으로 중복 표시하지 않습니다.
+        malformed = problems.get((column, '형식 오류'), pd.Series(False, index=frame.index))
+        problems[(column, '필수 값 누락')] = frame[column].isna() & ~malformed
+
+    for column, reference in config['references'].items():
+        known = references.get(reference)
+        if not known or column not in frame.columns:
+            continue
+        if reference == 'equipment':
+            canonical = _map_unique(frame[column], lambda v: known.get(normalize_equipment_number(v)))
+            problems[(column, '등록되지 않은 설비')] = canonical.isna() & frame[column].notna()
+            frame[column] = canonical.where(canonical.notna(), frame[column])
+        else:
+            problems[(column, '등록되지 않은 코드')] = ~frame[column].isin(known) & frame[column].notna()
+
+    invalid = pd.Series(False, index=frame.index)
+    error_frames = []
+    for (column, reason), failed in problems.items():
+        failed = failed.fillna(False).astype(bool)
+        if not failed.any():
+            continue
+        invalid |= failed
+        rows = frame.index[failed.to_numpy()]
+        source = _source_column(df, config, column)
+        error_frames.append(pd.DataFrame({
+            'row': rows,
+            'column': column,
+            'reason': reason,
+            'value': df.loc[rows, source].to_numpy() if source else None,
+        }))
+
+    errors = (pd.concat(error_frames, ignore_index=True).sort_values('row', kind='stable')
+              if error_frames else pd.DataFrame(columns=['row', 'column', 'reason', 'value']))
+    return frame[~invalid], errors
+
+
+def _source_column(df, config, column):
+    """오류 표시용으로 테이블 컬럼에 해당하는 파일의 원래 헤더를 찾습니다."""
+    for header in df.columns:
+        name = str(header).strip()
+        if config['columns'].get(name, name) == column:
+            return header
+    return None
+
+
+def frame_to_records(frame, table):
+    """검증된 행 묶음을 저장할 행 목록으로 변환합니다 (결정적 id, 시리얼 번호 채움)."""
+    from utils.supabase_client import get_serials_by_equipment_numbers
+
+    config = IMPORT_TABLES[table]
+    frame = frame.copy()
+    for column in config['times']:
+        if column in frame.columns:
+            frame[column] = frame[column].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    for column in config['integers']:
+        if column in frame.columns:
+            frame[column] = frame[column].round().astype('Int64')
+
+    key_columns = [c for c in config['key'] if c in frame.columns]
+    keys = frame[key_columns].astype(str).agg('|'.join, axis=1)
+    frame['id'] = [str(uuid.uuid5(IMPORT_NAMESPACE, f"{table}|{key}")) for key in keys]
+    frame = frame.drop_duplicates('id')
+
+    if 'serial_number' not in frame.columns:
+        frame['serial_number'] = None
+    missing = frame['serial_number'].isna()
+    if missing.any():
+        serials = get_serials_by_equipment_numbers(frame.loc[missing, 'equipment_number'].unique().tolist())
+        frame.loc[missing, 'serial_number'] = frame.loc[missing, 'equipment_number'].map(serials)
+
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict('records')
+
+
+def import_history_file(file, table, chunk_rows=IMPORT_CHUNK_ROWS, batch_size=None,
+                        dry_run=False, references=None, progress=None):
+    """
+    CSV / Excel 파일의 이력 데이터를 검증 후 테이블에 일괄 저장합니다.
+    잘못된 행은 건너뛰고 행 번호와 사유를 오류 목록에 기록합니다.
+
+    Args:
+        file: 파일 경로 또는 업로드 파일 객체
+        table (str): 'error_history' / 'parts_replacement' / 'equipment_stops' / 'model_changes'
+        chunk_rows (int): 한 번에 읽고 검증할 행 수
+        batch_size (int): 저장 요청당 행 수 (기본값: BULK_WRITE_CHUNK_SIZE)
+        dry_run (bool): True 면 검증만 하고 저장하지 않음
+        references (dict): 기준 목록 (기본값: load_reference_data())
+        progress (callable): 행 묶음 처리 후 호출 (summary 딕셔너리 인자)
+
+    Returns:
+        dict: {'read', 'valid', 'invalid', 'inserted', 'completed', 'errors': 오류 데이터프레임}
+    """
+    from utils.supabase_client import bulk_upsert_data, BULK_WRITE_CHUNK_SIZE
+
+    if table not in IMPORT_TABLES:
+        raise ValueError(f"가져올 수 없는 테이블: {table}")
+    references = load_reference_data() if references is None else references
+    batch_size = batch_size or BULK_WRITE_CHUNK_SIZE
+
+    summary = {'read': 0, 'valid': 0, 'invalid': 0, 'inserted': 0, 'completed': False}
+    error_frames, error_rows = [], 0
+    for chunk in iter_import_chunks(file, chunk_rows):
+        valid, errors = validate_chunk(chunk, table, references)
+        summary['read'] += len(chunk)
+        summary['valid'] += len(valid)
+        summary['invalid'] += len(chunk) - len(valid)
+        if error_rows < MAX_ERROR_ROWS and not errors.empty:
+            error_frames.append(errors.head(MAX_ERROR_ROWS - error_rows))
+            error_rows += len(error_frames[-1])
+
+        if not dry_run and not valid.empty:
+            inserted = bulk_upsert_data(table, frame_to_records(valid, table), chunk_size=batch_size)
+            if inserted is None:
+                # 저장 실패: 이 묶음 이후는 처리하지 않습니다 (같은 파일로 다시 실행하면 이어서 저장됨).
+                break
+            summary['inserted'] += len(inserted)
+        if progress:
+            progress(dict(summary))
+    else:
+        summary['completed'] = True
+
+    if not dry_run and summary['inserted'] and table == 'parts_replacement':
+        from utils.supabase_client import invalidate_tables
+        invalidate_tables('parts')
+
+    summary['errors'] = (pd.concat(error_frames, ignore_index=True) if error_frames
+                         else pd.DataFrame(columns=['row', 'column', 'reason', 'value']))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV / Excel 이력 데이터 일괄 가져오기")
+    parser.add_argument('table', choices=sorted(IMPORT_TABLES), help="대상 테이블")
+    parser.add_argument('path', help="CSV 또는 XLSX 파일 경로")
+    parser.add_argument('--chunk-rows', type=int, default=IMPORT_CHUNK_ROWS, help="한 번에 읽을 행 수")
+    parser.add_argument('--dry-run', action='store_true', help="검증만 수행")
+    parser.add_argument('--errors', help="검증 오류를 저장할 CSV 경로")
+    args = parser.parse_args(argv)
+
+    summary = import_history_file(
+        args.path, args.table, chunk_rows=args.chunk_rows, dry_run=args.dry_run,
+        progress=lambda s: print(f"  {s['read']}행 처리 (정상 {s['valid']}, 오류 {s['invalid']}, 저장 {s['inserted']})")
+    )
+    print(f"읽은 행 {summary['read']}, 정상 {summary['valid']}, 오류 {summary['invalid']}, 신규 저장 {summary['inserted']}")
+    if args.errors and not summary['errors'].empty:
+        summary['errors'].to_csv(args.errors, index=False, encoding='utf-8-sig')
+        print(f"검증 오류 {len(summary['errors'])}건을 {os.path.abspath(args.errors)} 에 저장했습니다.")
+    return 0 if summary['completed'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+"""
+대시보드 KPI 스냅샷 서비스
+- 설비 상태별 대수, 오류 코드 분포, 일별 고장 건수, 부품 교체 분포, 수리 시간 통계
+- 오류 코드/부품 분포는 통계 RPC(report_error_stats/report_parts_stats), 일별 고장 건수와
+  최근 REPAIR_WINDOW_DAYS 일의 수리 시간 통계는 최근 DAILY_WINDOW_DAYS 일의 일별 집계(error_daily_rollup)로 계산
+  (원본 이력 전체 조회 없음)
+- 이 프로세스의 고장/부품 교체 기록은 쓰기 리스너가 공유 스냅샷에 증분 반영하고 데이터 버전을 따라가므로 재계산하지 않음
+- 데이터 버전이 스냅샷과 다르거나(증분 반영할 수 없는 쓰기), 다른 프로세스의 쓰기를 반영하도록
+  조회 캐시의 원본 집계 결과가 TTL 만료로 다시 조회되었을 때만 다시 만들어 모든 세션이 공유
+"""
+
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from utils.query_cache import add_write_listener, get_data_version
+
+# 스냅샷이 의존하는 테이블
+SNAPSHOT_TABLES = ('equipment', 'error_history', 'parts_replacement')
+# 일별 고장 건수를 보관하는 최근 기간 (일)
+DAILY_WINDOW_DAYS = 365
+# 평균/최대/전체 수리 시간을 계산하는 최근 기간 (일)
+REPAIR_WINDOW_DAYS = 30
+
+
+def _to_date(value):
+    """timestamp 값(문자열/datetime/date)을 날짜로 변환합니다."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _repair_window_start():
+    return date.today() - timedelta(days=REPAIR_WINDOW_DAYS - 1)
+
+
+class DashboardSnapshot:
+    """대시보드 화면에 필요한 집계 결과를 보관합니다."""
+
+    def __init__(self, versions=None, sources=()):
+        self.versions = dict(versions or {})
+        # 스냅샷을 만든 원본 집계 결과 (조회 캐시가 반환한 행 목록)
+        self.sources = tuple(sources)
+        # 증분 반영한 쓰기 뒤 다시 조회된 원본 집계 결과를 재계산 없이 기준으로 삼을지 여부
+        self._adopt_sources = False
+        self.status_counts = Counter()
+        self.error_code_counts = Counter()
+        self.daily_errors = Counter()
+        self.parts_counts = Counter()
+        self.repair_count = 0
+        self.repair_total = 0
+        self.repair_max = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_records(cls, equipment, errors, parts, versions=None):
+        """원본 행 목록을 한 번 순회하여 스냅샷을 생성합니다."""
+        snapshot = cls(versions)
+        snapshot.status_counts.update(row.get('status') for row in equipment)
+        snapshot.apply_errors(errors)
+        snapshot.apply_parts(parts)
+        return snapshot
+
+    @classmethod
+    def from_stats(cls, equipment, error_stats, parts_stats, daily_rows, versions=None):
+        """
+        통계 RPC 결과와 일별 집계 행으로 스냅샷을 생성합니다.
+
+        Args:
+            equipment (list): 설비 행 목록
+            error_stats (list): get_error_stats() 결과 (오류 코드별 건수)
+            parts_stats (list): get_parts_stats() 결과 (부품 코드별 교체 횟수)
+            daily_rows (list): get_error_daily_rollup() 결과 (설비 × 일 × 오류 코드별 건수/수리 시간)
+        """
+        snapshot = cls(versions, (equipment, error_stats, parts_stats, daily_rows))
+        snapshot.status_counts.update(row.get('status') for row in equipment)
+        for stat in error_stats:
+            snapshot.error_code_counts[stat.get('error_code')] += int(stat.get('occurrences') or 0)
+        for stat in parts_stats:
+            snapshot.parts_counts[stat.get('part_code')] += int(stat.get('replacements') or 0)
+        repair_since = _repair_window_start()
+        for row in daily_rows:
+            day = _to_date(row.get('day'))
+            if day is None:
+                continue
+            occurrences = int(row.get('occurrences') or 0)
+            snapshot.daily_errors[day] += occurrences
+            if day >= repair_since:
+                snapshot.repair_count += occurrences
+                snapshot.repair_total += int(row.get('total_repair_time') or 0)
+                snapshot.repair_max = max(snapshot.repair_max, int(row.get('max_repair_time') or 0))
+        return snapshot
+
+    def apply_errors(self, rows):
+        """고장 이력 행을 집계에 반영합니다 (수리 시간 통계는 최근 REPAIR_WINDOW_DAYS 일의 행만)."""
+        repair_since = _repair_window_start()
+        with self._lock:
+            for row in rows:
+                self.error_code_counts[row.get('error_code')] += 1
+                day = _to_date(row.get('timestamp'))
+                if day is not None:
+                    self.daily_errors[day] += 1
+                if day is not None and day < repair_since:
+                    continue
+                # 일별 집계와 같이 수리 시간이 없는 고장도 건수에 포함합니다.
+                repair_time = int(row.get('repair_time') or 0)
+                self.repair_count += 1
+                self.repair_total += repair_time
+                self.repair_max = max(self.repair_max, repair_time)
+
+    def apply_parts(self, rows):
+        """부품 교체 행을 집계에 반영합니다."""
+        with self._lock:
+            self.parts_counts.update(row.get('part_code') for row in rows)
+
+    @property
+    def average_repair_time(self):
+        return self.repair_total / self.repair_count if self.repair_count else 0.0
+
+    def daily_error_series(self, days=30, end_date=None):
+        """
+        최근 days 일의 일별 고장 건수를 반환합니다 (고장이 없는 날은 0).
+
+        Returns:
+            tuple: (날짜 목록, 건수 목록)
+        """
+        end_date = end_date or date.today()
+        dates = [end_date - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+        return dates, [self.daily_errors.get(day, 0) for day in dates]
+
+    def top_counts(self, counter_name, limit=None):
+        """지정한 분포를 건수 내림차순 (키, 건수) 목록으로 반환합니다."""
+        with self._lock:
+            return getattr(self, counter_name).most_common(limit)
+
+    def is_current(self, versions, sources):
+        """
+        스냅샷이 현재 데이터를 반영하는지 확인합니다.
+
+        - 데이터 버전이 다르면 증분 반영하지 못한 쓰기가 있으므로 최신이 아닙니다.
+        - 쓰기 리스너가 증분 반영한 뒤에는 쓰기 무효화로 다시 조회된 원본 집계 결과를 새 기준으로 삼습니다.
+        - 그 밖에는 원본 집계 결과가 같은 행 객체인지 비교합니다. 조회 캐시는 만료 전까지 같은 행 객체를
+          반환하므로, 객체가 다르면 TTL 만료로 다시 조회된 것(다른 프로세스의 쓰기가 있을 수 있음)입니다.
+        """
+        with self._lock:
+            if self.versions != versions:
+                return False
+            if self._adopt_sources:
+                self.sources = tuple(sources)
+                self._adopt_sources = False
+                return True
+            if len(sources) != len(self.sources):
+                return False
+            return all(
+                len(rows) == len(previous) and all(row is old for row, old in zip(rows, previous))
+                for rows, previous in zip(sources, self.sources)
+            )
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _load_sources():
+    """스냅샷 원본 집계 결과를 조회 캐시에서 가져옵니다 (만료된 항목만 DB 에서 다시 조회)."""
+    from utils.supabase_client import get_equipment_list, get_error_stats, get_parts_stats, get_error_daily_rollup
+
+    today = date.today()
+    return (
+        get_equipment_list(),
+        get_error_stats(),
+        get_parts_stats(),
+        get_error_daily_rollup(today - timedelta(days=DAILY_WINDOW_DAYS - 1), today)
+    )
+
+
+def get_dashboard_snapshot():
+    """
+    대시보드 스냅샷을 반환합니다. 저장소가 설정되지 않았으면 None 을 반환합니다.
+    이 프로세스의 쓰기는 증분 반영된 스냅샷을 그대로 쓰고, 증분 반영할 수 없는 쓰기나 TTL 만료로
+    원본 집계 결과가 다시 조회된 경우에만 재계산합니다 (통계 RPC 와 일별 집계만 사용하므로 이력 크기와 무관).
+    """
+    global _snapshot
+    from utils.supabase_client import supabase
+
+    if not supabase:
+        return None
+
+    # 조회 전 버전을 기록해 조회 도중의 쓰기는 증분 반영 대상에서 제외합니다.
+    versions = dict(zip(SNAPSHOT_TABLES, get_data_version(*SNAPSHOT_TABLES)))
+    sources = _load_sources()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.is_current(versions, sources):
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or not _snapshot.is_current(versions, sources):
+            _snapshot = DashboardSnapshot.from_stats(*sources, versions)
+        return _snapshot
+
+
+def _on_write(table, rows, previous_version, new_version):
+    """쓰기 발생 시 최신 스냅샷이면 새 행만 반영하고 버전을 따라갑니다."""
+    snapshot = _snapshot
+    if snapshot is None or table not in SNAPSHOT_TABLES:
+        return
+    if rows is None or table == 'equipment' or snapshot.versions.get(table) != previous_version:
+        # 증분 반영할 수 없는 변경은 다음 조회 시 재계산합니다.
+        return
+    with snapshot._lock:
+        if table == 'error_history':
+            snapshot.apply_errors(rows)
+        else:
+            snapshot.apply_parts(rows)
+        snapshot.versions[table] = new_version
+        snapshot._adopt_sources = True
+
+
+add_write_listener(_on_write)
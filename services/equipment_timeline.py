@@ -0,0 +1,131 @@
+"""
+설비별 이벤트 타임라인 서비스
+- 고장, 부품 교체, 설비 정지, 모델 변경, 계획 정지 이력을 하나의 최신순 이벤트 목록으로 병합
+- 각 이력은 설비 번호로 필터링하고 (시간, id) 역순 키셋 페이지로 조회 (get_history_page)
+- heapq.merge 로 이미 정렬된 이력들을 k-way 병합하므로 필요한 만큼의 페이지만 조회
+  (설비 상세 화면을 열 때 비용은 전체 이력 크기가 아니라 표시할 페이지 크기에 비례)
+"""
+
+import heapq
+from datetime import date, datetime, timezone
+from itertools import islice
+
+from utils.supabase_client import HISTORY_PAGE_CONFIG, iter_history_pages
+
+# 타임라인 이벤트 종류: (이벤트 종류, 테이블)
+TIMELINE_SOURCES = (
+    ('error', 'error_history'),
+    ('parts', 'parts_replacement'),
+    ('stop', 'equipment_stops'),
+    ('model_change', 'model_changes'),
+    ('plan_suspension', 'plan_suspensions')
+)
+TIMELINE_TABLES = tuple(table for _, table in TIMELINE_SOURCES)
+# 한 번에 표시하는 이벤트 수 (이력별 조회 페이지 크기와 동일)
+TIMELINE_PAGE_SIZE = 50
+
+
+def _event_time(value):
+    """이력 시간 값(문자열/datetime/date)을 시간대 없는 UTC 기준 datetime 으로 변환합니다."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    elif value:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return datetime.min
+    else:
+        return datetime.min
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _summary(event_type, row):
+    """이벤트 종류별 요약 문자열을 만듭니다."""
+    if event_type == 'error':
+        return ' '.join(str(v) for v in (row.get('error_code'), row.get('error_detail')) if v)
+    if event_type == 'parts':
+        return str(row.get('part_code') or '')
+    if event_type == 'stop':
+        return ' '.join(str(v) for v in (row.get('stop_reason'), row.get('details')) if v)
+    if event_type == 'model_change':
+        return f"{row.get('model_from') or '-'} → {row.get('model_to') or '-'}"
+    return ' '.join(str(v) for v in (row.get('type'), row.get('reason'), row.get('status')) if v)
+
+
+def _duration(event_type, row):
+    """이벤트 소요 시간(분)을 반환합니다 (계획 정지는 일 단위이므로 None)."""
+    if event_type in ('error', 'parts'):
+        return row.get('repair_time')
+    if event_type in ('stop', 'model_change'):
+        return row.get('duration_minutes')
+    return None
+
+
+def to_event(event_type, row, time_column):
+    """이력 행을 타임라인 이벤트 딕셔너리로 변환합니다."""
+    return {
+        'time': _event_time(row.get(time_column)),
+        'event_type': event_type,
+        'summary': _summary(event_type, row),
+        'duration_minutes': _duration(event_type, row),
+        'worker': row.get('worker') or row.get('responsible_person'),
+        'id': row.get('id'),
+        'row': row
+    }
+
+
+def iter_source_events(event_type, table, equipment_number, page_size=TIMELINE_PAGE_SIZE):
+    """한 이력 테이블의 설비 이벤트를 최신순으로 반환합니다 (다음 페이지는 필요할 때 조회)."""
+    time_column = HISTORY_PAGE_CONFIG[table]['time_column']
+    for rows in iter_history_pages(table, page_size=page_size, equipment_number=equipment_number):
+        for row in rows:
+            yield to_event(event_type, row, time_column)
+
+
+def merge_events(streams):
+    """최신순으로 정렬된 이벤트 스트림들을 하나의 최신순 스트림으로 병합합니다."""
+    return heapq.merge(*streams, key=lambda event: event['time'], reverse=True)
+
+
+def iter_equipment_timeline(equipment_number, page_size=TIMELINE_PAGE_SIZE, sources=TIMELINE_SOURCES):
+    """설비의 모든 이력을 최신순 이벤트 스트림으로 반환합니다."""
+    return merge_events(
+        iter_source_events(event_type, table, equipment_number, page_size)
+        for event_type, table in sources
+    )
+
+
+class EquipmentTimeline:
+    """
+    설비 타임라인을 페이지 단위로 불러옵니다.
+    병합 스트림의 위치를 유지하므로 '더 보기' 때마다 다음 페이지 분량의 이벤트만 추가로 조회합니다.
+    """
+
+    def __init__(self, equipment_number, page_size=TIMELINE_PAGE_SIZE, streams=None):
+        self.equipment_number = equipment_number
+        self.page_size = page_size
+        self.events = []
+        self.exhausted = False
+        if streams is None:
+            self._stream = iter_equipment_timeline(equipment_number, page_size)
+        else:
+            self._stream = merge_events(streams)
+
+    def load_more(self, count=None):
+        """다음 이벤트를 count 개(기본값: 페이지 크기)까지 불러오고 새로 불러온 이벤트를 반환합니다."""
+        if self.exhausted:
+            return []
+        count = count or self.page_size
+        loaded = list(islice(self._stream, count))
+        if len(loaded) < count:
+            self.exhausted = True
+        self.events.extend(loaded)
+        return loaded
+
+    @property
+    def has_more(self):
+        return not self.exhausted
@@ -0,0 +1,299 @@
+"""
+일별 가동률 계산 서비스
+- 구글 폼 응답 시트("설문지 응답 시트1")의 날짜 컬럼으로 일별 고장 건수 집계
+- 마지막으로 처리한 행 이후의 새 행만 읽어 증분 반영 (처리 위치는 JSON 상태 파일에 저장)
+- 설비 설치일 기준 일자별 실제 설비 대수로 고장률/가동률 계산
+- DATA 시트를 한 번의 업데이트 요청으로 기록
+
+기존 Apps Script(updateOperationRatesVertical)를 대체합니다.
+
+사용 예:
+    python -m services.operation_rate_service --spreadsheet-id <ID> --credentials service_account.json
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+SOURCE_SHEET = "설문지 응답 시트1"
+TARGET_SHEET = "DATA"
+# "날자" 컬럼 (13번째 열)
+DATE_COLUMN = "M"
+DATA_HEADER = ["날짜", "전체대수", "고장대수", "고장률(%)", "가동률(%)"]
+# 설비 정보가 없을 때 사용하는 전체 설비 대수
+DEFAULT_TOTAL_MACHINES = 800
+STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'config', 'operation_rate_state.json')
+
+_SHEET_EPOCH = datetime(1899, 12, 30)
+_YMD_PATTERN = re.compile(r'^\s*(\d{4})\s*[./-]\s*(\d{1,2})\s*[./-]\s*(\d{1,2})')
+_MDY_PATTERN = re.compile(r'^\s*(\d{1,2})/(\d{1,2})/(\d{4})')
+_INVALID_DATE = date(1970, 1, 1)
+
+
+def parse_form_date(value):
+    """
+    폼 응답의 날짜 셀 값을 날짜로 변환합니다.
+    시트 날짜 일련번호, 'YYYY/MM/DD', 'YYYY-MM-DD', 'YYYY. M. D', 'M/D/YYYY' 형식을 지원하며
+    변환할 수 없거나 1970/01/01 인 값은 None 을 반환합니다.
+    """
+    if value is None or value == '':
+        return None
+    parsed = None
+    if isinstance(value, datetime):
+        parsed = value.date()
+    elif isinstance(value, date):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = (_SHEET_EPOCH + timedelta(days=float(value))).date()
+    else:
+        text = str(value)
+        match = _YMD_PATTERN.match(text)
+        try:
+            if match:
+                parsed = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            else:
+                match = _MDY_PATTERN.match(text)
+                if match:
+                    parsed = date(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+        except ValueError:
+            parsed = None
+    if parsed == _INVALID_DATE:
+        return None
+    return parsed
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def build_fleet_size_lookup(equipment_rows, default=DEFAULT_TOTAL_MACHINES):
+    """
+    설비 목록의 설치일로 일자별 전체 설비 대수를 구하는 함수를 반환합니다.
+
+    Args:
+        equipment_rows (list): 설비 목록 (installation_date 포함)
+        default (int): 설비 목록이 비어 있을 때 사용할 대수
+
+    Returns:
+        callable: 날짜 → 설비 대수
+    """
+    if not equipment_rows:
+        return lambda day: default
+
+    total = len(equipment_rows)
+    installed = sorted(d for d in (_to_date(row.get('installation_date')) for row in equipment_rows) if d)
+    undated = total - len(installed)
+
+    def fleet_size(day):
+        size = undated + bisect_right(installed, day)
+        # 설치일이 실제 도입일보다 늦게 기록된 경우 현재 대수로 계산합니다.
+        return size or total
+
+    return fleet_size
+
+
+class OperationRateEngine:
+    """일별 고장 건수를 증분 집계하고 DATA 시트 출력을 만듭니다."""
+
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = state_path
+        self.daily_faults = {}
+        # 마지막으로 처리한 시트 행 번호 (1 = 헤더)와 그 행의 날짜 셀 값
+        self.last_row = 1
+        self.last_value = None
+        self.written_rows = 0
+        self._lock = threading.Lock()
+        self.load_state()
+
+    def load_state(self):
+        """저장된 집계 상태를 불러옵니다."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.daily_faults = {date.fromisoformat(k): v for k, v in state.get('daily_faults', {}).items()}
+            self.last_row = state.get('last_row', 1)
+            self.last_value = state.get('last_value')
+            self.written_rows = state.get('written_rows', 0)
+        except Exception as e:
+            print(f"가동률 상태 파일 읽기 오류: {e}")
+            self.reset()
+
+    def save_state(self):
+        """집계 상태를 저장합니다."""
+        if not self.state_path:
+            return
+        state = {
+            'daily_faults': {k.isoformat(): v for k, v in sorted(self.daily_faults.items())},
+            'last_row': self.last_row,
+            'last_value': self.last_value,
+            'written_rows': self.written_rows,
+        }
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def reset(self):
+        """집계를 초기화하여 다음 동기화 때 전체 시트를 다시 읽도록 합니다."""
+        self.daily_faults = {}
+        self.last_row = 1
+        self.last_value = None
+
+    def apply_values(self, values, first_row):
+        """
+        시트에서 읽은 날짜 컬럼 값을 집계에 반영합니다.
+
+        Args:
+            values (list): 날짜 컬럼 값 목록 (행별 1칸 목록)
+            first_row (int): values[0] 의 시트 행 번호
+        """
+        for offset, row in enumerate(values):
+            cell = row[0] if row else ''
+            day = parse_form_date(cell)
+            if day is not None:
+                self.daily_faults[day] = self.daily_faults.get(day, 0) + 1
+            self.last_row = first_row + offset
+            self.last_value = cell
+
+    def fetch_new_rows(self, credentials, spreadsheet_id):
+        """
+        마지막 처리 행 이후의 새 행만 읽어 집계에 반영합니다.
+        마지막 처리 행의 값이 바뀌었으면(행 삭제/정렬) 전체를 다시 읽습니다.
+
+        Returns:
+            int: 새로 처리한 행 수 (읽기 실패 시 None)
+        """
+        from utils.google_sheet import get_sheet_values
+
+        # 마지막 처리 행부터 읽어 첫 값으로 시트 변경 여부를 확인합니다.
+        start_row = max(self.last_row, 2)
+        values = get_sheet_values(credentials, spreadsheet_id,
+                                  f"'{SOURCE_SHEET}'!{DATE_COLUMN}{start_row}:{DATE_COLUMN}")
+        if values is None:
+            return None
+
+        if self.last_row >= 2:
+            current = (values[0][0] if values and values[0] else '')
+            if current != self.last_value:
+                self.reset()
+                return self.fetch_new_rows(credentials, spreadsheet_id)
+            values = values[1:]
+            start_row += 1
+
+        self.apply_values(values, start_row)
+        return len(values)
+
+    def build_output(self, fleet_size=None):
+        """DATA 시트에 기록할 표 (헤더 포함)를 날짜순으로 만듭니다."""
+        fleet_size = fleet_size or (lambda day: DEFAULT_TOTAL_MACHINES)
+        output = [list(DATA_HEADER)]
+        for day in sorted(self.daily_faults):
+            faults = self.daily_faults[day]
+            total = fleet_size(day)
+            failure_rate = faults / total if total else 0.0
+            output.append([
+                day.strftime('%Y/%m/%d'),
+                total,
+                faults,
+                f"{failure_rate:.1%}",
+                f"{1 - failure_rate:.1%}",
+            ])
+        return output
+
+    def write_data_sheet(self, credentials, spreadsheet_id, output):
+        """DATA 시트를 한 번의 업데이트 요청으로 기록합니다. 이전보다 행이 줄면 남는 행을 비웁니다."""
+        from utils.google_sheet import update_sheet_data
+
+        values = [list(row) for row in output]
+        if self.written_rows > len(values):
+            values.extend([[''] * len(DATA_HEADER) for _ in range(self.written_rows - len(values))])
+        range_name = f"'{TARGET_SHEET}'!A1:E{len(values)}"
+        if update_sheet_data(credentials, spreadsheet_id, range_name, values):
+            self.written_rows = len(output)
+            return True
+        return False
+
+    def sync(self, credentials, spreadsheet_id, equipment_rows=None, write=True):
+        """
+        새 응답을 반영하고 DATA 시트를 갱신합니다.
+
+        Args:
+            credentials: Google API 인증 정보
+            spreadsheet_id (str): 스프레드시트 ID
+            equipment_rows (list): 설비 목록 (None 이면 데이터베이스에서 조회)
+            write (bool): DATA 시트 기록 여부
+
+        Returns:
+            list: DATA 시트 출력 (헤더 포함). 시트 읽기에 실패하면 None
+        """
+        with self._lock:
+            if self.fetch_new_rows(credentials, spreadsheet_id) is None:
+                return None
+            if equipment_rows is None:
+                from utils.supabase_client import get_equipment_list
+                equipment_rows = get_equipment_list()
+            output = self.build_output(build_fleet_size_lookup(equipment_rows))
+            if write:
+                self.write_data_sheet(credentials, spreadsheet_id, output)
+            self.save_state()
+            return output
+
+
+_engine = None
+
+
+def get_operation_rate_engine():
+    """프로세스 전역에서 공유하는 가동률 엔진을 반환합니다."""
+    global _engine
+    if _engine is None:
+        _engine = OperationRateEngine()
+    return _engine
+
+
+def update_operation_rates(credentials, spreadsheet_id, write=True):
+    """새 폼 응답을 반영하여 DATA 시트의 일별 가동률을 갱신합니다."""
+    return get_operation_rate_engine().sync(credentials, spreadsheet_id, write=write)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="일별 가동률 DATA 시트 갱신")
+    parser.add_argument('--spreadsheet-id', required=True, help="스프레드시트 ID")
+    parser.add_argument('--credentials', required=True, help="서비스 계정 JSON 키 파일")
+    parser.add_argument('--full', action='store_true', help="저장된 상태를 무시하고 전체 다시 계산")
+    parser.add_argument('--dry-run', action='store_true', help="DATA 시트에 기록하지 않고 출력만 표시")
+    args = parser.parse_args(argv)
+
+    from google.oauth2.service_account import Credentials
+    credentials = Credentials.from_service_account_file(
+        args.credentials, scopes=['https://www.googleapis.com/auth/spreadsheets']
+    )
+
+    engine = get_operation_rate_engine()
+    if args.full:
+        engine.reset()
+    output = engine.sync(credentials, args.spreadsheet_id, write=not args.dry_run)
+    if output is None:
+        print("시트를 읽지 못했습니다.")
+        return 1
+    for row in output[-10:]:
+        print('\t'.join(str(value) for value in row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,319 @@
+"""
+설비 신뢰성 지표 서비스
+- 설비/건물/설비 유형별 MTBF, MTTR, 가동률, 고장률을 임의 기간으로 계산
+- 일별 누적 행렬에 이동 합계를 적용해 기간별(rolling) 추이를 한 번에 계산
+- 모든 집계는 pandas groupby / NumPy 배열 연산으로 수행 (행 단위 Python 반복 없음)
+
+지표 정의:
+- 계획 시간 = 관측 시간(설치일 이후) - 설비 정지 시간(예방정비/모델 교체/자재 대기/계획 정지)
+- 고장 정지 시간 = 고장 이력의 수리 시간 합계
+- MTBF(시간) = (계획 시간 - 고장 정지 시간) / 고장 건수
+- MTTR(분) = 고장 정지 시간 / 고장 건수
+- 가동률(%) = (계획 시간 - 고장 정지 시간) / 계획 시간 * 100
+- 고장률 = 가동 1,000 시간당 고장 건수
+
+사용 예:
+    python -m services.reliability_service --sqlite data/bench.db --by building --days 90
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.query_cache import query_cache
+
+# 그룹 기준 (설비 목록 컬럼)
+RELIABILITY_GROUPS = ('equipment_number', 'building', 'equipment_type')
+# 설비 목록에 없는 설비 번호의 건물/유형 값
+UNKNOWN_GROUP = '미등록'
+# 고장률 기준 가동 시간
+FAILURE_RATE_HOURS = 1000
+# 이동 집계 기본 기간(일)
+DEFAULT_ROLLING_DAYS = 30
+
+RELIABILITY_TABLES = ('equipment', 'error_history', 'equipment_stops')
+METRIC_COLUMNS = ['machines', 'failures', 'observed_hours', 'scheduled_hours', 'repair_minutes',
+                  'mtbf_hours', 'mttr_minutes', 'availability', 'failure_rate']
+
+_MINUTE = np.timedelta64(1, 'm')
+
+
+def _frame(data, columns):
+    """딕셔너리 목록 또는 데이터프레임을 지정 컬럼의 데이터프레임으로 변환합니다 (없는 컬럼은 NaN)."""
+    if isinstance(data, pd.DataFrame):
+        return data.reindex(columns=columns)
+    return pd.DataFrame.from_records(list(data or []), columns=columns)
+
+
+def _timestamps(values):
+    """
+    시간대 정보를 제거한 UTC 기준 datetime64 시리즈로 변환합니다.
+    시간대가 없는 값과 오프셋이 있는 값이 섞여 있어도 모두 UTC 로 맞춘 뒤 시간대를 제거합니다.
+    """
+    return pd.to_datetime(pd.Series(values), errors='coerce', utc=True).dt.tz_convert(None)
+
+
+def prepare_equipment(equipment, errors=None):
+    """
+    설비 목록을 설비 번호 인덱스의 데이터프레임으로 정리합니다.
+    고장 이력에만 있는 설비 번호도 건물/유형을 '미등록'으로 추가합니다.
+
+    Returns:
+        pandas.DataFrame: index=equipment_number, columns=[building, equipment_type, installed]
+    """
+    df = _frame(equipment, ['equipment_number', 'building', 'equipment_type', 'installation_date'])
+    df = df.dropna(subset=['equipment_number'])
+    df['equipment_number'] = df['equipment_number'].astype(str)
+    df = df.drop_duplicates('equipment_number', keep='last').set_index('equipment_number')
+    df['installed'] = _timestamps(df.pop('installation_date'))
+
+    if errors is not None and len(errors):
+        extra = pd.Index(errors['equipment_number'].dropna().unique()).difference(df.index)
+        if len(extra):
+            df = pd.concat([df, pd.DataFrame(index=extra)])
+    df[['building', 'equipment_type']] = df[['building', 'equipment_type']].fillna(UNKNOWN_GROUP)
+    return df
+
+
+def prepare_errors(errors):
+    """고장 이력을 (equipment_number, timestamp, repair_time) 데이터프레임으로 정리합니다."""
+    df = _frame(errors, ['equipment_number', 'timestamp', 'repair_time'])
+    df['equipment_number'] = df['equipment_number'].where(df['equipment_number'].isna(),
+                                                          df['equipment_number'].astype(str))
+    df['timestamp'] = _timestamps(df['timestamp'])
+    df['repair_time'] = pd.to_numeric(df['repair_time'], errors='coerce').fillna(0).clip(lower=0)
+    return df.dropna(subset=['equipment_number', 'timestamp'])
+
+
+def prepare_stops(stops):
+    """설비 정지 이력을 (equipment_number, start_time, end_time) 데이터프레임으로 정리합니다."""
+    df = _frame(stops, ['equipment_number', 'start_time', 'end_time', 'duration_minutes'])
+    df['equipment_number'] = df['equipment_number'].where(df['equipment_number'].isna(),
+                                                          df['equipment_number'].astype(str))
+    df['start_time'] = _timestamps(df['start_time'])
+    df['end_time'] = _timestamps(df['end_time'])
+    # 종료 시각이 없으면 정지 시간(분)으로 계산합니다.
+    duration = pd.to_timedelta(pd.to_numeric(df.pop('duration_minutes'), errors='coerce'), unit='m')
+    df['end_time'] = df['end_time'].fillna(df['start_time'] + duration)
+    df = df.dropna(subset=['equipment_number', 'start_time', 'end_time'])
+    return df[df['end_time'] > df['start_time']]
+
+
+def _add_metrics(df):
+    """합계 컬럼으로 MTBF/MTTR/가동률/고장률을 계산해 추가합니다."""
+    failures = df['failures'].to_numpy(dtype=float)
+    scheduled = df['scheduled_hours'].to_numpy(dtype=float)
+    repair_hours = np.minimum(df['repair_minutes'].to_numpy(dtype=float) / 60, scheduled)
+    uptime = scheduled - repair_hours
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['mtbf_hours'] = np.where(failures > 0, uptime / failures, np.nan)
+        df['mttr_minutes'] = np.where(failures > 0, repair_hours * 60 / failures, np.nan)
+        df['availability'] = np.where(scheduled > 0, uptime / scheduled * 100, np.nan)
+        df['failure_rate'] = np.where(uptime > 0, failures / uptime * FAILURE_RATE_HOURS, np.nan)
+    return df
+
+
+def compute_reliability(equipment, errors, stops, start, end, by='equipment_number'):
+    """
+    기간 [start, end) 의 신뢰성 지표를 그룹별로 계산합니다.
+    그룹 지표는 설비별 합계(고장 건수, 계획 시간, 수리 시간)를 더한 뒤 계산하므로
+    설비별 평균의 평균이 아닌 실제 전체 기준 값입니다.
+
+    Args:
+        equipment: 설비 목록 (equipment_number, building, equipment_type, installation_date)
+        errors: 고장 이력 (equipment_number, timestamp, repair_time)
+        stops: 설비 정지 이력 (equipment_number, start_time, end_time, duration_minutes)
+        start, end: 조회 기간 (datetime 또는 문자열)
+        by (str): 'equipment_number', 'building', 'equipment_type' 또는 None (전체)
+
+    Returns:
+        pandas.DataFrame: 그룹별 METRIC_COLUMNS
+    """
+    if by is not None and by not in RELIABILITY_GROUPS:
+        raise ValueError(f"지원하지 않는 그룹 기준입니다: {by}")
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+
+    errors = prepare_errors(errors)
+    errors = errors[(errors['timestamp'] >= start) & (errors['timestamp'] < end)]
+    machines = prepare_equipment(equipment, errors)
+
+    # 관측 시간: 설치일 이후 구간만 포함합니다 (설치일이 없으면 기간 전체).
+    begin = machines['installed'].fillna(start).clip(lower=start)
+    observed = ((end - begin) / np.timedelta64(1, 'h')).clip(lower=0)
+
+    # 설비 정지 시간: 기간과 겹치는 부분만 분 단위로 합산합니다.
+    stops = prepare_stops(stops)
+    overlap = (stops['end_time'].clip(upper=end) - stops['start_time'].clip(lower=start)) / _MINUTE
+    stop_minutes = overlap[overlap > 0].groupby(stops['equipment_number']).sum()
+
+    per_machine = pd.DataFrame({
+        'building': machines['building'],
+        'equipment_type': machines['equipment_type'],
+        'machines': 1,
+        'failures': errors.groupby('equipment_number').size(),
+        'observed_hours': observed,
+        'stop_minutes': stop_minutes,
+        'repair_minutes': errors.groupby('equipment_number')['repair_time'].sum(),
+    }, index=machines.index).fillna({'failures': 0, 'stop_minutes': 0, 'repair_minutes': 0})
+    per_machine['scheduled_hours'] = (
+        per_machine['observed_hours'] - per_machine['stop_minutes'] / 60
+    ).clip(lower=0)
+    per_machine.index.name = 'equipment_number'
+
+    sums = ['machines', 'failures', 'observed_hours', 'scheduled_hours', 'repair_minutes']
+    if by is None:
+        result = per_machine[sums].sum().to_frame().T
+    elif by == 'equipment_number':
+        result = per_machine[sums]
+    else:
+        result = per_machine.groupby(by)[sums].sum()
+    result = result.astype({'machines': int, 'failures': int})
+    return _add_metrics(result.copy())[METRIC_COLUMNS]
+
+
+def _daily_stop_minutes(stops, days, groups):
+    """정지 구간을 날짜 경계로 나눠 일자 × 그룹별 정지 시간(분) 행렬을 만듭니다."""
+    if stops.empty:
+        return pd.DataFrame(0.0, index=days, columns=groups)
+    first = stops['start_time'].dt.floor('D')
+    spans = np.maximum(np.ceil((stops['end_time'] - first) / np.timedelta64(1, 'D')).to_numpy(), 1).astype(int)
+    repeat = np.repeat(np.arange(len(stops)), spans)
+    # 각 정지 구간 안에서의 일자 순번 (0, 1, ...)
+    offset = np.arange(len(repeat)) - np.repeat(np.cumsum(spans) - spans, spans)
+    day = first.to_numpy()[repeat] + offset.astype('timedelta64[D]')
+    begin = np.maximum(stops['start_time'].to_numpy()[repeat], day)
+    finish = np.minimum(stops['end_time'].to_numpy()[repeat], day + np.timedelta64(1, 'D'))
+    pieces = pd.DataFrame({
+        'day': day,
+        'group': stops['group'].to_numpy()[repeat],
+        'minutes': (finish - begin) / _MINUTE,
+    })
+    return pieces.pivot_table(index='day', columns='group', values='minutes', aggfunc='sum') \
+        .reindex(index=days, columns=groups, fill_value=0).fillna(0)
+
+
+def rolling_reliability(equipment, errors, stops, start, end, window_days=DEFAULT_ROLLING_DAYS, by=None):
+    """
+    [start, end) 의 각 날짜에 대해 직전 window_days 일 신뢰성 지표를 계산합니다.
+    일자 × 그룹 합계 행렬을 만든 뒤 이동 합계를 적용하므로 기간 수와 관계없이 집계는 한 번입니다.
+    (설치일은 일 단위로 반영합니다.)
+
+    Args:
+        equipment, errors, stops: compute_reliability 와 같음
+        start, end: 결과 날짜 범위
+        window_days (int): 이동 집계 기간(일)
+        by (str): 그룹 기준 (None 이면 전체)
+
+    Returns:
+        pandas.DataFrame: date, group 과 METRIC_COLUMNS
+    """
+    if by is not None and by not in RELIABILITY_GROUPS:
+        raise ValueError(f"지원하지 않는 그룹 기준입니다: {by}")
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end)
+    # 첫 날짜의 이동 기간을 채우기 위해 window_days 일 앞부터 집계합니다.
+    begin = start - pd.Timedelta(days=window_days - 1)
+    days = pd.date_range(begin, end - pd.Timedelta(microseconds=1), freq='D').normalize()
+
+    errors = prepare_errors(errors)
+    errors = errors[(errors['timestamp'] >= begin) & (errors['timestamp'] < end)]
+    machines = prepare_equipment(equipment, errors)
+    if by is None:
+        group_of = pd.Series('all', index=machines.index)
+    elif by == 'equipment_number':
+        group_of = pd.Series(machines.index, index=machines.index)
+    else:
+        group_of = machines[by]
+    groups = pd.Index(group_of.unique())
+
+    def daily(frame, time_column, value=None):
+        keys = [frame[time_column].dt.floor('D'), frame['equipment_number'].map(group_of)]
+        grouped = (frame.groupby(keys).size() if value is None else frame.groupby(keys)[value].sum())
+        return grouped.unstack(fill_value=0).reindex(index=days, columns=groups, fill_value=0).fillna(0)
+
+    failures = daily(errors, 'timestamp')
+    repair = daily(errors, 'timestamp', 'repair_time')
+
+    # 일별 설치 대수 → 누적 합계로 일자별 관측 설비 수
+    installed = machines['installed'].fillna(begin).clip(lower=begin).dt.floor('D')
+    counts = pd.crosstab(installed, group_of).reindex(columns=groups, fill_value=0)
+    fleet = counts.reindex(days.union(counts.index), fill_value=0).cumsum().reindex(days).fillna(0)
+
+    stops = prepare_stops(stops)
+    stops = stops[(stops['end_time'] > begin) & (stops['start_time'] < end)].copy()
+    stops['start_time'] = stops['start_time'].clip(lower=begin)
+    stops['end_time'] = stops['end_time'].clip(upper=end)
+    stops['group'] = stops['equipment_number'].map(group_of)
+    stop_minutes = _daily_stop_minutes(stops.dropna(subset=['group']), days, groups)
+
+    def rolling(matrix):
+        return matrix.rolling(window_days, min_periods=1).sum().loc[start:]
+
+    observed = rolling(fleet * 24)
+    totals = {
+        'machines': fleet.loc[start:],
+        'failures': rolling(failures),
+        'observed_hours': observed,
+        'scheduled_hours': (observed - rolling(stop_minutes) / 60).clip(lower=0),
+        'repair_minutes': rolling(repair),
+    }
+    result = pd.concat({name: matrix.stack() for name, matrix in totals.items()}, axis=1)
+    result.index.names = ['date', 'group']
+    result = result.reset_index()
+    result = result.astype({'machines': int, 'failures': int})
+    return _add_metrics(result)[['date', 'group'] + METRIC_COLUMNS]
+
+
+def load_reliability_frames(start, end):
+    """
+    기간 [start, end) 의 설비/고장/정지 데이터를 불러옵니다.
+    저장소가 설정되지 않은 경우 None 을 반환합니다.
+    """
+    from utils.supabase_client import supabase, get_equipment_list, _select_range, _fetch_all_pages
+    if not supabase:
+        return None
+
+    start, end = pd.Timestamp(start).isoformat(), pd.Timestamp(end).isoformat()
+    errors = query_cache.get_or_load(
+        'error_history', ('reliability', start, end),
+        lambda: _select_range('error_history', 'timestamp,equipment_number,repair_time', start, end)
+    )
+    # 기간과 겹치는 정지 이력 (기간 이전에 시작해 기간 중에 끝난 정지 포함, 페이지 단위 조회)
+    stops = query_cache.get_or_load(
+        'equipment_stops', ('reliability', start, end),
+        lambda: _fetch_all_pages(
+            lambda: supabase.table('equipment_stops')
+            .select('id,equipment_number,start_time,end_time,duration_minutes')
+            .lt('start_time', end).gt('end_time', start)
+        )
+    )
+    return get_equipment_list(), errors, stops
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="설비 신뢰성 지표(MTBF/MTTR/가동률) 계산")
+    parser.add_argument('--sqlite', help="SQLite 데이터 파일 (벤치마크 데이터 생성기 출력)")
+    parser.add_argument('--by', choices=RELIABILITY_GROUPS, default='building', help="그룹 기준")
+    parser.add_argument('--days', type=int, default=30, help="최근 기간(일)")
+    parser.add_argument('--end', help="기간 종료일 (YYYY-MM-DD, 기본값: 오늘)")
+    args = parser.parse_args(argv)
+
+    end = datetime.strptime(args.end, '%Y-%m-%d') if args.end else datetime.now()
+    start = end - timedelta(days=args.days)
+    if args.sqlite:
+        import sqlite3
+        with sqlite3.connect(args.sqlite) as conn:
+            frames = [pd.read_sql_query(f"SELECT * FROM {table}", conn) for table in RELIABILITY_TABLES]
+    else:
+        frames = load_reliability_frames(start, end)
+        if frames is None:
+            parser.error("저장소가 설정되지 않았습니다. --sqlite 로 데이터 파일을 지정하세요.")
+
+    result = compute_reliability(*frames, start, end, by=args.by)
+    with pd.option_context('display.max_rows', 100, 'display.width', 160):
+        print(result.round(2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+구글 폼 응답 시트 → error_history 증분 동기화 서비스
+- 스프레드시트별 마지막 가져온 행 번호와 타임스탬프를 JSON 상태 파일에 저장
+- 마지막 행 이후의 새 응답만 분할해 읽기
+- 응답 내용으로 만든 결정적 id(uuid5)로 중복 제거 후 일괄 upsert
+
+사용 예:
+    python -m services.sheet_sync_service --spreadsheet-id <ID> --credentials service_account.json
+"""
+
+import argparse
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+FORM_SHEET = "설문지 응답 시트1"
+
+# 폼 응답 시트 헤더 → error_history 컬럼
+# 폼 질문 문구가 바뀌면 이 매핑만 수정합니다.
+FORM_COLUMN_MAP = {
+    '타임스탬프': 'timestamp',
+    '설비번호': 'equipment_number',
+    '오류코드': 'error_code',
+    '고장내용': 'error_detail',
+    '수리시간': 'repair_time',
+    '조치내용': 'repair_method',
+    '작업자': 'worker',
+    '관리자': 'supervisor',
+    '날자': 'date',
+}
+
+# 읽기 시 적용할 컬럼 타입
+FORM_SCHEMA = {
+    '타임스탬프': 'datetime',
+    '날자': 'date',
+    '설비번호': 'category',
+    '오류코드': 'category',
+    '수리시간': 'int',
+    '작업자': 'category',
+    '관리자': 'category',
+}
+
+# 응답 id 생성용 네임스페이스 (변경하면 기존 행과 중복 판단이 달라짐)
+FORM_RESPONSE_NAMESPACE = uuid.UUID('6f1c2a4e-3b7d-5e8f-9a0b-1c2d3e4f5a6b')
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'config', 'sheet_sync_state.json')
+SYNC_CHUNK_ROWS = 2000
+
+_state_lock = threading.RLock()
+
+
+def load_sync_state(path=STATE_PATH):
+    """스프레드시트별 동기화 위치를 불러옵니다."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"동기화 상태 파일 읽기 오류: {e}")
+        return {}
+
+
+def save_sync_state(state, path=STATE_PATH):
+    """동기화 위치를 저장합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _state_key(spreadsheet_id, sheet_name):
+    return f"{spreadsheet_id}:{sheet_name}"
+
+
+def _timestamp_text(value):
+    return value.isoformat() if isinstance(value, (datetime, pd.Timestamp)) and not pd.isna(value) else None
+
+
+def form_frame_to_records(df):
+    """
+    폼 응답 데이터프레임을 error_history 행 목록으로 변환합니다.
+    타임스탬프나 설비 번호가 없는 응답은 제외하고, 같은 응답은 하나만 남깁니다.
+
+    Returns:
+        list: error_history 행 목록
+    """
+    from utils.supabase_client import get_serials_by_equipment_numbers
+
+    frame = df.rename(columns=FORM_COLUMN_MAP)
+    frame = frame[[column for column in FORM_COLUMN_MAP.values() if column in frame.columns]].copy()
+    if 'timestamp' not in frame.columns:
+        frame['timestamp'] = pd.NaT
+    if 'date' in frame.columns:
+        # 타임스탬프가 비어 있으면 폼의 날짜 값을 사용합니다.
+        frame['timestamp'] = frame['timestamp'].fillna(frame.pop('date'))
+    if 'equipment_number' not in frame.columns:
+        return []
+
+    frame = frame[frame['timestamp'].notna() & frame['equipment_number'].notna()]
+    if frame.empty:
+        return []
+
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(object)
+    if 'repair_time' in frame.columns:
+        frame['repair_time'] = frame['repair_time'].fillna(0).astype(int)
+    else:
+        frame['repair_time'] = 0
+    frame['timestamp'] = frame['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    frame = frame.astype(object).where(frame.notna(), None)
+
+    key_columns = [c for c in ('timestamp', 'equipment_number', 'error_code', 'worker') if c in frame.columns]
+    keys = frame[key_columns].astype(str).agg('|'.join, axis=1)
+    frame['id'] = [str(uuid.uuid5(FORM_RESPONSE_NAMESPACE, key)) for key in keys]
+    frame = frame.drop_duplicates('id')
+
+    serials = get_serials_by_equipment_numbers(frame['equipment_number'].unique().tolist())
+    frame['serial_number'] = frame['equipment_number'].map(serials)
+    return frame.to_dict('records')
+
+
+def sync_form_responses(credentials, spreadsheet_id, sheet_name=FORM_SHEET,
+                        chunk_rows=SYNC_CHUNK_ROWS, state_path=STATE_PATH, full=False, progress=None):
+    """
+    마지막으로 가져온 행 이후의 폼 응답을 error_history 에 일괄 저장합니다.
+    같은 응답은 같은 id 를 가지므로 다시 실행해도 중복 저장되지 않습니다.
+
+    Args:
+        credentials: Google API 인증 정보
+        spreadsheet_id (str): 스프레드시트 ID
+        sheet_name (str): 응답 시트 이름
+        chunk_rows (int): 한 번에 읽고 저장할 행 수
+        state_path (str): 동기화 상태 파일 경로
+        full (bool): True 면 처음부터 다시 동기화
+        progress (callable): 행 묶음 처리 후 호출 (summary 딕셔너리 인자)
+
+    Returns:
+        dict: {'read', 'inserted', 'last_row', 'last_timestamp', 'completed'}
+    """
+    from utils.google_sheet import iter_sheet_frames
+    from utils.supabase_client import bulk_upsert_data
+
+    with _state_lock:
+        state = load_sync_state(state_path)
+        key = _state_key(spreadsheet_id, sheet_name)
+        position = {} if full else dict(state.get(key, {}))
+        last_row = position.get('last_row', 1)
+
+        summary = {'read': 0, 'inserted': 0, 'last_row': last_row,
+                   'last_timestamp': position.get('last_timestamp'), 'completed': False}
+
+        # 마지막으로 가져온 행부터 읽어 시트 행이 삭제/정렬되지 않았는지 확인합니다.
+        start_row = max(last_row, 2)
+        verify = last_row >= 2
+        frames = iter_sheet_frames(credentials, spreadsheet_id, sheet_name, schema=FORM_SCHEMA,
+                                   columns=list(FORM_COLUMN_MAP), chunk_rows=chunk_rows, start_row=start_row)
+        for df in frames:
+            if verify:
+                verify = False
+                first_timestamp = df['타임스탬프'].iloc[0] if '타임스탬프' in df.columns else None
+                if _timestamp_text(first_timestamp) != position.get('last_timestamp'):
+                    print("폼 응답 시트가 변경되어 처음부터 다시 동기화합니다.")
+                    return sync_form_responses(credentials, spreadsheet_id, sheet_name, chunk_rows,
+                                               state_path, full=True, progress=progress)
+                df = df.iloc[1:]
+                if df.empty:
+                    continue
+
+            records = form_frame_to_records(df)
+            if records:
+                inserted = bulk_upsert_data('error_history', records)
+                if inserted is None:
+                    # 이 묶음부터 다음 실행에서 다시 시도합니다.
+                    return summary
+                summary['inserted'] += len(inserted)
+
+            summary['read'] += len(df)
+            summary['last_row'] = int(df.index[-1])
+            if '타임스탬프' in df.columns:
+                summary['last_timestamp'] = _timestamp_text(df['타임스탬프'].iloc[-1])
+            state[key] = {
+                'last_row': summary['last_row'],
+                'last_timestamp': summary['last_timestamp'],
+                'synced_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            save_sync_state(state, state_path)
+            if progress:
+                progress(dict(summary))
+
+        if verify:
+            # 마지막으로 가져온 행이 사라졌으면 (행 삭제) 처음부터 다시 동기화합니다.
+            print("폼 응답 시트가 변경되어 처음부터 다시 동기화합니다.")
+            return sync_form_responses(credentials, spreadsheet_id, sheet_name, chunk_rows,
+                                       state_path, full=True, progress=progress)
+
+        summary['completed'] = True
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="폼 응답 시트 → error_history 증분 동기화")
+    parser.add_argument('--spreadsheet-id', required=True, help="스프레드시트 ID")
+    parser.add_argument('--credentials', required=True, help="서비스 계정 JSON 키 파일")
+    parser.add_argument('--sheet', default=FORM_SHEET, help="응답 시트 이름")
+    parser.add_argument('--full', action='store_true', help="처음부터 다시 동기화")
+    args = parser.parse_args(argv)
+
+    from google.oauth2.service_account import Credentials
+    credentials = Credentials.from_service_account_file(
+        args.credentials, scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
+    )
+
+    summary = sync_form_responses(
+        credentials, args.spreadsheet_id, args.sheet, full=args.full,
+        progress=lambda s: print(f"  {s['last_row']}행까지 처리 (신규 {s['inserted']}건)")
+    )
+    print(f"읽은 행 {summary['read']}, 신규 저장 {summary['inserted']}, 마지막 행 {summary['last_row']}")
+    return 0 if summary['completed'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
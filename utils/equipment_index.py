@@ -0,0 +1,143 @@
+"""
+설비 검색 인덱스 모듈
+- 설비 번호, 시리얼 번호, 설비 유형, 건물, 상태를 미리 정규화해 정렬된 검색 키 목록으로 보관
+- 접두어 검색은 bisect 로 O(log n + 결과 수), 오타는 difflib 유사도 검색으로 보완
+- 선택 상자 format_func 용 표시 문자열을 미리 만들어 옵션당 O(1) 로 조회
+"""
+
+import difflib
+from bisect import bisect_left
+
+from utils.query_cache import query_cache
+from utils.serial_index import normalize_equipment_number
+
+# 검색 대상 필드 (앞쪽 필드가 일치하면 더 앞에 표시)
+SEARCH_FIELDS = ('equipment_number', 'serial_number', 'equipment_type', 'building', 'status')
+# 검색 결과 최대 개수
+SEARCH_LIMIT = 50
+# 유사도 검색 최소 점수 (0~1)
+FUZZY_CUTOFF = 0.6
+
+
+def _search_key(value):
+    """검색 키를 정규화합니다 (소문자, 공백/하이픈 제거)."""
+    return str(value).strip().lower().replace(' ', '').replace('-', '')
+
+
+class EquipmentSearchIndex:
+    """설비 목록을 접두어/유사도 검색하기 위한 메모리 인덱스입니다."""
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows (list): 설비 행 목록 (equipment_number 필수, 나머지 검색 필드는 선택)
+        """
+        self.numbers = []
+        self.rows = {}
+        self.labels = {}
+        keys = {}
+        for row in rows:
+            number = row.get('equipment_number')
+            if not number or number in self.rows:
+                continue
+            self.numbers.append(number)
+            self.rows[number] = row
+            detail = ', '.join(str(row[field]) for field in ('equipment_type', 'building') if row.get(field))
+            self.labels[number] = f"{number} ({detail})" if detail else str(number)
+
+            for rank, field in enumerate(SEARCH_FIELDS):
+                value = row.get(field)
+                if value in (None, ''):
+                    continue
+                values = [value]
+                if field == 'equipment_number':
+                    # '12', 'EQ012' 처럼 입력해도 찾을 수 있도록 정규화한 번호도 등록
+                    values.append(normalize_equipment_number(value))
+                for item in values:
+                    key = _search_key(item)
+                    if key:
+                        keys.setdefault(key, []).append((rank, number))
+
+        # 정렬된 검색 키와 키별 (필드 순위, 설비 번호) 목록
+        self._keys = sorted(keys)
+        self._postings = [keys[key] for key in self._keys]
+        self._positions = {number: i for i, number in enumerate(self.numbers)}
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, equipment_number):
+        return equipment_number in self.rows
+
+    def get(self, equipment_number):
+        """설비 번호의 행을 반환합니다. 없으면 None을 반환합니다."""
+        return self.rows.get(equipment_number)
+
+    def label(self, equipment_number):
+        """선택 상자에 표시할 문자열을 반환합니다 (format_func 용)."""
+        return self.labels.get(equipment_number, str(equipment_number))
+
+    def prefix_search(self, query):
+        """검색 키가 query 로 시작하는 설비를 (필드 순위, 설비 번호) 목록으로 반환합니다."""
+        prefix = _search_key(query)
+        if not prefix:
+            return []
+        matches = []
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix):
+            matches.extend(self._postings[i])
+            i += 1
+        return matches
+
+    def fuzzy_search(self, query, limit=SEARCH_LIMIT, cutoff=FUZZY_CUTOFF):
+        """오타가 있는 검색어와 비슷한 검색 키의 설비를 (필드 순위, 설비 번호) 목록으로 반환합니다."""
+        key = _search_key(query)
+        if not key:
+            return []
+        matches = []
+        for close in difflib.get_close_matches(key, self._keys, n=limit, cutoff=cutoff):
+            matches.extend(self._postings[bisect_left(self._keys, close)])
+        return matches
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        설비를 검색합니다.
+        접두어 일치를 먼저(필드 순위, 설비 목록 순) 반환하고, 결과가 부족하면 유사도 검색 결과를 덧붙입니다.
+
+        Args:
+            query (str): 검색어 (비어 있으면 전체 설비)
+            limit (int): 최대 결과 수
+
+        Returns:
+            list: 설비 번호 목록
+        """
+        if not query or not _search_key(query):
+            return self.numbers[:limit]
+
+        prefix_matches = sorted(self.prefix_search(query), key=lambda m: (m[0], self._positions[m[1]]))
+        result = list(dict.fromkeys(number for _, number in prefix_matches))[:limit]
+        if len(result) < limit:
+            seen = set(result)
+            for _, number in self.fuzzy_search(query, limit):
+                if number not in seen:
+                    seen.add(number)
+                    result.append(number)
+                    if len(result) >= limit:
+                        break
+        return result
+
+
+def get_equipment_index(load_rows, key=()):
+    """
+    설비 목록의 검색 인덱스를 반환합니다.
+    인덱스 자체를 조회 캐시의 equipment 테이블 항목으로 저장하므로 TTL 만료나 설비 쓰기 시에만 다시 만들고,
+    그 사이에는 모든 세션이 같은 인덱스를 공유합니다.
+
+    Args:
+        load_rows (callable): 설비 행 목록을 반환하는 함수
+        key (tuple): 목록 출처를 구분하는 추가 캐시 키 (예: 예시 데이터 언어)
+    """
+    return query_cache.get_or_load(
+        'equipment', ('search_index',) + tuple(key),
+        lambda: EquipmentSearchIndex(load_rows())
+    )
@@ -1,20 +1,99 @@
+import threading
+from collections import OrderedDict
+import httplib2
 import pandas as pd
+from pandas.api.types import union_categoricals
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from datetime import datetime
 
+# 한 번의 append 요청으로 보낼 최대 행 수
+APPEND_CHUNK_SIZE = 5000
+# 분할 읽기 시 한 번에 가져올 행 수
+READ_CHUNK_ROWS = 5000
+
+# 시트 날짜 일련번호의 기준일
+SHEET_EPOCH = '1899-12-30'
+
+# 프로세스 전역에 보관하는 서비스 객체 수 (인증 주체별)
+SERVICE_CACHE_SIZE = 32
+
+# 인증 정보별 서비스 객체 캐시 (프로세스 전역, 모든 세션/재실행이 공유)
+_service_cache = OrderedDict()
+_service_lock = threading.Lock()
+# httplib2 연결은 스레드 간에 공유할 수 없으므로 요청에 쓰는 http 객체는 스레드마다 따로 보관합니다.
+_thread_http = threading.local()
+
+def _credentials_key(credentials):
+    """
+    인증 주체가 같은 인증 정보를 같은 키로 묶습니다.
+    서비스 계정은 (이메일, 위임 대상 사용자, 범위), OAuth 사용자 인증은 (client_id, refresh_token 또는 token, 범위)로
+    구분하고, 식별 정보가 없으면 인증 정보 객체 자체를 키로 사용합니다.
+    """
+    principal = getattr(credentials, 'service_account_email', None) or getattr(credentials, 'client_id', None)
+    if not principal:
+        return (type(credentials).__name__, id(credentials))
+    secret = None
+    if not getattr(credentials, 'service_account_email', None):
+        # 서비스 계정의 token 은 갱신 때마다 바뀌므로 OAuth 사용자 인증에만 사용합니다.
+        secret = getattr(credentials, 'refresh_token', None) or getattr(credentials, 'token', None)
+    return (
+        type(credentials).__name__,
+        principal,
+        getattr(credentials, '_subject', None),
+        secret,
+        tuple(sorted(getattr(credentials, 'scopes', None) or ()))
+    )
+
 def get_service(credentials):
-    """Google Sheets API 서비스 객체를 생성합니다."""
-    return build('sheets', 'v4', credentials=credentials)
+    """Google Sheets API 서비스 객체를 반환합니다. 인증 정보별로 프로세스에서 한 번만 생성합니다."""
+    key = _credentials_key(credentials)
+    with _service_lock:
+        service = _service_cache.get(key)
+        if service is not None:
+            _service_cache.move_to_end(key)
+            return service
+    service = build('sheets', 'v4', credentials=credentials)
+    with _service_lock:
+        service = _service_cache.setdefault(key, service)
+        _service_cache.move_to_end(key)
+        while len(_service_cache) > SERVICE_CACHE_SIZE:
+            _service_cache.popitem(last=False)
+    return service
+
+def _authorized_http(credentials):
+    """현재 스레드 전용 인증 http 객체를 반환합니다."""
+    https = getattr(_thread_http, 'https', None)
+    if https is None:
+        https = _thread_http.https = {}
+    key = _credentials_key(credentials)
+    http = https.get(key)
+    if http is None:
+        http = https[key] = AuthorizedHttp(credentials, http=httplib2.Http())
+    return http
+
+def _execute(request, credentials):
+    """API 요청을 현재 스레드 전용 http 객체로 실행합니다 (서비스 객체는 스레드 간에 공유)."""
+    return request.execute(http=_authorized_http(credentials))
+
+def clear_service_cache():
+    """서비스 객체 캐시와 현재 스레드의 http 객체를 비웁니다."""
+    with _service_lock:
+        _service_cache.clear()
+    _thread_http.https = {}
 
-def get_sheet_data(credentials, spreadsheet_id, range_name):
-    """구글 시트에서 데이터를 가져옵니다."""
+class SheetReadError(Exception):
+    """시트 범위를 읽지 못했을 때 발생하는 예외입니다."""
+
+def get_sheet_data(credentials, spreadsheet_id, range_name, schema=None):
+    """구글 시트에서 데이터를 가져옵니다. schema 를 지정하면 컬럼 타입을 변환합니다."""
     try:
         service = get_service(credentials)
-        result = service.spreadsheets().values().get(
+        result = _execute(service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id,
             range=range_name
-        ).execute()
+        ), credentials)
         
         values = result.get('values', [])
         if not values:
@@ -22,31 +101,132 @@ def get_sheet_data(credentials, spreadsheet_id, range_name):
         
         # 첫 번째 행을 컬럼으로 사용하여 DataFrame 생성
         df = pd.DataFrame(values[1:], columns=values[0])
+        if schema:
+            df = apply_sheet_schema(df, schema)
         return df
     
     except Exception as e:
         print(f"Error fetching sheet data: {e}")
         return pd.DataFrame()
 
-def append_sheet_data(credentials, spreadsheet_id, range_name, values):
-    """구글 시트에 데이터를 추가합니다."""
+def get_sheet_values(credentials, spreadsheet_id, range_name,
+                     value_render_option='UNFORMATTED_VALUE', date_time_render_option='SERIAL_NUMBER'):
+    """구글 시트의 지정 범위 값을 헤더 처리 없이 2차원 목록으로 가져옵니다."""
+    try:
+        service = get_service(credentials)
+        result = _execute(service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=range_name,
+            valueRenderOption=value_render_option,
+            dateTimeRenderOption=date_time_render_option
+        ), credentials)
+        
+        return result.get('values', [])
+    
+    except Exception as e:
+        print(f"Error fetching sheet values: {e}")
+        return None
+
+def get_sheet_row_count(credentials, spreadsheet_id, sheet_name):
+    """시트의 전체 행 수(gridProperties.rowCount)를 가져옵니다. 오류 시 None"""
+    try:
+        service = get_service(credentials)
+        result = _execute(service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets(properties(title,gridProperties(rowCount)))'
+        ), credentials)
+        
+        for sheet in result.get('sheets', []):
+            properties = sheet.get('properties', {})
+            if properties.get('title') == sheet_name:
+                return properties.get('gridProperties', {}).get('rowCount')
+        return None
+    
+    except Exception as e:
+        print(f"Error fetching sheet properties: {e}")
+        return None
+
+def batch_get_sheet_values(credentials, spreadsheet_id, ranges,
+                           value_render_option='FORMATTED_VALUE', date_time_render_option='SERIAL_NUMBER'):
+    """
+    여러 범위의 값을 한 번의 요청으로 가져옵니다.
+
+    Args:
+        credentials: Google API 인증 정보
+        spreadsheet_id (str): 스프레드시트 ID
+        ranges (list): A1 표기 범위 목록
+
+    Returns:
+        list: 범위 순서대로의 값 목록 (각 항목은 2차원 목록). 오류 시 None
+    """
+    try:
+        service = get_service(credentials)
+        result = _execute(service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=list(ranges),
+            valueRenderOption=value_render_option,
+            dateTimeRenderOption=date_time_render_option
+        ), credentials)
+        
+        return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+    
+    except Exception as e:
+        print(f"Error batch fetching sheet values: {e}")
+        return None
+
+def batch_update_sheet_data(credentials, spreadsheet_id, data, value_input_option='USER_ENTERED'):
+    """
+    여러 범위의 값을 한 번의 요청으로 기록합니다.
+
+    Args:
+        credentials: Google API 인증 정보
+        spreadsheet_id (str): 스프레드시트 ID
+        data (dict): A1 표기 범위 → 2차원 값 목록
+
+    Returns:
+        bool: 성공 여부
+    """
+    if not data:
+        return True
     try:
         service = get_service(credentials)
         body = {
-            'values': values
+            'valueInputOption': value_input_option,
+            'data': [{'range': range_name, 'values': values} for range_name, values in data.items()]
         }
-        result = service.spreadsheets().values().append(
+        _execute(service.spreadsheets().values().batchUpdate(
             spreadsheetId=spreadsheet_id,
-            range=range_name,
-            valueInputOption='USER_ENTERED',
-            insertDataOption='INSERT_ROWS',
             body=body
-        ).execute()
+        ), credentials)
+        
+        return True
+    
+    except Exception as e:
+        print(f"Error batch updating sheet data: {e}")
+        return False
+
+def append_sheet_data(credentials, spreadsheet_id, range_name, values, chunk_size=APPEND_CHUNK_SIZE):
+    """구글 시트에 데이터를 추가합니다. 행이 많으면 chunk_size 행씩 나누어 요청합니다."""
+    appended = 0
+    try:
+        service = get_service(credentials)
+        for start in range(0, len(values), chunk_size):
+            body = {
+                'values': values[start:start + chunk_size]
+            }
+            _execute(service.spreadsheets().values().append(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption='USER_ENTERED',
+                insertDataOption='INSERT_ROWS',
+                body=body
+            ), credentials)
+            appended += len(body['values'])
         
         return True
     
     except Exception as e:
-        print(f"Error appending sheet data: {e}")
+        print(f"Error appending sheet data ({appended}/{len(values)} rows appended): {e}")
         return False
 
 def update_sheet_data(credentials, spreadsheet_id, range_name, values):
@@ -56,12 +236,12 @@ def update_sheet_data(credentials, spreadsheet_id, range_name, values):
         body = {
             'values': values
         }
-        result = service.spreadsheets().values().update(
+        result = _execute(service.spreadsheets().values().update(
             spreadsheetId=spreadsheet_id,
             range=range_name,
             valueInputOption='USER_ENTERED',
             body=body
-        ).execute()
+        ), credentials)
         
         return True
     
@@ -69,6 +249,135 @@ def update_sheet_data(credentials, spreadsheet_id, range_name, values):
         print(f"Error updating sheet data: {e}")
         return False
 
+def _column_letter(index):
+    """1부터 시작하는 열 번호를 A1 표기 열 문자로 변환합니다."""
+    letters = ''
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _to_datetime(series):
+    """시트 날짜 일련번호와 날짜 문자열을 datetime 으로 변환합니다."""
+    numbers = pd.to_numeric(series, errors='coerce')
+    result = pd.to_datetime(numbers, unit='D', origin=SHEET_EPOCH, errors='coerce')
+    text_mask = numbers.isna() & series.notna() & (series.astype(str).str.strip() != '')
+    if text_mask.any():
+        result[text_mask] = pd.to_datetime(series[text_mask].astype(str), errors='coerce')
+    return result
+
+def _to_category(series):
+    """값을 공백 제거한 문자열 범주형으로 변환합니다 (빈 값은 결측)."""
+    text = series.astype(str).str.strip()
+    text = text.where(series.notna() & (text != ''))
+    return text.astype('category')
+
+# 스키마 타입별 변환 함수
+SCHEMA_CONVERTERS = {
+    'datetime': _to_datetime,
+    'date': lambda series: _to_datetime(series).dt.normalize(),
+    'int': lambda series: pd.to_numeric(series, errors='coerce').round().astype('Int32'),
+    'float': lambda series: pd.to_numeric(series, errors='coerce').astype('float32'),
+    'category': _to_category,
+    'string': lambda series: series.astype('string'),
+}
+
+def apply_sheet_schema(df, schema):
+    """
+    스키마에 따라 컬럼 타입을 변환합니다.
+
+    Args:
+        df (pd.DataFrame): 시트 값으로 만든 데이터프레임
+        schema (dict): 컬럼 이름 → 타입 ('datetime', 'date', 'int', 'float', 'category', 'string')
+
+    Returns:
+        pd.DataFrame: 타입이 변환된 데이터프레임
+    """
+    for column, dtype in schema.items():
+        if column in df.columns:
+            df[column] = SCHEMA_CONVERTERS[dtype](df[column])
+    return df
+
+def iter_sheet_frames(credentials, spreadsheet_id, sheet_name, schema=None, columns=None,
+                      chunk_rows=READ_CHUNK_ROWS, start_row=2, end_row=None, header=None):
+    """
+    시트를 chunk_rows 행씩 나누어 읽고 타입이 변환된 데이터프레임을 순서대로 반환합니다.
+    데이터프레임의 인덱스는 시트 행 번호입니다.
+    시트의 전체 행 수를 한 번 조회해 그 행까지 읽으므로 중간에 빈 행이 있어도 뒤의 데이터를 모두 읽습니다
+    (행 수를 알 수 없으면 빈 응답이 올 때까지 읽습니다).
+
+    Args:
+        credentials: Google API 인증 정보
+        spreadsheet_id (str): 스프레드시트 ID
+        sheet_name (str): 시트 이름
+        schema (dict): 컬럼 타입 스키마 (apply_sheet_schema 참고)
+        columns (list): 유지할 컬럼 목록 (None 이면 전체)
+        chunk_rows (int): 한 번에 읽을 행 수
+        start_row (int): 읽기 시작 행 번호 (1 = 헤더)
+        end_row (int): 마지막 행 번호 (None 이면 데이터 끝까지)
+        header (list): 헤더 목록 (None 이면 1행을 읽음)
+
+    Yields:
+        pd.DataFrame: 행 묶음별 데이터프레임
+    """
+    if header is None:
+        values = get_sheet_values(credentials, spreadsheet_id, f"'{sheet_name}'!1:1")
+        if values is None:
+            raise SheetReadError(f"{sheet_name} 헤더")
+        header = [str(name).strip() for name in values[0]] if values else []
+    if not header:
+        return
+
+    width = len(header)
+    last_column = _column_letter(width)
+    keep = [i for i, name in enumerate(header) if columns is None or name in columns]
+    names = [header[i] for i in keep]
+
+    row_count = get_sheet_row_count(credentials, spreadsheet_id, sheet_name)
+    if row_count is not None:
+        end_row = row_count if end_row is None else min(end_row, row_count)
+
+    row = start_row
+    while end_row is None or row <= end_row:
+        stop_row = row + chunk_rows - 1 if end_row is None else min(row + chunk_rows - 1, end_row)
+        range_name = f"'{sheet_name}'!A{row}:{last_column}{stop_row}"
+        values = get_sheet_values(credentials, spreadsheet_id, range_name)
+        if values is None:
+            raise SheetReadError(range_name)
+        if values:
+            padded = [r + [None] * (width - len(r)) for r in values]
+            df = pd.DataFrame([[r[i] for i in keep] for r in padded], columns=names,
+                              index=pd.RangeIndex(row, row + len(values)))
+            yield apply_sheet_schema(df, schema) if schema else df
+        # 묶음 끝의 빈 행은 응답에서 제외되므로 요청보다 적게 와도 뒤에 데이터가 있을 수 있습니다.
+        # 시트 행 수를 모를 때만 빈 응답을 데이터의 끝으로 봅니다.
+        if not values and row_count is None:
+            return
+        row = stop_row + 1
+
+def concat_sheet_frames(frames):
+    """iter_sheet_frames 결과를 범주형 컬럼을 유지한 채 하나로 합칩니다."""
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+    category_columns = [
+        column for column in frames[0].columns
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype)
+    ]
+    for column in category_columns:
+        categories = union_categoricals([frame[column] for frame in frames]).categories
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames)
+
+def read_sheet_frame(credentials, spreadsheet_id, sheet_name, schema=None, columns=None,
+                     chunk_rows=READ_CHUNK_ROWS, start_row=2, end_row=None):
+    """시트 전체(또는 지정 범위)를 분할해 읽어 타입이 변환된 하나의 데이터프레임으로 반환합니다."""
+    return concat_sheet_frames(iter_sheet_frames(
+        credentials, spreadsheet_id, sheet_name, schema=schema, columns=columns,
+        chunk_rows=chunk_rows, start_row=start_row, end_row=end_row
+    ))
+
 def get_equipment_status():
     """설비 상태 데이터를 가져옵니다."""
     # 구현 필요
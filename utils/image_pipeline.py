@@ -0,0 +1,152 @@
+"""
+업로드 이미지 압축 파이프라인
+- 큰 JPEG 는 Image.draft 로 필요한 크기 근처까지만 디코딩
+- 최대 10장을 스레드 풀에서 병렬 압축 (Pillow 는 디코딩/인코딩 중 GIL 을 해제)
+- 미리보기는 작은 썸네일 경로로 생성하고 업로드 파일별로 재사용
+"""
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+# 저장용 이미지의 최대 변 길이와 JPEG 품질
+MAX_IMAGE_SIZE = 1024
+JPEG_QUALITY = 85
+# 미리보기 썸네일 (화면 표시 폭 150px 의 2배)
+PREVIEW_SIZE = 300
+PREVIEW_QUALITY = 70
+# 한 번에 처리하는 최대 이미지 수 / 작업 스레드 수
+MAX_IMAGES = 10
+MAX_WORKERS = 10
+
+try:
+    _LANCZOS = Image.Resampling.LANCZOS
+    _BILINEAR = Image.Resampling.BILINEAR
+except AttributeError:
+    # 구버전 Pillow
+    _LANCZOS = Image.ANTIALIAS
+    _BILINEAR = Image.BILINEAR
+
+_preview_cache = OrderedDict()
+_preview_lock = threading.Lock()
+PREVIEW_CACHE_SIZE = 64
+
+
+def read_upload(file):
+    """업로드 파일(UploadedFile/BytesIO/bytes)의 내용을 bytes 로 반환합니다."""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def _open_reduced(data, target_size):
+    """
+    이미지를 열고, JPEG 는 target_size 이상이 되는 가장 작은 배율(1/2, 1/4, 1/8)로 디코딩합니다.
+    EXIF 회전 정보도 반영합니다.
+    """
+    img = Image.open(io.BytesIO(data))
+    if img.format == 'JPEG':
+        img.draft('RGB', (target_size, target_size))
+    try:
+        img = ImageOps.exif_transpose(img)
+    except Exception:
+        pass
+    return img
+
+
+def _to_rgb(img):
+    """JPEG 저장을 위해 RGB 로 변환합니다. 투명 영역은 흰색 배경에 합성합니다."""
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        img = img.convert('RGBA')
+        bg = Image.new('RGB', img.size, (255, 255, 255))
+        bg.paste(img, mask=img.split()[3])
+        return bg
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _encode_jpeg(img, quality, optimize=True):
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality, optimize=optimize)
+    return buffer.getvalue()
+
+
+def compress_image_bytes(data, max_size=MAX_IMAGE_SIZE, quality=JPEG_QUALITY):
+    """이미지 bytes 를 최대 변 max_size 의 JPEG bytes 로 압축합니다."""
+    img = _to_rgb(_open_reduced(data, max_size))
+    if max(img.size) > max_size:
+        img.thumbnail((max_size, max_size), _LANCZOS)
+    return _encode_jpeg(img, quality)
+
+
+def make_preview_bytes(data, size=PREVIEW_SIZE):
+    """미리보기용 작은 JPEG 썸네일을 만듭니다."""
+    img = _to_rgb(_open_reduced(data, size))
+    img.thumbnail((size, size), _BILINEAR)
+    return _encode_jpeg(img, PREVIEW_QUALITY, optimize=False)
+
+
+def parallel_map(func, items, max_workers=MAX_WORKERS):
+    """items 에 func 를 스레드 풀에서 적용하고 입력 순서대로 결과를 반환합니다."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def compress_uploaded_images(files, max_size=MAX_IMAGE_SIZE, quality=JPEG_QUALITY, max_images=MAX_IMAGES):
+    """
+    업로드 파일들을 병렬로 압축합니다.
+
+    Args:
+        files (list): 업로드 파일 목록
+        max_size (int): 최대 변 길이
+        quality (int): JPEG 품질
+        max_images (int): 처리할 최대 이미지 수
+
+    Returns:
+        list: [{'filename': 파일명, 'image_data': BytesIO}] (입력 순서 유지)
+    """
+    files = list(files or [])[:max_images]
+    contents = [read_upload(file) for file in files]
+    compressed = parallel_map(lambda data: compress_image_bytes(data, max_size, quality), contents)
+    return [
+        {'filename': getattr(file, 'name', f'image_{i + 1}.jpg'), 'image_data': io.BytesIO(data)}
+        for i, (file, data) in enumerate(zip(files, compressed))
+    ]
+
+
+def _preview_key(file, size):
+    file_id = getattr(file, 'file_id', None) or getattr(file, 'id', None)
+    if file_id is None:
+        file_id = (getattr(file, 'name', None), getattr(file, 'size', None))
+    return (file_id, size)
+
+
+def make_previews(files, size=PREVIEW_SIZE, max_images=MAX_IMAGES):
+    """
+    업로드 파일들의 미리보기 썸네일 bytes 목록을 반환합니다.
+    같은 업로드 파일은 재실행 시 다시 디코딩하지 않습니다.
+    """
+    files = list(files or [])[:max_images]
+    keys = [_preview_key(file, size) for file in files]
+    with _preview_lock:
+        previews = [_preview_cache.get(key) for key in keys]
+
+    missing = [i for i, preview in enumerate(previews) if preview is None]
+    if missing:
+        created = parallel_map(lambda i: make_preview_bytes(read_upload(files[i]), size), missing)
+        with _preview_lock:
+            for i, preview in zip(missing, created):
+                previews[i] = preview
+                _preview_cache[keys[i]] = preview
+            while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+                _preview_cache.popitem(last=False)
+    return previews
@@ -0,0 +1,162 @@
+"""
+콘텐츠 주소 기반 이미지 저장소
+- 이미지 내용의 SHA-256 해시를 키로 로컬 디스크에 저장 (같은 사진은 한 번만 저장)
+- 저장 시 화면 표시용 썸네일을 크기별로 미리 생성
+- 이력 행(image_paths)에는 해시 목록만 저장
+
+스토리지 버킷을 사용할 때는 같은 put/get/thumbnail 인터페이스로 교체할 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+# 저장소 위치 (기본값: data/images)
+IMAGE_STORE_DIR = os.getenv(
+    "IMAGE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'images')
+)
+# 미리 생성하는 썸네일 크기 (목록 표시용, 확대 표시용)
+THUMBNAIL_SIZES = (150, 400)
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_image_ref(value):
+    """이미지 저장소 해시 형식인지 확인합니다."""
+    return isinstance(value, str) and bool(_DIGEST_PATTERN.match(value))
+
+
+class ImageStore:
+    """SHA-256 해시로 이미지를 저장하고 조회하는 로컬 디스크 저장소입니다."""
+
+    def __init__(self, root=IMAGE_STORE_DIR, thumbnail_sizes=THUMBNAIL_SIZES):
+        self.root = root
+        self.thumbnail_sizes = tuple(thumbnail_sizes)
+
+    def _path(self, digest, size=None):
+        if not is_image_ref(digest):
+            raise ValueError(f"잘못된 이미지 키: {digest!r}")
+        folder = 'original' if size is None else f'thumb_{size}'
+        return os.path.join(self.root, folder, digest[:2], digest[2:4], f'{digest}.jpg')
+
+    def _write(self, path, data):
+        """임시 파일에 쓴 뒤 이름을 바꿔 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 합니다."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, digest):
+        return is_image_ref(digest) and os.path.exists(self._path(digest))
+
+    def put(self, data):
+        """
+        이미지 bytes 를 저장하고 해시를 반환합니다.
+        이미 저장된 이미지는 다시 쓰지 않고 썸네일도 다시 만들지 않습니다.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            self._write(path, data)
+        for size in self.thumbnail_sizes:
+            thumb_path = self._path(digest, size)
+            if not os.path.exists(thumb_path):
+                self._write(thumb_path, _make_thumbnail(data, size))
+        return digest
+
+    def put_many(self, images):
+        """여러 이미지를 병렬로 저장하고 입력 순서대로 해시 목록을 반환합니다."""
+        from utils.image_pipeline import parallel_map
+        return parallel_map(self.put, list(images))
+
+    def get(self, digest):
+        """원본(압축본) 이미지 bytes 를 반환합니다. 없으면 None."""
+        try:
+            with open(self._path(digest), 'rb') as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def thumbnail(self, digest, size=THUMBNAIL_SIZES[0]):
+        """썸네일 bytes 를 반환합니다. 아직 없는 크기는 원본에서 만들어 저장합니다."""
+        try:
+            path = self._path(digest, size)
+        except ValueError:
+            return None
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        data = self.get(digest)
+        if data is None:
+            return None
+        thumb = _make_thumbnail(data, size)
+        self._write(path, thumb)
+        return thumb
+
+
+def _make_thumbnail(data, size):
+    from utils.image_pipeline import make_preview_bytes
+    return make_preview_bytes(data, size)
+
+
+_image_store = None
+
+
+def get_image_store():
+    """프로세스 전역에서 공유하는 이미지 저장소를 반환합니다."""
+    global _image_store
+    if _image_store is None:
+        _image_store = ImageStore()
+    return _image_store
+
+
+def _image_bytes(image):
+    """{'image_data': BytesIO} / BytesIO / bytes 형태의 이미지를 bytes 로 변환합니다."""
+    if isinstance(image, dict):
+        image = image.get('image_data')
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    if hasattr(image, 'getvalue'):
+        return image.getvalue()
+    image.seek(0)
+    return image.read()
+
+
+def store_images(images):
+    """
+    압축된 이미지 목록을 저장소에 저장하고 중복을 제거한 해시 목록을 반환합니다.
+
+    Args:
+        images (list): [{'filename', 'image_data'}] 또는 BytesIO/bytes 목록
+
+    Returns:
+        list: 이미지 해시 목록 (입력 순서 유지)
+    """
+    if not images:
+        return []
+    digests = get_image_store().put_many([_image_bytes(image) for image in images])
+    return list(dict.fromkeys(digests))
+
+
+def serialize_image_refs(refs):
+    """image_paths 컬럼에 저장할 문자열로 변환합니다."""
+    return json.dumps(list(refs)) if refs else None
+
+
+def parse_image_refs(value):
+    """image_paths 컬럼 값(JSON 배열 문자열/목록/쉼표 구분)을 해시 목록으로 변환합니다."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+    if isinstance(value, str):
+        value = [value]
+    refs = [str(ref).strip() for ref in value]
+    return [ref for ref in refs if is_image_ref(ref)]
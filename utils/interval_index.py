@@ -0,0 +1,198 @@
+"""
+계획 정지 기간 인터벌 인덱스 모듈
+- 시작일 순으로 정렬한 기간을 배열 기반 균형 이진 트리로 구성하고 서브트리별 최대 종료일을 보관
+  (겹치는 기간 조회 O(log n + 결과 수))
+- 설비별 트리와 전체 설비 트리를 함께 만들어 "D일/기간 R에 정지된 설비", 등록 시 기간 중복 검사,
+  전체 설비 가동 가능 캘린더를 계산
+- 날짜는 양 끝을 포함하며, 종료일이 없는(진행 중인) 정지는 끝이 없는 기간으로 취급
+"""
+
+from datetime import date, datetime, timedelta
+
+# 종료일이 없는 정지의 종료일
+OPEN_END = date.max
+# 등록 시 서로 겹치면 안 되는 정지 유형
+CONFLICT_TYPES = ('설비 PM', '모델 변경')
+
+
+def to_date(value):
+    """날짜 값(문자열/datetime/date)을 date 로 변환합니다. 값이 없거나 형식이 잘못되면 None을 반환합니다."""
+    # NaN/NaT 는 자기 자신과 같지 않음
+    if value is None or value == '' or value != value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+class IntervalTree:
+    """닫힌 구간 [시작, 끝] 목록에서 주어진 구간과 겹치는 항목을 찾는 정적 인터벌 트리입니다."""
+
+    def __init__(self, intervals):
+        """
+        Args:
+            intervals (iterable): (시작, 끝, 항목) 튜플 목록
+        """
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self._starts = [interval[0] for interval in ordered]
+        self._ends = [interval[1] for interval in ordered]
+        self._items = [interval[2] for interval in ordered]
+        # 구간 [lo, hi) 의 중앙 mid 노드가 서브트리 전체의 최대 종료일을 보관
+        self._max_end = list(self._ends)
+        if ordered:
+            self._build(0, len(ordered))
+
+    def _build(self, lo, hi):
+        mid = (lo + hi) // 2
+        max_end = self._ends[mid]
+        if lo < mid:
+            max_end = max(max_end, self._build(lo, mid))
+        if mid + 1 < hi:
+            max_end = max(max_end, self._build(mid + 1, hi))
+        self._max_end[mid] = max_end
+        return max_end
+
+    def __len__(self):
+        return len(self._items)
+
+    def overlap(self, start, end):
+        """[start, end] 와 겹치는 항목을 시작일 순으로 반환합니다."""
+        found = []
+        stack = [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # 서브트리의 모든 기간이 start 이전에 끝나면 건너뜀
+            if self._max_end[mid] < start:
+                continue
+            stack.append((lo, mid))
+            # 시작일 순 정렬이므로 mid 가 end 이후에 시작하면 오른쪽 서브트리도 모두 end 이후
+            if self._starts[mid] <= end:
+                if self._ends[mid] >= start:
+                    found.append(mid)
+                stack.append((mid + 1, hi))
+        return [self._items[i] for i in sorted(found)]
+
+    def at(self, day):
+        """day 를 포함하는 항목을 반환합니다."""
+        return self.overlap(day, day)
+
+
+class SuspensionIndex:
+    """계획 정지 이력을 설비별/전체 인터벌 트리로 조회합니다."""
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows (list): plan_suspensions 행 목록 (start_date 가 없는 행은 제외)
+        """
+        by_equipment = {}
+        intervals = []
+        for row in rows:
+            start = to_date(row.get('start_date'))
+            if start is None:
+                continue
+            end = max(to_date(row.get('end_date')) or OPEN_END, start)
+            interval = (start, end, row)
+            intervals.append(interval)
+            by_equipment.setdefault(row.get('equipment_number'), []).append(interval)
+        self._fleet = IntervalTree(intervals)
+        self._equipment = {number: IntervalTree(items) for number, items in by_equipment.items()}
+
+    def __len__(self):
+        return len(self._fleet)
+
+    def suspended_on(self, day):
+        """day 에 정지 중인 계획 정지 행 목록을 반환합니다."""
+        day = to_date(day)
+        return self._fleet.at(day)
+
+    def suspended_during(self, start, end):
+        """[start, end] 기간과 겹치는 계획 정지 행 목록을 반환합니다."""
+        return self._fleet.overlap(to_date(start), to_date(end) or OPEN_END)
+
+    def machines_down(self, start, end=None):
+        """기간(end 가 없으면 start 하루) 중 정지된 적이 있는 설비 번호 집합을 반환합니다."""
+        rows = self.suspended_during(start, end or start)
+        return {row.get('equipment_number') for row in rows}
+
+    def equipment_suspensions(self, equipment_number, start=date.min, end=OPEN_END):
+        """설비의 계획 정지 중 [start, end] 와 겹치는 행 목록을 반환합니다."""
+        tree = self._equipment.get(equipment_number)
+        if tree is None:
+            return []
+        return tree.overlap(to_date(start), to_date(end) or OPEN_END)
+
+    def find_conflicts(self, equipment_number, start, end=None, types=CONFLICT_TYPES, exclude_id=None):
+        """
+        새 계획 정지와 기간이 겹치는 같은 설비의 기존 계획 정지를 찾습니다.
+
+        Args:
+            equipment_number (str): 설비 번호
+            start: 시작일
+            end: 종료일 (예상 종료일, 없으면 끝이 없는 기간)
+            types (tuple): 검사할 정지 유형
+            exclude_id: 검사에서 제외할 계획 정지 id (수정 시 자기 자신)
+
+        Returns:
+            list: 겹치는 계획 정지 행 목록
+        """
+        return [
+            row for row in self.equipment_suspensions(equipment_number, start, end)
+            if row.get('type') in types and (exclude_id is None or row.get('id') != exclude_id)
+        ]
+
+    def availability_calendar(self, start, end, total_machines):
+        """
+        기간의 일별 정지 설비 수와 가동 가능 설비 수를 계산합니다.
+        같은 설비의 겹치는 정지는 하나로 합쳐 하루에 한 번만 셉니다.
+
+        Args:
+            start, end: 조회 기간 (양 끝 포함)
+            total_machines (int): 전체 설비 대수
+
+        Returns:
+            list: {'date', 'down', 'available', 'availability'} 딕셔너리 목록 (날짜순)
+        """
+        start, end = to_date(start), to_date(end)
+        if start is None or end is None or end < start:
+            return []
+        days = (end - start).days + 1
+        # 설비별로 기간 안으로 자른 구간을 합친 뒤 차분 배열에 더함
+        diff = [0] * (days + 1)
+        merged = {}
+        for row in self.suspended_during(start, end):
+            row_start = max(to_date(row.get('start_date')), start)
+            row_end = max(min(to_date(row.get('end_date')) or OPEN_END, end), row_start)
+            merged.setdefault(row.get('equipment_number'), []).append((row_start, row_end))
+        for spans in merged.values():
+            spans.sort()
+            current_start, current_end = spans[0]
+            for span_start, span_end in spans[1:] + [(None, None)]:
+                if span_start is not None and span_start <= current_end + timedelta(days=1):
+                    current_end = max(current_end, span_end)
+                    continue
+                diff[(current_start - start).days] += 1
+                diff[(current_end - start).days + 1] -= 1
+                current_start, current_end = span_start, span_end
+
+        calendar = []
+        down = 0
+        for offset in range(days):
+            down += diff[offset]
+            available = max(total_machines - down, 0)
+            calendar.append({
+                'date': start + timedelta(days=offset),
+                'down': down,
+                'available': available,
+                'availability': available / total_machines if total_machines else None
+            })
+        return calendar
+
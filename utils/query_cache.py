@@ -0,0 +1,156 @@
+"""
+조회 결과 캐시 모듈
+- 프로세스 전역에서 공유되는 TTL + LRU 캐시
+- 테이블별 TTL 설정
+- 쓰기 성공 시 테이블 단위 무효화 및 데이터 버전 관리
+- 쓰기 리스너를 통한 파생 데이터(스냅샷 등) 증분 갱신
+- 반환되는 목록/딕셔너리는 호출마다 새 객체지만 그 안의 행(dict)은 모든 세션이 공유하므로 읽기 전용으로 다룸
+  (행을 수정해야 하면 dict(row) 로 복사한 뒤 수정)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# 테이블별 캐시 유지 시간 (초)
+# 기준 정보는 길게, 이력 데이터는 짧게 유지합니다.
+CACHE_TTL = {
+    'equipment': 300,
+    'equipment_serials': 3600,
+    'error_codes': 3600,
+    'parts': 3600,
+    'error_history': 30,
+    'parts_replacement': 30,
+    'model_changes': 60,
+    'equipment_stops': 30,
+}
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 256
+
+
+class QueryCache:
+    """테이블 단위로 무효화할 수 있는 TTL + LRU 캐시입니다."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_map=None):
+        self.max_entries = max_entries
+        self.ttl_map = dict(ttl_map or CACHE_TTL)
+        self._entries = OrderedDict()  # key -> (table, expires_at, value)
+        self._versions = {}
+        self._write_listeners = []
+        self._lock = threading.RLock()
+
+    def get_or_load(self, table, key, loader):
+        """
+        캐시된 값을 반환하고, 없거나 만료되었으면 loader를 호출해 채웁니다.
+
+        loader에서 예외가 발생하면 캐시에 저장하지 않고 그대로 전달합니다.
+        반환된 목록의 행은 다른 세션과 공유되므로 수정하지 마세요.
+        """
+        cache_key = (table, key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(cache_key)
+                    return _copy_result(entry[2])
+                del self._entries[cache_key]
+            version = self._versions.get(table, 0)
+
+        value = loader()
+
+        with self._lock:
+            # 조회 도중 쓰기가 발생했다면 오래된 결과를 저장하지 않습니다.
+            if self._versions.get(table, 0) == version:
+                ttl = self.ttl_map.get(table, DEFAULT_TTL)
+                self._entries[cache_key] = (table, now + ttl, value)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return _copy_result(value)
+
+    def invalidate(self, *tables, rows=None):
+        """
+        지정한 테이블의 캐시를 비우고 데이터 버전을 올립니다.
+
+        rows 에 새로 기록된 행을 전달하면 쓰기 리스너가 전체 재계산 없이 증분 반영할 수 있습니다.
+        """
+        changes = []
+        with self._lock:
+            for table in tables:
+                previous = self._versions.get(table, 0)
+                self._versions[table] = previous + 1
+                changes.append((table, previous, previous + 1))
+            stale_keys = [key for key, entry in self._entries.items() if entry[0] in tables]
+            for key in stale_keys:
+                del self._entries[key]
+            listeners = list(self._write_listeners)
+
+        for listener in listeners:
+            for table, previous, current in changes:
+                try:
+                    listener(table, rows, previous, current)
+                except Exception as e:
+                    print(f"쓰기 리스너 오류 ({table}): {e}")
+
+    def add_write_listener(self, listener):
+        """
+        쓰기(무효화) 발생 시 호출할 함수를 등록합니다.
+
+        listener(table, rows, previous_version, new_version) 형태로 호출되며,
+        rows 는 새로 기록된 행 목록이거나 알 수 없는 경우 None 입니다.
+        """
+        with self._lock:
+            if listener not in self._write_listeners:
+                self._write_listeners.append(listener)
+
+    def clear(self):
+        """모든 캐시 항목을 비웁니다."""
+        with self._lock:
+            for table in {entry[0] for entry in self._entries.values()}:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self._entries.clear()
+
+    def data_version(self, *tables):
+        """테이블들의 현재 데이터 버전을 튜플로 반환합니다."""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def _copy_result(value):
+    """
+    바깥 목록/딕셔너리만 얕게 복사해 반환합니다.
+    목록에 행을 추가/삭제/정렬해도 캐시는 오염되지 않지만, 행 객체는 캐시와 공유되므로 읽기 전용입니다.
+    파생 스냅샷은 만료 전까지 같은 행 객체가 반환되는 것으로 재조회 여부를 판단합니다 (services/dashboard_snapshot.py).
+    """
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+# 프로세스 전역 캐시 인스턴스 (모든 세션이 공유)
+query_cache = QueryCache()
+
+
+def invalidate_tables(*tables, rows=None):
+    """쓰기 성공 후 관련 테이블 캐시를 무효화합니다. rows 는 새로 기록된 행 목록입니다."""
+    query_cache.invalidate(*tables, rows=rows)
+
+
+def add_write_listener(listener):
+    """쓰기 리스너를 등록합니다."""
+    query_cache.add_write_listener(listener)
+
+
+def get_data_version(*tables):
+    """테이블들의 현재 데이터 버전을 반환합니다."""
+    return query_cache.data_version(*tables)
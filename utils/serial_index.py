@@ -0,0 +1,134 @@
+"""
+설비 번호 → 시리얼 번호 메모리 인덱스 모듈
+- equipment_serials 테이블을 한 번에 적재하여 프로세스 전역에서 공유
+- id 기준 증분 갱신 및 주기적 전체 재적재
+- 단건/일괄 조회
+"""
+
+import re
+import threading
+import time
+
+# 증분 갱신 주기 (초)
+DELTA_REFRESH_INTERVAL = 60
+# 다른 프로세스의 수정/삭제를 반영하기 위한 전체 재적재 주기 (초)
+FULL_RELOAD_INTERVAL = 3600
+
+_EQUIPMENT_NUMBER_PATTERN = re.compile(r'(?:EQ)?-?0*(\d+)', re.IGNORECASE)
+
+
+def normalize_equipment_number(equipment_number):
+    """
+    설비 번호를 인덱스 키로 정규화합니다.
+    '12', '012', 'EQ012', 12 는 모두 정수 12로 변환되며, 그 외 형식은 공백만 제거합니다.
+    """
+    if equipment_number is None:
+        return None
+    if isinstance(equipment_number, int):
+        return equipment_number
+    text = str(equipment_number).strip()
+    match = _EQUIPMENT_NUMBER_PATTERN.fullmatch(text)
+    if match:
+        return int(match.group(1))
+    return text or None
+
+
+class EquipmentSerialIndex:
+    """설비 번호로 시리얼 번호를 즉시 찾기 위한 메모리 인덱스입니다."""
+
+    def __init__(self, full_loader, delta_loader=None,
+                 delta_interval=DELTA_REFRESH_INTERVAL, full_interval=FULL_RELOAD_INTERVAL):
+        """
+        Args:
+            full_loader (callable): 전체 매핑 행 목록을 반환하는 함수
+            delta_loader (callable): 마지막 id 이후의 행 목록을 반환하는 함수 (last_id 인자)
+            delta_interval (int): 증분 갱신 주기 (초)
+            full_interval (int): 전체 재적재 주기 (초)
+        """
+        self._full_loader = full_loader
+        self._delta_loader = delta_loader
+        self.delta_interval = delta_interval
+        self.full_interval = full_interval
+        self._serials = {}
+        self._last_id = 0
+        self._loaded_at = None
+        self._refreshed_at = None
+        self._lock = threading.RLock()
+
+    def _apply_rows(self, rows):
+        for row in rows:
+            key = normalize_equipment_number(row.get('equipment_number'))
+            if key is not None and row.get('serial_number'):
+                self._serials[key] = row['serial_number']
+            row_id = row.get('id')
+            if isinstance(row_id, int) and row_id > self._last_id:
+                self._last_id = row_id
+
+    def reload(self):
+        """전체 매핑을 다시 적재합니다."""
+        rows = self._full_loader() or []
+        with self._lock:
+            self._serials = {}
+            self._last_id = 0
+            self._apply_rows(rows)
+            self._loaded_at = self._refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """마지막으로 적재한 id 이후에 추가된 매핑만 가져와 반영합니다."""
+        if self._delta_loader is None:
+            self.reload()
+            return
+        rows = self._delta_loader(self._last_id) or []
+        with self._lock:
+            self._apply_rows(rows)
+            self._refreshed_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        try:
+            if self._loaded_at is None or now - self._loaded_at >= self.full_interval:
+                self.reload()
+            elif now - self._refreshed_at >= self.delta_interval:
+                self.refresh()
+        except Exception as e:
+            # 갱신에 실패해도 기존 인덱스로 계속 응답합니다.
+            print(f"시리얼 인덱스 갱신 오류: {e}")
+            with self._lock:
+                if self._loaded_at is None:
+                    self._loaded_at = now
+                self._refreshed_at = now
+
+    def lookup(self, equipment_number):
+        """설비 번호에 해당하는 시리얼 번호를 반환합니다. 없으면 None을 반환합니다."""
+        self._ensure_fresh()
+        return self._serials.get(normalize_equipment_number(equipment_number))
+
+    def lookup_many(self, equipment_numbers):
+        """여러 설비 번호의 시리얼 번호를 {입력 설비 번호: 시리얼 번호} 딕셔너리로 반환합니다."""
+        self._ensure_fresh()
+        serials = self._serials
+        return {
+            number: serials.get(normalize_equipment_number(number))
+            for number in equipment_numbers
+        }
+
+    def put(self, equipment_number, serial_number):
+        """쓰기 성공 후 인덱스에 매핑을 즉시 반영합니다."""
+        key = normalize_equipment_number(equipment_number)
+        if key is None:
+            return
+        with self._lock:
+            self._serials[key] = serial_number
+
+    def put_many(self, rows):
+        """여러 매핑 행을 인덱스에 반영합니다."""
+        with self._lock:
+            self._apply_rows(rows)
+
+    def remove(self, equipment_number):
+        """인덱스에서 매핑을 제거합니다."""
+        with self._lock:
+            self._serials.pop(normalize_equipment_number(equipment_number), None)
+
+    def __len__(self):
+        return len(self._serials)
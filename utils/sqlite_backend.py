@@ -0,0 +1,756 @@
+"""
+로컬 SQLite 저장소 백엔드 모듈
+- init_database.sql 스키마를 SQLite로 옮긴 로컬 데이터베이스 (WAL 모드, 인덱스 포함)
+- supabase 클라이언트와 같은 쿼리 빌더 인터페이스 제공
+  (table().select().eq().order().limit().execute(), insert/update/upsert/delete, rpc)
+- Supabase 없이 앱 실행, 대용량 데이터 벤치마크 및 부하 테스트에 사용
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+
+DEFAULT_SQLITE_PATH = "data/equipment.db"
+
+# 정수 자동 증가 키를 사용하는 테이블 (나머지는 UUID 문자열 키)
+INTEGER_ID_TABLES = {'equipment_serials', 'plan_suspensions', 'maintenance_plans'}
+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_NOW = "(strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'))"
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT,
+    name TEXT NOT NULL,
+    role TEXT DEFAULT 'user',
+    department TEXT,
+    phone TEXT,
+    created_at TEXT DEFAULT {_NOW},
+    last_login TEXT
+);
+
+CREATE TABLE IF NOT EXISTS equipment (
+    id TEXT PRIMARY KEY,
+    equipment_number TEXT UNIQUE NOT NULL,
+    serial_number TEXT,
+    equipment_type TEXT NOT NULL,
+    building TEXT NOT NULL,
+    status TEXT DEFAULT '정상',
+    installation_date TEXT DEFAULT (date('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS error_codes (
+    id TEXT PRIMARY KEY,
+    error_code TEXT UNIQUE NOT NULL,
+    description TEXT NOT NULL,
+    error_type TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS parts (
+    id TEXT PRIMARY KEY,
+    part_code TEXT UNIQUE NOT NULL,
+    part_name TEXT NOT NULL,
+    stock INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS error_history (
+    id TEXT PRIMARY KEY,
+    equipment_id TEXT,
+    error_code_id TEXT,
+    timestamp TEXT DEFAULT {_NOW},
+    equipment_number TEXT,
+    serial_number TEXT,
+    repair_time INTEGER NOT NULL,
+    repair_method TEXT,
+    worker_id TEXT,
+    supervisor_id TEXT,
+    worker TEXT,
+    supervisor TEXT,
+    error_code TEXT,
+    error_detail TEXT,
+    image_paths TEXT,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS parts_replacement (
+    id TEXT PRIMARY KEY,
+    equipment_id TEXT,
+    part_id TEXT,
+    timestamp TEXT DEFAULT {_NOW},
+    equipment_number TEXT,
+    serial_number TEXT,
+    worker_id TEXT,
+    supervisor_id TEXT,
+    worker TEXT,
+    supervisor TEXT,
+    part_code TEXT,
+    repair_time INTEGER,
+    image_paths TEXT,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS equipment_stops (
+    id TEXT PRIMARY KEY,
+    equipment_id TEXT,
+    timestamp TEXT DEFAULT {_NOW},
+    equipment_number TEXT,
+    serial_number TEXT,
+    stop_reason TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    details TEXT,
+    worker TEXT,
+    supervisor TEXT,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS equipment_serials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    equipment_number INTEGER UNIQUE NOT NULL,
+    serial_number TEXT UNIQUE NOT NULL,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS model_changes (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT DEFAULT {_NOW},
+    equipment_number TEXT,
+    serial_number TEXT,
+    model_from TEXT,
+    model_to TEXT,
+    duration_minutes INTEGER DEFAULT 0,
+    details TEXT,
+    worker TEXT,
+    supervisor TEXT,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS plan_suspensions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    equipment_number TEXT NOT NULL,
+    plan_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    estimated_end_date TEXT,
+    end_date TEXT,
+    reason TEXT,
+    responsible_person TEXT,
+    status TEXT DEFAULT 'ACTIVE',
+    building TEXT,
+    model_from TEXT,
+    model_to TEXT,
+    process_name TEXT,
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS maintenance_plans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plan_code TEXT UNIQUE,
+    equipment_number TEXT,
+    status TEXT DEFAULT 'ACTIVE',
+    start_date TEXT,
+    end_date TEXT,
+    description TEXT
+);
+
+-- 조회 패턴에 맞춘 인덱스 (설비 번호 필터 + 시간 정렬/범위)
+CREATE INDEX IF NOT EXISTS idx_error_history_equipment_time ON error_history(equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_error_history_time ON error_history(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_error_history_error_code ON error_history(error_code);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_equipment_time ON parts_replacement(equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_parts_replacement_time ON parts_replacement(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_equipment_stops_equipment_time ON equipment_stops(equipment_number, start_time);
+CREATE INDEX IF NOT EXISTS idx_equipment_stops_time ON equipment_stops(start_time, id);
+CREATE INDEX IF NOT EXISTS idx_model_changes_equipment_time ON model_changes(equipment_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_model_changes_time ON model_changes(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_plan_suspensions_equipment_number ON plan_suspensions(equipment_number);
+CREATE INDEX IF NOT EXISTS idx_plan_suspensions_equipment_start ON plan_suspensions(equipment_number, start_date, id);
+CREATE INDEX IF NOT EXISTS idx_plan_suspensions_status ON plan_suspensions(status);
+CREATE INDEX IF NOT EXISTS idx_plan_suspensions_type ON plan_suspensions(type);
+
+-- 부품 교체시 재고 자동 감소 트리거
+CREATE TRIGGER IF NOT EXISTS after_parts_replacement_insert
+AFTER INSERT ON parts_replacement
+BEGIN
+    UPDATE parts SET stock = stock - 1 WHERE id = NEW.part_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS update_plan_suspensions_updated_at
+AFTER UPDATE ON plan_suspensions
+BEGIN
+    UPDATE plan_suspensions SET updated_at = {_NOW} WHERE id = NEW.id;
+END;
+"""
+
+# init_database.sql 과 같은 샘플 기준 데이터
+SEED_DATA = {
+    'users': [
+        {'id': '00000000-0000-0000-0000-000000000000', 'email': 'admin@example.com',
+         'name': '관리자', 'role': 'admin'}
+    ],
+    'equipment': [
+        {'equipment_number': 'EQ001', 'serial_number': '800-001', 'equipment_type': '프레스', 'building': 'A동', 'status': '정상'},
+        {'equipment_number': 'EQ002', 'serial_number': '800-002', 'equipment_type': '컨베이어', 'building': 'A동', 'status': '점검중'},
+        {'equipment_number': 'EQ003', 'serial_number': '800-003', 'equipment_type': '로봇', 'building': 'B동', 'status': '정상'},
+        {'equipment_number': 'EQ004', 'serial_number': '800-004', 'equipment_type': '프레스', 'building': 'B동', 'status': '고장'},
+        {'equipment_number': 'EQ005', 'serial_number': '800-005', 'equipment_type': '컨베이어', 'building': 'C동', 'status': '정상'}
+    ],
+    'error_codes': [
+        {'error_code': 'E001', 'description': '모터 과열', 'error_type': '모터'},
+        {'error_code': 'E002', 'description': '센서 고장', 'error_type': '센서'},
+        {'error_code': 'E003', 'description': '전원 문제', 'error_type': '전기'},
+        {'error_code': 'E004', 'description': '제어기 오류', 'error_type': '제어'},
+        {'error_code': 'E005', 'description': '기계적 고장', 'error_type': '기계'}
+    ],
+    'parts': [
+        {'part_code': 'P001', 'part_name': '모터', 'stock': 10},
+        {'part_code': 'P002', 'part_name': '센서', 'stock': 15},
+        {'part_code': 'P003', 'part_name': '전원 모듈', 'stock': 8},
+        {'part_code': 'P004', 'part_name': '제어기', 'stock': 5},
+        {'part_code': 'P005', 'part_name': '베어링', 'stock': 20}
+    ],
+    'equipment_serials': [
+        {'equipment_number': i, 'serial_number': f'800-{i:03d}'} for i in range(1, 51)
+    ]
+}
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_SPACE_DATETIME = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:')
+# 'YYYY-MM-DD HH:MM' 문자열을 ISO 형식으로 맞추는 시간 컬럼
+TIME_COLUMNS = frozenset({'timestamp', 'start_time', 'end_time', 'start_date', 'end_date', 'created_at'})
+
+_COMPARE_OPERATORS = {
+    'eq': '=',
+    'neq': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'like': 'LIKE',
+    'ilike': 'LIKE'
+}
+
+
+class SQLiteBackendError(Exception):
+    """SQLite 백엔드 쿼리 오류"""
+
+
+def _identifier(name):
+    """SQL 식별자(테이블/컬럼명)를 검증합니다."""
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise SQLiteBackendError(f"잘못된 식별자: {name}")
+    return name
+
+
+def to_db_value(value, column=None):
+    """
+    파이썬 값을 SQLite 저장 형식으로 변환합니다. 시간 값은 ISO 문자열로 통일합니다.
+    공백으로 구분한 날짜시간 문자열은 column 이 시간 컬럼(TIME_COLUMNS)일 때만 변환합니다.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if column in TIME_COLUMNS and isinstance(value, str) and _SPACE_DATETIME.match(value):
+        # 'YYYY-MM-DD HH:MM' 형식도 ISO 형식과 같은 순서로 비교되도록 변환
+        return value[:10] + 'T' + value[11:]
+    return value
+
+
+def _parse_literal(text):
+    """PostgREST 필터 문자열의 값 부분을 파싱합니다."""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1].replace('\\"', '"')
+    return text
+
+
+def _split_top_level(text):
+    """괄호/따옴표 밖의 쉼표 기준으로 문자열을 나눕니다."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _compile_condition(column, operator, value, negate=False):
+    """단일 필터 조건을 SQL 조각과 파라미터로 변환합니다."""
+    column = _identifier(column)
+    if operator == 'is':
+        keyword = {'null': 'NULL', 'true': '1', 'false': '0'}.get(str(value).lower())
+        if keyword is None:
+            raise SQLiteBackendError(f"지원하지 않는 is 값: {value}")
+        sql = f"{column} IS {'NOT ' if negate else ''}{keyword}"
+        return sql, []
+    if operator == 'in':
+        values = list(value)
+        if not values:
+            return ('1=1' if negate else '1=0'), []
+        placeholders = ','.join('?' for _ in values)
+        return f"{column} {'NOT ' if negate else ''}IN ({placeholders})", [to_db_value(v, column) for v in values]
+    if operator not in _COMPARE_OPERATORS:
+        raise SQLiteBackendError(f"지원하지 않는 연산자: {operator}")
+    if operator in ('like', 'ilike'):
+        value = str(value).replace('*', '%')
+    sql = f"{column} {_COMPARE_OPERATORS[operator]} ?"
+    if operator == 'ilike':
+        sql = f"LOWER({column}) LIKE LOWER(?)"
+    if negate:
+        sql = f"NOT ({sql})"
+    return sql, [to_db_value(value, column)]
+
+
+def _compile_logic_tree(expression, joiner):
+    """or_() 에 전달된 PostgREST 논리 표현식을 SQL 로 변환합니다."""
+    clauses, params = [], []
+    for term in _split_top_level(expression):
+        match = re.match(r'^(not\.)?(and|or)\((.*)\)$', term, re.DOTALL)
+        if match:
+            sql, sub_params = _compile_logic_tree(match.group(3), match.group(2).upper())
+            if match.group(1):
+                sql = f"NOT {sql}"
+        else:
+            column, rest = term.split('.', 1)
+            negate = False
+            if rest.startswith('not.'):
+                negate, rest = True, rest[4:]
+            operator, raw_value = rest.split('.', 1)
+            if operator == 'in':
+                value = [_parse_literal(v) for v in _split_top_level(raw_value.strip('()'))]
+            else:
+                value = _parse_literal(raw_value)
+            sql, sub_params = _compile_condition(column, operator, value, negate)
+        clauses.append(sql)
+        params.extend(sub_params)
+    return '(' + f' {joiner} '.join(clauses) + ')', params
+
+
+class SQLiteResponse:
+    """supabase 응답 객체와 같은 형태의 결과 (data, count)"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class SQLiteQuery:
+    """supabase 쿼리 빌더와 같은 체이닝 인터페이스를 제공합니다."""
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = _identifier(table)
+        self._action = 'select'
+        self._columns = '*'
+        self._count = None
+        self._payload = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self._filters = []
+        self._params = []
+        self._orders = []
+        self._limit = None
+        self._offset = None
+        self._negate_next = False
+
+    # 동작 지정
+    def select(self, columns="*", count=None):
+        self._action = 'select'
+        if columns.strip() != '*':
+            columns = ', '.join(_identifier(col) for col in columns.split(','))
+        self._columns = columns
+        self._count = count
+        return self
+
+    def insert(self, data):
+        self._action = 'insert'
+        self._payload = data
+        return self
+
+    def upsert(self, data, on_conflict=None, ignore_duplicates=False):
+        self._action = 'upsert'
+        self._payload = data
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, data):
+        self._action = 'update'
+        self._payload = data
+        return self
+
+    def delete(self):
+        self._action = 'delete'
+        return self
+
+    # 필터
+    def _add_filter(self, column, operator, value):
+        sql, params = _compile_condition(column, operator, value, self._negate_next)
+        self._negate_next = False
+        self._filters.append(sql)
+        self._params.extend(params)
+        return self
+
+    @property
+    def not_(self):
+        self._negate_next = True
+        return self
+
+    def eq(self, column, value):
+        return self._add_filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._add_filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._add_filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._add_filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._add_filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._add_filter(column, 'lte', value)
+
+    def like(self, column, pattern):
+        return self._add_filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._add_filter(column, 'ilike', pattern)
+
+    def in_(self, column, values):
+        return self._add_filter(column, 'in', values)
+
+    def is_(self, column, value):
+        return self._add_filter(column, 'is', value)
+
+    def or_(self, filters):
+        sql, params = _compile_logic_tree(filters, 'OR')
+        if self._negate_next:
+            sql, self._negate_next = f"NOT {sql}", False
+        self._filters.append(sql)
+        self._params.extend(params)
+        return self
+
+    # 정렬 및 범위
+    def order(self, column, desc=False, nullsfirst=False):
+        direction = 'DESC' if desc else 'ASC'
+        nulls = 'NULLS FIRST' if nullsfirst else 'NULLS LAST'
+        self._orders.append(f"{_identifier(column)} {direction} {nulls}")
+        return self
+
+    def limit(self, size):
+        self._limit = int(size)
+        return self
+
+    def range(self, start, end):
+        self._offset = int(start)
+        self._limit = int(end) - int(start) + 1
+        return self
+
+    def _where(self):
+        return (' WHERE ' + ' AND '.join(self._filters)) if self._filters else ''
+
+    def execute(self):
+        handler = {
+            'select': self._execute_select,
+            'insert': self._execute_insert,
+            'upsert': self._execute_insert,
+            'update': self._execute_update,
+            'delete': self._execute_delete
+        }[self._action]
+        try:
+            return handler()
+        except sqlite3.Error as e:
+            raise SQLiteBackendError(f"{self._table}: {e}") from e
+
+    def _execute_select(self):
+        conn = self._client.connection()
+        sql = f"SELECT {self._columns} FROM {self._table}{self._where()}"
+        if self._orders:
+            sql += ' ORDER BY ' + ', '.join(self._orders)
+        if self._limit is not None:
+            sql += f" LIMIT {self._limit}"
+            if self._offset:
+                sql += f" OFFSET {self._offset}"
+        rows = [dict(row) for row in conn.execute(sql, self._params)]
+        count = None
+        if self._count:
+            count = conn.execute(
+                f"SELECT COUNT(*) FROM {self._table}{self._where()}", self._params
+            ).fetchone()[0]
+        return SQLiteResponse(rows, count)
+
+    def _execute_insert(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        if not rows:
+            return SQLiteResponse([])
+        prepared = []
+        for row in rows:
+            row = {_identifier(key): to_db_value(value, key) for key, value in row.items()}
+            if self._table not in INTEGER_ID_TABLES and not row.get('id'):
+                row['id'] = str(uuid.uuid4())
+            prepared.append(row)
+
+        conn = self._client.connection()
+        if self._action == 'upsert' and self._ignore_duplicates:
+            # 이미 있는 행은 건너뛰고 새로 삽입된 행만 반환합니다 (Supabase 와 동일).
+            prepared = self._exclude_existing(conn, prepared)
+            prefix, suffix = 'INSERT OR IGNORE', ''
+        elif self._action == 'upsert' and self._on_conflict:
+            conflict = ', '.join(_identifier(col) for col in self._on_conflict.split(','))
+            prefix, suffix = 'INSERT', f" ON CONFLICT({conflict}) DO UPDATE SET "
+        elif self._action == 'upsert':
+            prefix, suffix = 'INSERT OR REPLACE', ''
+        else:
+            prefix, suffix = 'INSERT', ''
+
+        returned = []
+        with conn:
+            # 같은 컬럼 구성끼리 묶어서 executemany 로 일괄 삽입
+            groups = {}
+            for row in prepared:
+                groups.setdefault(tuple(row.keys()), []).append(row)
+            for columns, group in groups.items():
+                column_sql = ', '.join(columns)
+                placeholders = ', '.join('?' for _ in columns)
+                sql = f"{prefix} INTO {self._table} ({column_sql}) VALUES ({placeholders})"
+                if suffix:
+                    updates = ', '.join(f"{col} = excluded.{col}" for col in columns if col != 'id')
+                    sql += suffix + updates
+                values = [tuple(row[col] for col in columns) for row in group]
+                if len(values) == 1 and SUPPORTS_RETURNING:
+                    returned.extend(dict(r) for r in conn.execute(sql + ' RETURNING *', values[0]))
+                else:
+                    conn.executemany(sql, values)
+                    returned.extend(group)
+        return SQLiteResponse(returned)
+
+    def _exclude_existing(self, conn, rows):
+        """충돌 키(단일 또는 복합 컬럼)가 이미 존재하거나 배치 안에서 중복된 행을 제외합니다."""
+        columns = [_identifier(col.strip()) for col in (self._on_conflict or 'id').split(',')]
+        key = columns[0]
+        keys = list({row.get(key) for row in rows if row.get(key) is not None})
+        existing = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            existing.update(
+                tuple(r) for r in conn.execute(
+                    f"SELECT {', '.join(columns)} FROM {self._table} WHERE {key} IN ({placeholders})", chunk
+                )
+            )
+        result = []
+        for row in rows:
+            value = tuple(row.get(col) for col in columns)
+            if value[0] is not None:
+                if value in existing:
+                    continue
+                existing.add(value)
+            result.append(row)
+        return result
+
+    def _execute_update(self):
+        data = {_identifier(key): to_db_value(value, key) for key, value in self._payload.items()}
+        if not data:
+            return SQLiteResponse([])
+        assignments = ', '.join(f"{col} = ?" for col in data)
+        sql = f"UPDATE {self._table} SET {assignments}{self._where()}"
+        params = list(data.values()) + self._params
+        conn = self._client.connection()
+        with conn:
+            if SUPPORTS_RETURNING:
+                return SQLiteResponse([dict(r) for r in conn.execute(sql + ' RETURNING *', params)])
+            conn.execute(sql, params)
+        return SQLiteResponse([data])
+
+    def _execute_delete(self):
+        sql = f"DELETE FROM {self._table}{self._where()}"
+        conn = self._client.connection()
+        with conn:
+            if SUPPORTS_RETURNING:
+                return SQLiteResponse([dict(r) for r in conn.execute(sql + ' RETURNING *', self._params)])
+            conn.execute(sql, self._params)
+        return SQLiteResponse([])
+
+
+class SQLiteRPC:
+    """supabase.rpc() 호출 결과와 같은 형태로 실행되는 로컬 함수 호출"""
+
+    def __init__(self, client, function_name, params):
+        self._client = client
+        self._function_name = function_name
+        self._params = params or {}
+
+    def execute(self):
+        function = RPC_FUNCTIONS.get(self._function_name)
+        if function is None:
+            raise SQLiteBackendError(f"정의되지 않은 함수: {self._function_name}")
+        try:
+            return SQLiteResponse(function(self._client.connection(), **self._params))
+        except sqlite3.Error as e:
+            raise SQLiteBackendError(f"{self._function_name}: {e}") from e
+
+
+# 기존 데이터베이스 파일에 추가해야 하는 컬럼 (테이블, 컬럼, 타입)
+COLUMN_MIGRATIONS = [
+    ('parts_replacement', 'repair_time', 'INTEGER'),
+    ('parts_replacement', 'image_paths', 'TEXT'),
+]
+
+
+class SQLiteClient:
+    """supabase Client 대신 사용하는 로컬 SQLite 클라이언트"""
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, seed=True):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self.connection()
+        with conn:
+            conn.executescript(SQLITE_SCHEMA)
+            self._apply_column_migrations(conn)
+        if seed:
+            self._seed(conn)
+
+    def connection(self):
+        """스레드별 연결을 반환합니다 (Streamlit 세션은 서로 다른 스레드에서 실행됨)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+        return conn
+
+    def _apply_column_migrations(self, conn):
+        """이전 스키마로 만든 데이터베이스에 없는 컬럼을 추가합니다."""
+        for table, column, column_type in COLUMN_MIGRATIONS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def _seed(self, conn):
+        """비어 있는 기준 테이블에 샘플 데이터를 넣습니다."""
+        for table, rows in SEED_DATA.items():
+            if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None:
+                self.table(table).insert(rows).execute()
+
+    def table(self, name):
+        return SQLiteQuery(self, name)
+
+    def from_(self, name):
+        return self.table(name)
+
+    def rpc(self, function_name, params=None):
+        return SQLiteRPC(self, function_name, params)
+
+    def __bool__(self):
+        return True
+
+
+# migrations/create_report_stats_functions.sql 와 같은 결과를 반환하는 로컬 함수
+def _time_range_sql(column, start_ts, end_ts):
+    clauses, params = [], []
+    if start_ts:
+        clauses.append(f"{column} >= ?")
+        params.append(to_db_value(start_ts, column))
+    if end_ts:
+        clauses.append(f"{column} <= ?")
+        params.append(to_db_value(end_ts, column))
+    return clauses, params
+
+
+def _rpc_report_error_stats(conn, start_ts=None, end_ts=None):
+    clauses, params = _time_range_sql('timestamp', start_ts, end_ts)
+    where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    sql = f"""
+        SELECT error_code,
+               COUNT(*) AS occurrences,
+               SUM(repair_time) AS total_repair_time,
+               ROUND(AVG(repair_time), 2) AS avg_repair_time,
+               MAX(repair_time) AS max_repair_time
+        FROM error_history{where}
+        GROUP BY error_code
+        ORDER BY occurrences DESC
+    """
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def _rpc_report_parts_stats(conn, start_ts=None, end_ts=None):
+    clauses, params = _time_range_sql('timestamp', start_ts, end_ts)
+    where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    sql = f"""
+        SELECT part_code, COUNT(*) AS replacements
+        FROM parts_replacement{where}
+        GROUP BY part_code
+        ORDER BY replacements DESC
+    """
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def _rpc_report_model_change_stats(conn, p_equipment_number=None, start_ts=None, end_ts=None):
+    clauses, params = _time_range_sql('timestamp', start_ts, end_ts)
+    if p_equipment_number:
+        clauses.append("equipment_number = ?")
+        params.append(p_equipment_number)
+    where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    total, avg_duration = conn.execute(
+        f"SELECT COUNT(*), COALESCE(AVG(COALESCE(duration_minutes, 0)), 0) FROM model_changes{where}",
+        params
+    ).fetchone()
+    models = conn.execute(f"""
+        SELECT name, SUM(cnt) AS count FROM (
+            SELECT COALESCE(model_to, 'Unknown') AS name, 1 AS cnt FROM model_changes{where}
+            UNION ALL
+            SELECT COALESCE(model_from, 'Unknown') AS name, 0 AS cnt FROM model_changes{where}
+        ) GROUP BY name ORDER BY count DESC
+    """, params + params).fetchall()
+    return {
+        'total_changes': total,
+        'avg_duration': avg_duration,
+        'models': [{'name': row[0], 'count': row[1]} for row in models]
+    }
+
+
+RPC_FUNCTIONS = {
+    'report_error_stats': _rpc_report_error_stats,
+    'report_parts_stats': _rpc_report_parts_stats,
+    'report_model_change_stats': _rpc_report_model_change_stats
+}
+
+
+def create_sqlite_client(path=None):
+    """환경 변수 SQLITE_DB_PATH(기본 data/equipment.db)의 로컬 데이터베이스 클라이언트를 생성합니다."""
+    return SQLiteClient(path or os.getenv("SQLITE_DB_PATH", DEFAULT_SQLITE_PATH))
@@ -1,6 +1,12 @@
 import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 import streamlit as st
+from utils.query_cache import query_cache, invalidate_tables
+from utils.serial_index import EquipmentSerialIndex
+from utils.interval_index import SuspensionIndex
 
 # supabase import 문제 해결을 위한 try-except 블록
 try:
@@ -21,20 +27,40 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL", "https://example.supabase.co")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "your-api-key")
 
+# 저장소 백엔드 선택 ('supabase' 또는 'sqlite')
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+
+def _create_supabase_backend():
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _create_sqlite_backend():
+    from utils.sqlite_backend import create_sqlite_client
+    return create_sqlite_client()
+
+# 백엔드는 모두 supabase 클라이언트와 같은 쿼리 빌더 인터페이스
+# (table().select().eq().order().execute(), insert/update/upsert/delete, rpc)를 제공합니다.
+STORAGE_BACKENDS = {
+    'supabase': _create_supabase_backend,
+    'sqlite': _create_sqlite_backend
+}
+
 # Supabase 클라이언트 초기화 (캐싱)
 def get_supabase():
-    """Supabase 클라이언트를 반환합니다."""
+    """설정된 저장소 백엔드 클라이언트를 반환합니다."""
     # 지연 로딩을 통해 st.cache_resource 데코레이터 사용
     @st.cache_resource
-    def _create_client():
+    def _create_client(backend):
         try:
-            return create_client(SUPABASE_URL, SUPABASE_KEY)
+            return STORAGE_BACKENDS.get(backend, _create_supabase_backend)()
         except Exception as e:
-            print(f"Error creating Supabase client: {e}")
+            print(f"Error creating {backend} client: {e}")
             # 에러가 발생해도 앱이 중단되지 않도록 빈 객체 반환
             return {}
     
-    return _create_client()
+    return _create_client(DB_BACKEND)
+
+# modules/components 에서 사용하는 이름
+get_supabase_client = get_supabase
 
 # 기본 CRUD 함수 정의
 def fetch_data(table):
@@ -97,17 +123,117 @@ def fetch_data(table):
         # 기본 빈 배열 반환
         return []
 
+def _as_rows(data):
+    """단건/다건 쓰기 데이터를 행 목록으로 변환합니다."""
+    if isinstance(data, list):
+        return data
+    return [data]
+
 def insert_data(table, data):
     """데이터를 삽입합니다."""
-    return True
+    if not supabase:
+        return True
+    try:
+        response = supabase.table(table).insert(data).execute()
+        invalidate_tables(table, rows=response.data or _as_rows(data))
+        return True
+    except Exception as e:
+        print(f"테이블 '{table}' 삽입 중 오류 발생: {e}")
+        return False
+
+# 일괄 쓰기 시 한 번의 요청으로 보낼 최대 행 수
+BULK_WRITE_CHUNK_SIZE = 500
+
+# 월별 파티션 테이블(migrations/partition_history_tables.sql)의 기본 키
+# 파티션 테이블의 고유 키는 파티션 컬럼을 포함해야 하므로 id 와 시간 컬럼으로 중복을 판단합니다.
+PARTITION_CONFLICT_COLUMNS = {
+    'error_history': 'id,timestamp',
+    'equipment_stops': 'id,start_time'
+}
+# 파티션 마이그레이션이 적용되지 않아 id 로 중복을 판단하는 테이블
+_unpartitioned_tables = set()
+
+def _upsert_conflict_columns(table):
+    """테이블의 기본 upsert 충돌 판단 컬럼을 반환합니다."""
+    if table in _unpartitioned_tables:
+        return 'id'
+    return PARTITION_CONFLICT_COLUMNS.get(table, 'id')
+
+def _is_conflict_target_error(error):
+    """ON CONFLICT 대상 컬럼에 맞는 고유 제약이 없을 때의 오류인지 확인합니다 (PostgreSQL 42P10)."""
+    return '42P10' in str(error) or 'no unique or exclusion constraint' in str(error)
+
+def bulk_upsert_data(table, rows, on_conflict=None, ignore_duplicates=True, chunk_size=BULK_WRITE_CHUNK_SIZE,
+                     raise_errors=False):
+    """
+    여러 행을 chunk_size 단위 요청으로 나누어 일괄 upsert 합니다.
+
+    Args:
+        table (str): 테이블 이름
+        rows (list): 저장할 행 목록
+        on_conflict (str): 충돌 판단 컬럼 (기본값: 파티션 테이블은 id + 파티션 컬럼, 그 외 id)
+        ignore_duplicates (bool): True 면 이미 있는 행은 건너뜀 (False 면 덮어씀)
+        chunk_size (int): 요청당 행 수
+        raise_errors (bool): True 면 오류 시 None 대신 백엔드 예외를 그대로 전달 (쓰기 대기열의 오류 분류용)
+
+    Returns:
+        list: 새로 저장된 행 목록. 저장소가 없거나 오류가 발생하면 None
+    """
+    if not supabase:
+        return None
+    written = []
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            conflict = on_conflict or _upsert_conflict_columns(table)
+            try:
+                response = supabase.table(table).upsert(
+                    chunk, on_conflict=conflict, ignore_duplicates=ignore_duplicates
+                ).execute()
+            except Exception as e:
+                if on_conflict or conflict == 'id' or not _is_conflict_target_error(e):
+                    raise
+                # 파티션 전환 전 데이터베이스는 id 로만 중복을 판단합니다.
+                _unpartitioned_tables.add(table)
+                response = supabase.table(table).upsert(
+                    chunk, on_conflict='id', ignore_duplicates=ignore_duplicates
+                ).execute()
+            written.extend(response.data or [])
+        if written:
+            invalidate_tables(table, rows=written)
+        return written
+    except Exception as e:
+        print(f"테이블 '{table}' 일괄 저장 중 오류 발생 ({len(written)}/{len(rows)}행 저장): {e}")
+        # 앞선 요청에서 저장된 행은 캐시에 반영되도록 무효화합니다.
+        if written:
+            invalidate_tables(table, rows=written)
+        if raise_errors:
+            raise
+        return None
 
 def update_data(table, id, data):
     """데이터를 업데이트합니다."""
-    return True
+    if not supabase:
+        return True
+    try:
+        supabase.table(table).update(data).eq('id', id).execute()
+        invalidate_tables(table)
+        return True
+    except Exception as e:
+        print(f"테이블 '{table}' 업데이트 중 오류 발생: {e}")
+        return False
 
 def delete_data(table, id):
     """데이터를 삭제합니다."""
-    return True
+    if not supabase:
+        return True
+    try:
+        supabase.table(table).delete().eq('id', id).execute()
+        invalidate_tables(table)
+        return True
+    except Exception as e:
+        print(f"테이블 '{table}' 삭제 중 오류 발생: {e}")
+        return False
 
 # 인증 관련 함수
 def sign_in_user(email, password):
@@ -124,8 +250,10 @@ def get_equipment_list():
     try:
         # 실제 데이터베이스 조회 시도
         if supabase:
-            response = supabase.table('equipment').select("*").execute()
-            return response.data
+            return query_cache.get_or_load(
+                'equipment', ('list',),
+                lambda: supabase.table('equipment').select("*").execute().data
+            )
     except Exception as e:
         # 오류 발생 시 가상 데이터 반환
         print(f"설비 목록 조회 중 오류 발생: {e}")
@@ -247,6 +375,7 @@ def add_equipment(equipment_data):
         return None
     try:
         response = supabase.table('equipment').insert(equipment_data).execute()
+        invalidate_tables('equipment')
         return response.data
     except Exception as e:
         st.error(f"데이터 추가 오류: {str(e)}")
@@ -257,6 +386,7 @@ def update_equipment(equipment_id, equipment_data):
         return None
     try:
         response = supabase.table('equipment').update(equipment_data).eq('id', equipment_id).execute()
+        invalidate_tables('equipment')
         return response.data
     except Exception as e:
         st.error(f"데이터 수정 오류: {str(e)}")
@@ -267,17 +397,46 @@ def get_error_history():
     if not supabase:
         return []
     try:
-        response = supabase.table('error_history').select("*").order('timestamp', desc=True).execute()
-        return response.data
+        return query_cache.get_or_load(
+            'error_history', ('list',),
+            lambda: supabase.table('error_history').select("*").order('timestamp', desc=True).execute().data
+        )
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
 
-def add_error_history(error_data):
+def _history_record(data, fields, images=None):
+    """
+    딕셔너리 또는 키워드 인자로 받은 이력 데이터를 저장할 행으로 만듭니다.
+    images 가 있으면 이미지 저장소에 저장하고 image_paths 에 해시 목록을 기록합니다.
+    """
+    record = dict(data or {})
+    record.update(fields)
+    if images:
+        from utils.image_store import store_images
+        record['image_paths'] = store_images(images)
+    if isinstance(record.get('image_paths'), (list, tuple)):
+        from utils.image_store import serialize_image_refs
+        record['image_paths'] = serialize_image_refs(record['image_paths'])
+    for key, value in record.items():
+        if hasattr(value, 'isoformat'):
+            record[key] = value.isoformat()
+    return record
+
+def add_error_history(error_data=None, images=None, **fields):
+    """
+    고장 이력을 추가합니다.
+
+    Args:
+        error_data (dict): 저장할 행 (키워드 인자로 컬럼 값을 전달해도 됨)
+        images (list): 압축된 이미지 목록 (이미지 저장소에 저장 후 해시만 기록)
+    """
     if not supabase:
         return None
     try:
+        error_data = _history_record(error_data, fields, images)
         response = supabase.table('error_history').insert(error_data).execute()
+        invalidate_tables('error_history', rows=response.data or _as_rows(error_data))
         return response.data
     except Exception as e:
         st.error(f"데이터 추가 오류: {str(e)}")
@@ -288,17 +447,30 @@ def get_parts_replacement():
     if not supabase:
         return []
     try:
-        response = supabase.table('parts_replacement').select("*").order('timestamp', desc=True).execute()
-        return response.data
+        return query_cache.get_or_load(
+            'parts_replacement', ('list',),
+            lambda: supabase.table('parts_replacement').select("*").order('timestamp', desc=True).execute().data
+        )
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
 
-def add_parts_replacement(parts_data):
+def add_parts_replacement(parts_data=None, images=None, **fields):
+    """
+    부품 교체 이력을 추가합니다.
+
+    Args:
+        parts_data (dict): 저장할 행 (키워드 인자로 컬럼 값을 전달해도 됨)
+        images (list): 압축된 이미지 목록 (이미지 저장소에 저장 후 해시만 기록)
+    """
     if not supabase:
         return None
     try:
+        parts_data = _history_record(parts_data, fields, images)
         response = supabase.table('parts_replacement').insert(parts_data).execute()
+        invalidate_tables('parts_replacement', rows=response.data or _as_rows(parts_data))
+        # 부품 교체 시 트리거로 재고가 차감되므로 부품 목록도 무효화합니다.
+        invalidate_tables('parts')
         return response.data
     except Exception as e:
         st.error(f"데이터 추가 오류: {str(e)}")
@@ -309,8 +481,10 @@ def get_error_codes():
     if not supabase:
         return []
     try:
-        response = supabase.table('error_codes').select("*").execute()
-        return response.data
+        return query_cache.get_or_load(
+            'error_codes', ('list',),
+            lambda: supabase.table('error_codes').select("*").execute().data
+        )
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
@@ -320,6 +494,7 @@ def add_error_code(error_code_data):
         return None
     try:
         response = supabase.table('error_codes').insert(error_code_data).execute()
+        invalidate_tables('error_codes')
         return response.data
     except Exception as e:
         st.error(f"데이터 추가 오류: {str(e)}")
@@ -330,8 +505,10 @@ def get_parts_list():
     if not supabase:
         return []
     try:
-        response = supabase.table('parts').select("*").execute()
-        return response.data
+        return query_cache.get_or_load(
+            'parts', ('list',),
+            lambda: supabase.table('parts').select("*").execute().data
+        )
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
@@ -341,6 +518,7 @@ def add_part(part_data):
         return None
     try:
         response = supabase.table('parts').insert(part_data).execute()
+        invalidate_tables('parts')
         return response.data
     except Exception as e:
         st.error(f"데이터 추가 오류: {str(e)}")
@@ -351,43 +529,396 @@ def update_part_stock(part_id, new_stock):
         return None
     try:
         response = supabase.table('parts_list').update({'stock': new_stock}).eq('id', part_id).execute()
+        invalidate_tables('parts')
         return response.data
     except Exception as e:
         st.error(f"데이터 수정 오류: {str(e)}")
         return None
 
 # 통계 관련 함수
-def get_error_stats(start_date=None, end_date=None):
-    if not supabase:
-        return []
-    try:
-        query = supabase.table('error_history').select("*")
+# 집계는 DB 함수(migrations/create_report_stats_functions.sql)에서 수행합니다.
+# 함수가 아직 배포되지 않은 환경에서는 필요한 컬럼만 조회해 앱에서 집계합니다.
+# 함수가 없다고 판단한 뒤 다시 호출해 보기까지의 시간 (초, 마이그레이션 배포 후 자동 복구)
+STATS_RPC_RETRY_SECONDS = 600
+# 함수 이름 → 없다고 판단한 시각 (time.monotonic)
+_unavailable_stats_rpcs = {}
+# 전체 조회 시 한 번에 가져올 행 수 (PostgREST 기본 최대 행 수)
+SELECT_PAGE_SIZE = 1000
+
+def _is_missing_function_error(error):
+    """DB 함수가 배포되지 않았을 때의 오류인지 확인합니다 (PostgREST PGRST202, PostgreSQL 42883)."""
+    text = str(error)
+    return 'PGRST202' in text or '42883' in text
+
+def _call_stats_rpc(function_name, params, fallback):
+    """
+    통계 RPC를 호출하고, 사용할 수 없으면 fallback 결과를 반환합니다.
+    함수가 없는 경우에만 STATS_RPC_RETRY_SECONDS 동안 호출을 건너뛰고,
+    일시적인 오류는 이번 조회만 fallback 으로 처리합니다.
+    """
+    marked_at = _unavailable_stats_rpcs.get(function_name)
+    if marked_at is None or time.monotonic() - marked_at >= STATS_RPC_RETRY_SECONDS:
+        try:
+            result = supabase.rpc(function_name, params).execute().data
+            _unavailable_stats_rpcs.pop(function_name, None)
+            return result
+        except Exception as e:
+            if _is_missing_function_error(e):
+                print(f"통계 함수 '{function_name}'가 없어 앱 집계로 대체합니다: {e}")
+                _unavailable_stats_rpcs[function_name] = time.monotonic()
+            else:
+                print(f"통계 함수 '{function_name}' 호출 실패, 이번 조회는 앱 집계로 대체합니다: {e}")
+    return fallback()
+
+def _to_param(value):
+    """날짜/시간 값을 RPC 파라미터용 문자열로 변환합니다."""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def _fetch_all_pages(build_query, order_column='id', page_size=SELECT_PAGE_SIZE):
+    """
+    PostgREST 최대 행 수 제한에 잘리지 않도록 .range() 페이지 단위로 모든 행을 조회합니다.
+
+    Args:
+        build_query (callable): 조건이 적용된 새 쿼리를 반환하는 함수 (페이지마다 호출)
+        order_column (str): 페이지 순서를 고정할 정렬 컬럼
+        page_size (int): 페이지당 행 수
+    """
+    rows = []
+    while True:
+        page = build_query().order(order_column)\
+            .range(len(rows), len(rows) + page_size - 1)\
+            .execute().data
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+
+def _select_range(table, columns, start_date=None, end_date=None, equipment_number=None):
+    """기간/설비 조건으로 지정 컬럼만 모든 페이지를 조회합니다."""
+    def build_query():
+        query = supabase.table(table).select(columns)
+        if equipment_number:
+            query = query.eq('equipment_number', equipment_number)
         if start_date:
             query = query.gte('timestamp', start_date)
         if end_date:
             query = query.lte('timestamp', end_date)
-        response = query.execute()
-        return response.data
+        return query
+    return _fetch_all_pages(build_query)
+
+def _aggregate_error_stats(rows):
+    """오류 이력 행을 오류 코드별 통계로 집계합니다."""
+    groups = {}
+    for row in rows:
+        repair_time = row.get('repair_time') or 0
+        stat = groups.setdefault(row.get('error_code'), {
+            'error_code': row.get('error_code'),
+            'occurrences': 0,
+            'total_repair_time': 0,
+            'max_repair_time': 0
+        })
+        stat['occurrences'] += 1
+        stat['total_repair_time'] += repair_time
+        stat['max_repair_time'] = max(stat['max_repair_time'], repair_time)
+    for stat in groups.values():
+        stat['avg_repair_time'] = round(stat['total_repair_time'] / stat['occurrences'], 2)
+    return sorted(groups.values(), key=lambda x: x['occurrences'], reverse=True)
+
+def _aggregate_parts_stats(rows):
+    """부품 교체 행을 부품 코드별 교체 횟수로 집계합니다."""
+    counts = {}
+    for row in rows:
+        counts[row.get('part_code')] = counts.get(row.get('part_code'), 0) + 1
+    return [
+        {'part_code': code, 'replacements': count}
+        for code, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+def _aggregate_model_change_stats(rows):
+    """모델 변경 행을 총 변경 횟수, 평균 소요 시간, 모델별 변경 횟수로 집계합니다."""
+    if not rows:
+        return {
+            "total_changes": 0,
+            "avg_duration": 0,
+            "models": []
+        }
+    
+    # 모델별 변경 횟수 계산
+    model_counts = {}
+    for item in rows:
+        from_model = item.get('model_from') or 'Unknown'
+        to_model = item.get('model_to') or 'Unknown'
+        model_counts.setdefault(from_model, 0)
+        model_counts[to_model] = model_counts.get(to_model, 0) + 1
+    
+    # 평균 소요 시간 계산
+    total_duration = sum(item.get('duration_minutes') or 0 for item in rows)
+    
+    return {
+        "total_changes": len(rows),
+        "avg_duration": total_duration / len(rows),
+        "models": [{"name": k, "count": v} for k, v in model_counts.items()]
+    }
+
+def get_error_stats(start_date=None, end_date=None):
+    """
+    기간 내 오류 코드별 통계를 조회합니다.
+    
+    Returns:
+        list: error_code, occurrences, total_repair_time, avg_repair_time, max_repair_time 딕셔너리 목록
+    """
+    if not supabase:
+        return []
+    try:
+        return query_cache.get_or_load(
+            'error_history', ('stats', str(start_date), str(end_date)),
+            lambda: _call_stats_rpc(
+                'report_error_stats',
+                {'start_ts': _to_param(start_date), 'end_ts': _to_param(end_date)},
+                lambda: _aggregate_error_stats(
+                    _select_range('error_history', 'error_code,repair_time', start_date, end_date)
+                )
+            )
+        )
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
 
 def get_parts_stats(start_date=None, end_date=None):
+    """
+    기간 내 부품 코드별 교체 횟수를 조회합니다.
+    
+    Returns:
+        list: part_code, replacements 딕셔너리 목록
+    """
     if not supabase:
         return []
     try:
-        query = supabase.table('parts_replacement').select("*")
-        if start_date:
-            query = query.gte('timestamp', start_date)
-        if end_date:
-            query = query.lte('timestamp', end_date)
-        response = query.execute()
-        return response.data
+        return query_cache.get_or_load(
+            'parts_replacement', ('stats', str(start_date), str(end_date)),
+            lambda: _call_stats_rpc(
+                'report_parts_stats',
+                {'start_ts': _to_param(start_date), 'end_ts': _to_param(end_date)},
+                lambda: _aggregate_parts_stats(
+                    _select_range('parts_replacement', 'part_code', start_date, end_date)
+                )
+            )
+        )
+    except Exception as e:
+        st.error(f"데이터 조회 오류: {str(e)}")
+        return []
+
+# 일별 집계 관련 함수
+# 긴 기간 보고서는 일별 집계 테이블(migrations/create_daily_rollups.sql)을 읽습니다.
+# 집계 테이블이 아직 생성되지 않은 환경에서는 원본 이력을 조회해 앱에서 같은 형태로 집계합니다.
+# 집계 테이블: (원본 테이블, 조회 컬럼, 정렬 키)
+DAILY_ROLLUPS = {
+    'error_daily_rollup': (
+        'error_history',
+        'day,equipment_number,error_code,occurrences,total_repair_time,max_repair_time',
+        ('day', 'equipment_number', 'error_code')
+    ),
+    'parts_daily_rollup': (
+        'parts_replacement',
+        'day,part_code,replacements',
+        ('day', 'part_code')
+    ),
+    'downtime_daily_rollup': (
+        'equipment_stops',
+        'day,equipment_number,stops,stop_minutes',
+        ('day', 'equipment_number')
+    )
+}
+ROLLUP_PAGE_SIZE = 1000
+# 집계 테이블이 없다고 판단한 뒤 다시 조회해 보기까지의 시간 (초)
+ROLLUP_RETRY_SECONDS = 600
+# 집계 테이블 이름 → 없다고 판단한 시각 (time.monotonic)
+_unavailable_rollups = {}
+
+def _is_missing_relation_error(error):
+    """
+    테이블이 없을 때의 오류인지 확인합니다 (PostgreSQL 42P01, PostgREST PGRST205).
+    로컬 SQLite 백엔드는 집계 테이블을 만들지 않으므로 예외 연쇄의 "no such table" 오류도 포함합니다.
+    """
+    text = str(error)
+    if '42P01' in text or 'PGRST205' in text:
+        return True
+    while error is not None:
+        if isinstance(error, sqlite3.OperationalError) and 'no such table' in str(error):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def _to_day(value):
+    """날짜/시간 값을 'YYYY-MM-DD' 문자열로 변환합니다."""
+    if value is None:
+        return None
+    return str(value.isoformat() if hasattr(value, 'isoformat') else value)[:10]
+
+def _to_utc_naive(value):
+    """timestamp 값을 시간대 없는 UTC 기준 datetime 으로 변환합니다 (집계 테이블 날짜 기준과 동일)."""
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _select_rollup_pages(rollup, start_day, end_day):
+    """집계 테이블을 기간 조건으로 페이지 단위로 모두 조회합니다."""
+    _, columns, keys = DAILY_ROLLUPS[rollup]
+    rows = []
+    while True:
+        query = supabase.table(rollup).select(columns)
+        if start_day:
+            query = query.gte('day', start_day)
+        if end_day:
+            query = query.lte('day', end_day)
+        for key in keys:
+            query = query.order(key)
+        page = query.range(len(rows), len(rows) + ROLLUP_PAGE_SIZE - 1).execute().data
+        rows.extend(page)
+        if len(page) < ROLLUP_PAGE_SIZE:
+            return rows
+
+def _aggregate_error_daily(rows):
+    """고장 이력 행을 설비 × 일 × 오류 코드별로 집계합니다."""
+    groups = {}
+    for row in rows:
+        repair_time = row.get('repair_time') or 0
+        key = (_to_day(_to_utc_naive(row['timestamp'])), row.get('equipment_number') or '', row.get('error_code') or '')
+        stat = groups.setdefault(key, {
+            'day': key[0],
+            'equipment_number': key[1],
+            'error_code': key[2],
+            'occurrences': 0,
+            'total_repair_time': 0,
+            'max_repair_time': 0
+        })
+        stat['occurrences'] += 1
+        stat['total_repair_time'] += repair_time
+        stat['max_repair_time'] = max(stat['max_repair_time'], repair_time)
+    return [groups[key] for key in sorted(groups)]
+
+def _aggregate_parts_daily(rows):
+    """부품 교체 행을 부품 × 일별 교체 건수로 집계합니다."""
+    counts = {}
+    for row in rows:
+        key = (_to_day(_to_utc_naive(row['timestamp'])), row.get('part_code') or '')
+        counts[key] = counts.get(key, 0) + 1
+    return [
+        {'day': day, 'part_code': part_code, 'replacements': count}
+        for (day, part_code), count in sorted(counts.items())
+    ]
+
+def _aggregate_downtime_daily(rows, start_day=None, end_day=None):
+    """설비 정지 행을 날짜 경계에서 나눠 설비 × 일별 정지 건수/시간(분)으로 집계합니다."""
+    groups = {}
+    for row in rows:
+        start, end = _to_utc_naive(row['start_time']), _to_utc_naive(row['end_time'])
+        day = datetime.combine(start.date(), datetime.min.time())
+        while day < end:
+            next_day = day + timedelta(days=1)
+            key = (_to_day(day), row.get('equipment_number') or '')
+            if (start_day is None or key[0] >= start_day) and (end_day is None or key[0] <= end_day):
+                stat = groups.setdefault(key, {'day': key[0], 'equipment_number': key[1], 'stops': 0, 'stop_minutes': 0.0})
+                stat['stops'] += 1
+                stat['stop_minutes'] += (min(end, next_day) - max(start, day)).total_seconds() / 60
+            day = next_day
+    return [groups[key] for key in sorted(groups)]
+
+def _load_rollup_fallback(rollup, start_day, end_day):
+    """집계 테이블이 없을 때 원본 이력으로 같은 형태의 집계 행을 만듭니다."""
+    start_ts = f"{start_day}T00:00:00" if start_day else None
+    end_ts = f"{end_day}T23:59:59.999999" if end_day else None
+    if rollup == 'error_daily_rollup':
+        return _aggregate_error_daily(
+            _select_range('error_history', 'timestamp,equipment_number,error_code,repair_time', start_ts, end_ts)
+        )
+    if rollup == 'parts_daily_rollup':
+        return _aggregate_parts_daily(_select_range('parts_replacement', 'timestamp,part_code', start_ts, end_ts))
+    def build_query():
+        query = supabase.table('equipment_stops').select('id,equipment_number,start_time,end_time')
+        if start_ts:
+            query = query.gt('end_time', start_ts)
+        if end_ts:
+            query = query.lte('start_time', end_ts)
+        return query
+    return _aggregate_downtime_daily(_fetch_all_pages(build_query), start_day, end_day)
+
+def get_daily_rollup(rollup, start_date=None, end_date=None):
+    """
+    기간 내 일별 집계 행을 조회합니다 (시작일/종료일 포함).
+    원본 테이블에 쓰기가 발생하면 캐시가 무효화됩니다 (집계 테이블은 DB 트리거로 갱신).
+    
+    Args:
+        rollup (str): 'error_daily_rollup', 'parts_daily_rollup', 'downtime_daily_rollup'
+        start_date, end_date: 조회 기간 (date/datetime 또는 'YYYY-MM-DD')
+    
+    Returns:
+        list: 집계 행 딕셔너리 목록 (컬럼은 DAILY_ROLLUPS 참고)
+    """
+    if not supabase:
+        return []
+    source = DAILY_ROLLUPS[rollup][0]
+    start_day, end_day = _to_day(start_date), _to_day(end_date)
+    
+    def load():
+        # 집계 테이블이 없을 때만 ROLLUP_RETRY_SECONDS 동안 원본 이력 집계를 사용합니다.
+        # 일시적인 오류는 캐시에 저장하지 않고 그대로 전달합니다.
+        marked_at = _unavailable_rollups.get(rollup)
+        if marked_at is None or time.monotonic() - marked_at >= ROLLUP_RETRY_SECONDS:
+            try:
+                rows = _select_rollup_pages(rollup, start_day, end_day)
+                _unavailable_rollups.pop(rollup, None)
+                return rows
+            except Exception as e:
+                if not _is_missing_relation_error(e):
+                    raise
+                print(f"집계 테이블 '{rollup}'이 없어 원본 이력으로 집계합니다: {e}")
+                _unavailable_rollups[rollup] = time.monotonic()
+        return _load_rollup_fallback(rollup, start_day, end_day)
+    
+    try:
+        return query_cache.get_or_load(source, ('daily_rollup', rollup, start_day, end_day), load)
     except Exception as e:
         st.error(f"데이터 조회 오류: {str(e)}")
         return []
 
+def get_error_daily_rollup(start_date=None, end_date=None):
+    """설비 × 일 × 오류 코드별 고장 건수/수리 시간을 조회합니다."""
+    return get_daily_rollup('error_daily_rollup', start_date, end_date)
+
+def get_parts_daily_rollup(start_date=None, end_date=None):
+    """부품 × 일별 교체 건수를 조회합니다."""
+    return get_daily_rollup('parts_daily_rollup', start_date, end_date)
+
+def get_downtime_daily_rollup(start_date=None, end_date=None):
+    """설비 × 일별 정지 건수/정지 시간(분)을 조회합니다."""
+    return get_daily_rollup('downtime_daily_rollup', start_date, end_date)
+
 # 설비 시리얼 관련 함수
+def _load_all_serials():
+    """시리얼 인덱스 전체 적재용 조회"""
+    if not supabase:
+        return []
+    return supabase.table('equipment_serials')\
+        .select("id,equipment_number,serial_number")\
+        .order('id')\
+        .execute().data
+
+def _load_serials_since(last_id):
+    """시리얼 인덱스 증분 갱신용 조회 (last_id 이후 추가된 행)"""
+    if not supabase:
+        return []
+    return supabase.table('equipment_serials')\
+        .select("id,equipment_number,serial_number")\
+        .gt('id', last_id)\
+        .order('id')\
+        .execute().data
+
+# 프로세스 전역 시리얼 인덱스 (모든 세션이 공유, 첫 조회 시 적재)
+serial_index = EquipmentSerialIndex(_load_all_serials, _load_serials_since)
+
 def get_equipment_serials():
     """
     모든 설비 시리얼 번호 매핑을 가져옵니다.
@@ -395,8 +926,10 @@ def get_equipment_serials():
     if not supabase:
         return []
     try:
-        response = supabase.table('equipment_serials').select("*").order('equipment_number').execute()
-        return response.data
+        return query_cache.get_or_load(
+            'equipment_serials', ('list',),
+            lambda: supabase.table('equipment_serials').select("*").order('equipment_number').execute().data
+        )
     except Exception as e:
         st.error(f"설비 시리얼 조회 오류: {str(e)}")
         return []
@@ -404,21 +937,22 @@ def get_equipment_serials():
 def get_serial_by_equipment_number(equipment_number):
     """
     설비 번호로 시리얼 번호를 조회합니다.
+    메모리 인덱스에서 찾으므로 입력 중 반복 호출해도 네트워크 요청이 발생하지 않습니다.
     """
     if not supabase:
         return None
-    try:
-        response = supabase.table('equipment_serials')\
-            .select("serial_number")\
-            .eq('equipment_number', equipment_number)\
-            .execute()
-        
-        if response.data and len(response.data) > 0:
-            return response.data[0]['serial_number']
-        return None
-    except Exception as e:
-        st.error(f"시리얼 번호 조회 오류: {str(e)}")
-        return None
+    return serial_index.lookup(equipment_number)
+
+def get_serials_by_equipment_numbers(equipment_numbers):
+    """
+    여러 설비 번호의 시리얼 번호를 한 번에 조회합니다.
+    
+    Returns:
+        dict: {설비 번호: 시리얼 번호 또는 None}
+    """
+    if not supabase:
+        return {number: None for number in equipment_numbers}
+    return serial_index.lookup_many(equipment_numbers)
 
 def add_equipment_serial(equipment_number, serial_number):
     """
@@ -432,6 +966,8 @@ def add_equipment_serial(equipment_number, serial_number):
             'serial_number': serial_number
         }
         response = supabase.table('equipment_serials').insert(data).execute()
+        invalidate_tables('equipment_serials')
+        serial_index.put_many(response.data or [data])
         return response.data
     except Exception as e:
         st.error(f"시리얼 번호 추가 오류: {str(e)}")
@@ -449,6 +985,8 @@ def update_equipment_serial(equipment_number, serial_number):
             .update(data)\
             .eq('equipment_number', equipment_number)\
             .execute()
+        invalidate_tables('equipment_serials')
+        serial_index.put(equipment_number, serial_number)
         return response.data
     except Exception as e:
         st.error(f"시리얼 번호 업데이트 오류: {str(e)}")
@@ -465,6 +1003,8 @@ def delete_equipment_serial(equipment_number):
             .delete()\
             .eq('equipment_number', equipment_number)\
             .execute()
+        invalidate_tables('equipment_serials')
+        serial_index.remove(equipment_number)
         return response.data
     except Exception as e:
         st.error(f"시리얼 번호 삭제 오류: {str(e)}")
@@ -479,6 +1019,8 @@ def bulk_upload_equipment_serials(serials_data):
         return None
     try:
         response = supabase.table('equipment_serials').upsert(serials_data).execute()
+        invalidate_tables('equipment_serials')
+        serial_index.put_many(response.data or serials_data)
         return response.data
     except Exception as e:
         st.error(f"시리얼 번호 일괄 업로드 오류: {str(e)}")
@@ -490,8 +1032,10 @@ def get_model_changes():
     if not supabase:
         return []
     try:
-        response = supabase.table('model_changes').select("*").order('timestamp', desc=True).execute()
-        return response.data
+        return query_cache.get_or_load(
+            'model_changes', ('list',),
+            lambda: supabase.table('model_changes').select("*").order('timestamp', desc=True).execute().data
+        )
     except Exception as e:
         st.error(f"모델 변경 이력 조회 오류: {str(e)}")
         return []
@@ -504,6 +1048,7 @@ def add_model_change(model_change_data):
         return None
     try:
         response = supabase.table('model_changes').insert(model_change_data).execute()
+        invalidate_tables('model_changes')
         return response.data
     except Exception as e:
         st.error(f"모델 변경 정보 추가 오류: {str(e)}")
@@ -515,52 +1060,18 @@ def get_model_change_stats(equipment_number=None, start_date=None, end_date=None
         return {}
     
     try:
-        query = supabase.table('model_changes').select("*")
-        
-        if equipment_number:
-            query = query.eq('equipment_number', equipment_number)
-        
-        if start_date:
-            query = query.gte('timestamp', start_date)
-        
-        if end_date:
-            query = query.lte('timestamp', end_date)
-            
-        response = query.execute()
-        
-        # 통계 데이터 처리
-        data = response.data
-        
-        if not data:
-            return {
-                "total_changes": 0,
-                "avg_duration": 0,
-                "models": []
-            }
-        
-        # 모델별 변경 횟수 계산
-        model_counts = {}
-        for item in data:
-            from_model = item.get('model_from', 'Unknown')
-            to_model = item.get('model_to', 'Unknown')
-            
-            if from_model not in model_counts:
-                model_counts[from_model] = 0
-            
-            if to_model not in model_counts:
-                model_counts[to_model] = 0
-                
-            model_counts[to_model] += 1
-        
-        # 평균 소요 시간 계산
-        total_duration = sum(item.get('duration_minutes', 0) for item in data)
-        avg_duration = total_duration / len(data) if data else 0
-        
-        return {
-            "total_changes": len(data),
-            "avg_duration": avg_duration,
-            "models": [{"name": k, "count": v} for k, v in model_counts.items()]
-        }
+        return query_cache.get_or_load(
+            'model_changes', ('stats', equipment_number, str(start_date), str(end_date)),
+            lambda: _call_stats_rpc(
+                'report_model_change_stats',
+                {'p_equipment_number': equipment_number,
+                 'start_ts': _to_param(start_date), 'end_ts': _to_param(end_date)},
+                lambda: _aggregate_model_change_stats(
+                    _select_range('model_changes', 'model_from,model_to,duration_minutes',
+                                  start_date, end_date, equipment_number)
+                )
+            )
+        )
         
     except Exception as e:
         st.error(f"모델 변경 통계 조회 오류: {str(e)}")
@@ -578,6 +1089,7 @@ def add_equipment_stop(stop_data):
         return None
     try:
         response = supabase.table('equipment_stops').insert(stop_data).execute()
+        invalidate_tables('equipment_stops')
         return response.data
     except Exception as e:
         st.error(f"설비 정지 정보 추가 오류: {str(e)}")
@@ -595,8 +1107,170 @@ def get_equipment_stops(equipment_number=None):
         if equipment_number:
             query = query.eq('equipment_number', equipment_number)
             
-        response = query.execute()
-        return response.data
+        return query_cache.get_or_load(
+            'equipment_stops', ('list', equipment_number),
+            lambda: query.execute().data
+        )
     except Exception as e:
         st.error(f"설비 정지 이력 조회 오류: {str(e)}")
-        return [] 
\ No newline at end of file
+        return [] 
+# 이력 테이블 페이지 조회 관련 함수
+# 테이블별 정렬 기준 시간 컬럼과 기본 조회 컬럼 (image_paths 는 이미지 저장소 해시 목록만 담고 있어 포함)
+HISTORY_PAGE_CONFIG = {
+    'error_history': {
+        'time_column': 'timestamp',
+        'columns': ['id', 'timestamp', 'equipment_number', 'serial_number', 'error_code',
+                    'error_detail', 'repair_time', 'repair_method', 'worker', 'supervisor', 'image_paths']
+    },
+    'parts_replacement': {
+        'time_column': 'timestamp',
+        'columns': ['id', 'timestamp', 'equipment_number', 'serial_number', 'part_code',
+                    'repair_time', 'worker', 'supervisor', 'image_paths']
+    },
+    'model_changes': {
+        'time_column': 'timestamp',
+        'columns': ['id', 'timestamp', 'equipment_number', 'model_from', 'model_to',
+                    'duration_minutes', 'worker', 'supervisor']
+    },
+    'equipment_stops': {
+        'time_column': 'start_time',
+        'columns': ['id', 'start_time', 'end_time', 'equipment_number', 'serial_number',
+                    'stop_reason', 'duration_minutes', 'details', 'worker', 'supervisor']
+    },
+    'plan_suspensions': {
+        'time_column': 'start_date',
+        'columns': ['id', 'start_date', 'end_date', 'estimated_end_date', 'equipment_number', 'plan_id',
+                    'type', 'reason', 'responsible_person', 'status', 'model_from', 'model_to']
+    }
+}
+
+DEFAULT_PAGE_SIZE = 50
+
+def get_history_page(table, cursor=None, page_size=DEFAULT_PAGE_SIZE, columns=None,
+                     equipment_number=None, start_date=None, end_date=None):
+    """
+    이력 테이블을 (시간, id) 기준 키셋 페이지 단위로 최신순 조회합니다.
+
+    Args:
+        table (str): HISTORY_PAGE_CONFIG에 정의된 테이블 이름
+        cursor (tuple): 이전 페이지의 next_cursor 값 ((시간, id)), 첫 페이지는 None
+        page_size (int): 페이지당 행 수
+        columns (list): 조회할 컬럼 목록 (None이면 테이블 기본 컬럼)
+        equipment_number (str): 설비 번호 필터
+        start_date (str): 시작 시간 필터 (포함)
+        end_date (str): 종료 시간 필터 (포함)
+
+    Returns:
+        tuple: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    config = HISTORY_PAGE_CONFIG[table]
+    time_column = config['time_column']
+    columns = list(columns or config['columns'])
+    # 커서 계산에 필요한 컬럼은 항상 포함
+    for required in ('id', time_column):
+        if required not in columns:
+            columns.append(required)
+
+    if not supabase:
+        return [], None
+
+    def _load():
+        query = supabase.table(table).select(",".join(columns))
+        if equipment_number:
+            query = query.eq('equipment_number', equipment_number)
+        if start_date:
+            query = query.gte(time_column, start_date)
+        if end_date:
+            query = query.lte(time_column, end_date)
+        if cursor:
+            last_time, last_id = cursor
+            query = query.or_(
+                f'{time_column}.lt."{last_time}",'
+                f'and({time_column}.eq."{last_time}",id.lt."{last_id}")'
+            )
+        # 다음 페이지 존재 여부 확인을 위해 한 행 더 조회
+        return query.order(time_column, desc=True)\
+            .order('id', desc=True)\
+            .limit(page_size + 1)\
+            .execute().data
+
+    try:
+        rows = query_cache.get_or_load(
+            table,
+            ('page', tuple(cursor) if cursor else None, page_size, tuple(columns),
+             equipment_number, str(start_date), str(end_date)),
+            _load
+        )
+    except Exception as e:
+        st.error(f"이력 페이지 조회 오류: {str(e)}")
+        return [], None
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_row = rows[-1]
+        return rows, (last_row[time_column], last_row['id'])
+    return rows, None
+
+def iter_history_pages(table, page_size=DEFAULT_PAGE_SIZE, columns=None,
+                       equipment_number=None, start_date=None, end_date=None):
+    """이력 테이블의 페이지를 최신순으로 차례대로 반환하는 제너레이터입니다."""
+    cursor = None
+    while True:
+        rows, cursor = get_history_page(
+            table, cursor=cursor, page_size=page_size, columns=columns,
+            equipment_number=equipment_number, start_date=start_date, end_date=end_date
+        )
+        if rows:
+            yield rows
+        if cursor is None:
+            break
+
+def get_error_history_page(cursor=None, page_size=DEFAULT_PAGE_SIZE, columns=None, equipment_number=None):
+    """고장 이력 한 페이지를 조회합니다."""
+    return get_history_page('error_history', cursor, page_size, columns, equipment_number)
+
+def get_parts_replacement_page(cursor=None, page_size=DEFAULT_PAGE_SIZE, columns=None, equipment_number=None):
+    """부품 교체 이력 한 페이지를 조회합니다."""
+    return get_history_page('parts_replacement', cursor, page_size, columns, equipment_number)
+
+def get_model_changes_page(cursor=None, page_size=DEFAULT_PAGE_SIZE, columns=None, equipment_number=None):
+    """모델 변경 이력 한 페이지를 조회합니다."""
+    return get_history_page('model_changes', cursor, page_size, columns, equipment_number)
+
+def get_equipment_stops_page(cursor=None, page_size=DEFAULT_PAGE_SIZE, columns=None, equipment_number=None):
+    """설비 정지 이력 한 페이지를 조회합니다."""
+    return get_history_page('equipment_stops', cursor, page_size, columns, equipment_number)
+
+# 계획 정지 전체 조회 시 한 번에 가져올 행 수 (PostgREST 기본 최대 행 수)
+PLAN_SUSPENSION_PAGE_SIZE = 1000
+
+def _load_plan_suspension_rows():
+    """계획 정지 이력 전체를 id 순 페이지로 조회합니다."""
+    rows = []
+    while True:
+        page = supabase.table('plan_suspensions').select('*').order('id')\
+            .range(len(rows), len(rows) + PLAN_SUSPENSION_PAGE_SIZE - 1)\
+            .execute().data
+        rows.extend(page)
+        if len(page) < PLAN_SUSPENSION_PAGE_SIZE:
+            return rows
+
+def get_plan_suspension_index():
+    """
+    계획 정지 기간 인터벌 인덱스를 반환합니다.
+    인덱스 자체를 조회 캐시의 plan_suspensions 항목으로 저장하므로 TTL 만료나 계획 정지 쓰기 시에만
+    다시 만들고, 그 사이에는 모든 세션과 탭이 같은 인덱스를 공유합니다.
+
+    Returns:
+        SuspensionIndex: 인터벌 인덱스. 저장소가 없거나 조회에 실패하면 None
+    """
+    if not supabase:
+        return None
+    try:
+        return query_cache.get_or_load(
+            'plan_suspensions', ('interval_index',),
+            lambda: SuspensionIndex(_load_plan_suspension_rows())
+        )
+    except Exception as e:
+        print(f"계획 정지 이력 조회 오류: {e}")
+        return None
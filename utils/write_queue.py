@@ -0,0 +1,315 @@
+"""
+데이터 입력 쓰기 대기열 (write-ahead queue)
+- 입력 폼의 저장 요청을 로컬 SQLite 파일에 먼저 기록하고 즉시 반환 (네트워크 대기 없음)
+- 백그라운드 작업 스레드가 대기 중인 행을 테이블별로 묶어 일괄 upsert
+- 전송 실패 시 지수 백오프로 재시도, 앱이 재시작되어도 대기 중인 행은 유지
+- 한 묶음이 실패해도 다른 묶음은 계속 전송하고, 제약 조건 위반 등 영구 오류는 묶음을 반씩 나눠
+  다시 전송해 문제 행만 실패 보관(dead-letter) 상태로 옮김 (화면에서 오류 확인 후 재전송/삭제)
+
+각 행에는 대기열에 넣을 때 id 와 timestamp 를 부여하므로,
+같은 행을 여러 번 전송해도 (응답 유실 후 재전송 등) 한 번만 저장되고 입력 시각이 유지됩니다.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+# 대기열 파일 위치 (기본값: data/write_queue.db)
+WRITE_QUEUE_PATH = os.getenv(
+    "WRITE_QUEUE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'write_queue.db')
+)
+# 전송 주기(초)와 한 번에 전송하는 최대 행 수
+FLUSH_INTERVAL = 5
+FLUSH_BATCH_SIZE = 200
+# 전송 실패 시 재시도 간격(초): BACKOFF_BASE * 2^실패횟수, 최대 BACKOFF_MAX
+BACKOFF_BASE = 5
+BACKOFF_MAX = 300
+# 이 횟수만큼 실패한 행은 실패 보관 상태로 옮겨 자동 재시도에서 제외 (화면에서 다시 시도 가능)
+# 영구 오류가 발생한 행은 바로 이 값으로 설정합니다.
+MAX_ATTEMPTS = 50
+# 재시도해도 성공할 수 없는 PostgreSQL 오류 클래스 (22: 데이터 형식, 23: 제약 조건 위반, 42: 컬럼/권한 오류)
+PERMANENT_SQLSTATE_CLASSES = ('22', '23', '42')
+
+# 테이블 저장 후 함께 무효화할 캐시 (부품 교체 시 트리거로 재고가 차감됨)
+RELATED_TABLES = {
+    'parts_replacement': ('parts',),
+}
+
+_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pending_writes_attempts ON pending_writes(attempts, seq);
+"""
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class _BackendUnavailable(Exception):
+    """저장소 백엔드가 설정되지 않아 전송할 수 없음"""
+
+
+def _is_permanent_error(error):
+    """
+    다시 보내도 성공할 수 없는 오류인지 확인합니다.
+    제약 조건/데이터 형식 오류(SQLSTATE 22/23/42, PostgREST PGRST1xx/PGRST2xx)와
+    시간 초과(408)/요청 제한(429)을 제외한 HTTP 4xx 응답을 영구 오류로 봅니다.
+    """
+    if isinstance(error, sqlite3.IntegrityError):
+        return True
+    code = str(getattr(error, 'code', '') or '')
+    if code[:2] in PERMANENT_SQLSTATE_CLASSES or code[:6] in ('PGRST1', 'PGRST2'):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
+
+
+class WriteQueue:
+    """로컬 SQLite 파일에 쓰기 요청을 보관하고 백그라운드에서 데이터베이스로 전송하는 대기열입니다."""
+
+    def __init__(self, path=WRITE_QUEUE_PATH, writer=None, batch_size=FLUSH_BATCH_SIZE,
+                 interval=FLUSH_INTERVAL):
+        """
+        Args:
+            path (str): 대기열 파일 경로
+            writer (callable): writer(table, rows) -> 저장된 행 목록, 실패 시 None 또는 예외
+                               (기본값: utils.supabase_client.bulk_upsert_data)
+            batch_size (int): 한 번에 전송하는 최대 행 수
+            interval (float): 전송 주기(초)
+        """
+        self.path = path
+        self.writer = writer
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._failures = 0
+        self._next_attempt = 0.0
+        self.last_error = None
+        self.last_flush = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 입력 데이터 유실을 막기 위해 커밋마다 디스크에 기록합니다.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self._conn:
+            self._conn.executescript(_QUEUE_SCHEMA)
+
+    def enqueue(self, table, record):
+        """
+        행을 대기열에 추가하고 id 를 반환합니다. 네트워크를 사용하지 않으므로 바로 반환됩니다.
+
+        Args:
+            table (str): 저장할 테이블 이름
+            record (dict): 저장할 행 (id/timestamp 가 없으면 부여)
+
+        Returns:
+            str: 행 id
+        """
+        record = dict(record)
+        record.setdefault('id', str(uuid.uuid4()))
+        record.setdefault('timestamp', datetime.now().isoformat(timespec='seconds'))
+        payload = json.dumps(record, ensure_ascii=False, default=_json_value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pending_writes (table_name, row_id, payload, created_at) VALUES (?, ?, ?, ?)",
+                (table, record['id'], payload, datetime.now().isoformat(timespec='seconds'))
+            )
+        # 대기 중인 작업 스레드를 깨워 바로 전송을 시도합니다.
+        self._wakeup.set()
+        return record['id']
+
+    def pending_counts(self):
+        """
+        테이블별 대기/실패 건수를 반환합니다.
+
+        Returns:
+            dict: {'pending': {테이블: 건수}, 'failed': {테이블: 건수}}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT table_name, attempts >= ?, COUNT(*) FROM pending_writes GROUP BY 1, 2",
+                (MAX_ATTEMPTS,)
+            ).fetchall()
+        counts = {'pending': {}, 'failed': {}}
+        for table, failed, count in rows:
+            counts['failed' if failed else 'pending'][table] = count
+        return counts
+
+    def failed_rows(self, limit=50):
+        """
+        실패 보관 상태의 행을 오래된 순서로 반환합니다.
+
+        Returns:
+            list: {'table', 'row_id', 'attempts', 'last_error', 'created_at'} 딕셔너리 목록
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT table_name, row_id, attempts, last_error, created_at FROM pending_writes "
+                "WHERE attempts >= ? ORDER BY seq LIMIT ?",
+                (MAX_ATTEMPTS, limit)
+            ).fetchall()
+        return [
+            {'table': table, 'row_id': row_id, 'attempts': attempts, 'last_error': error, 'created_at': created_at}
+            for table, row_id, attempts, error, created_at in rows
+        ]
+
+    def retry_failed(self):
+        """자동 재시도에서 제외된 행을 다시 대기 상태로 되돌립니다."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE pending_writes SET attempts = 0 WHERE attempts >= ?", (MAX_ATTEMPTS,))
+        self._next_attempt = 0.0
+        self._wakeup.set()
+
+    def discard_failed(self):
+        """실패 보관 상태의 행을 대기열에서 삭제하고 삭제한 행 수를 반환합니다."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM pending_writes WHERE attempts >= ?", (MAX_ATTEMPTS,)).rowcount
+
+    def _write(self, table, rows):
+        if self.writer is not None:
+            return self.writer(table, rows)
+        import utils.supabase_client as db
+        if not db.supabase:
+            # 저장소가 설정되지 않은 경우 실패로 세지 않고 보관만 합니다.
+            raise _BackendUnavailable()
+        written = db.bulk_upsert_data(table, rows, raise_errors=True)
+        for related in RELATED_TABLES.get(table, ()):
+            db.invalidate_tables(related)
+        return written
+
+    def _send(self, table, items):
+        """
+        (seq, 행) 목록을 전송합니다.
+        영구 오류가 발생하면 반씩 나눠 다시 전송해 성공할 수 있는 행은 저장하고 문제 행만 골라냅니다.
+
+        Returns:
+            tuple: (저장된 seq 목록, [(seq, 오류 메시지, 영구 오류 여부)] 목록)
+        """
+        try:
+            if self._write(table, [record for _, record in items]) is None:
+                raise RuntimeError(f"테이블 '{table}' 일괄 저장 실패")
+            return [seq for seq, _ in items], []
+        except _BackendUnavailable:
+            raise
+        except Exception as e:
+            permanent = _is_permanent_error(e)
+            if not permanent or len(items) == 1:
+                return [], [(seq, str(e), permanent) for seq, _ in items]
+        middle = len(items) // 2
+        written_first, failed_first = self._send(table, items[:middle])
+        written_second, failed_second = self._send(table, items[middle:])
+        return written_first + written_second, failed_first + failed_second
+
+    def flush(self):
+        """
+        대기 중인 행을 오래된 순서로 최대 batch_size 건 전송합니다.
+        같은 테이블/컬럼 구성의 행은 한 번의 일괄 요청으로 보내며, 한 묶음이 실패해도 나머지 묶음은 계속 전송합니다.
+        영구 오류가 난 행은 바로 실패 보관 상태로 옮기고, 일시적인 오류가 난 행은 시도 횟수를 늘려 다음에 다시 보냅니다.
+
+        Returns:
+            int: 대기 상태에서 벗어난 행 수 (저장 완료 + 실패 보관). 일시적인 오류로 다시 보낼 행이 남으면 -1
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, table_name, payload FROM pending_writes WHERE attempts < ? ORDER BY seq LIMIT ?",
+                (MAX_ATTEMPTS, self.batch_size)
+            ).fetchall()
+        if not rows:
+            return 0
+
+        groups = {}
+        for seq, table, payload in rows:
+            record = json.loads(payload)
+            groups.setdefault((table, tuple(sorted(record))), []).append((seq, record))
+
+        flushed = 0
+        retry_pending = False
+        for (table, _), items in groups.items():
+            try:
+                written, failed = self._send(table, items)
+            except _BackendUnavailable:
+                return flushed
+
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM pending_writes WHERE seq = ?", [(seq,) for seq in written])
+                # 영구 오류는 바로 실패 보관 상태(attempts = MAX_ATTEMPTS)로 옮깁니다.
+                self._conn.executemany(
+                    "UPDATE pending_writes SET attempts = CASE WHEN ? THEN ? ELSE attempts + 1 END, "
+                    "last_error = ? WHERE seq = ?",
+                    [(permanent, MAX_ATTEMPTS, error, seq) for seq, error, permanent in failed]
+                )
+            flushed += len(written) + sum(1 for _, _, permanent in failed if permanent)
+            if failed:
+                self.last_error = failed[-1][1]
+                retry_pending = retry_pending or not all(permanent for _, _, permanent in failed)
+
+        self.last_flush = datetime.now()
+        return -1 if retry_pending else flushed
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if time.monotonic() < self._next_attempt:
+                continue
+            try:
+                # 대기 행이 batch_size 보다 많으면 이어서 전송합니다.
+                while True:
+                    flushed = self.flush()
+                    if flushed < self.batch_size:
+                        break
+            except Exception as e:
+                print(f"쓰기 대기열 전송 오류: {e}")
+                flushed = -1
+
+            if flushed < 0:
+                self._failures += 1
+                delay = min(BACKOFF_BASE * 2 ** (self._failures - 1), BACKOFF_MAX)
+                self._next_attempt = time.monotonic() + delay * random.uniform(0.8, 1.2)
+            else:
+                self._failures = 0
+                self._next_attempt = 0.0
+
+    def start(self):
+        """백그라운드 전송 스레드를 시작합니다 (이미 실행 중이면 무시)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="write-queue-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+    """프로세스 전역에서 공유하는 쓰기 대기열을 반환합니다. 처음 호출 시 전송 스레드를 시작합니다."""
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteQueue().start()
+    return _write_queue
+
+
+def enqueue_write(table, record):
+    """행을 쓰기 대기열에 추가하고 id 를 반환합니다."""
+    return get_write_queue().enqueue(table, record)